@@ -11,6 +11,7 @@ setup(
     entry_points={
         "console_scripts": [
             "simplepipewireq=simplepipewireq.main:main",
+            "simplepipewireq-cli=simplepipewireq.cli:main",
         ],
     },
     install_requires=[
@@ -18,5 +19,9 @@ setup(
         "PyGObject>=3.46.0",
         "libadwaita>=1.3.0",
     ],
+    extras_require={
+        # Analisador de espectro
+        "analyzer": ["numpy>=1.22"],
+    },
     python_requires=">=3.10",
 )
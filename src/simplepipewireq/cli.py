@@ -0,0 +1,361 @@
+"""
+Interface de linha de comando do SimplePipeWireEQ (simplepipewireq-cli).
+
+Não importa `gi`: usa apenas os módulos de core, para iniciar rápido em
+scripts e atalhos. Toda saída em stdout é JSON; logs vão para stderr.
+"""
+import argparse
+import json
+import logging
+import subprocess
+import sys
+import time
+from simplepipewireq.utils.constants import (
+    FREQUENCIES, MIN_GAIN, MAX_GAIN, CLI_COLD_START_BUDGET_MS, FLEET_RUNTIME_ROOT,
+    FLEET_MAX_WORKERS
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _emit(data: dict) -> None:
+    json.dump(data, sys.stdout, ensure_ascii=False)
+    sys.stdout.write("\n")
+
+
+def _context():
+    # Import tardio: `simplepipewireq-cli bench` mede o custo deste import
+    from simplepipewireq.core.context import AppContext
+    # Sem D-Bus: o restart de units via systemctl não importa `gi`
+    return AppContext(use_dbus=False)
+
+
+def _current_gains(ctx) -> dict:
+    gains = {freq: 0.0 for freq in FREQUENCIES}
+    if ctx.config_manager.get_temp_config_path().exists():
+        gains.update(ctx.config_manager.read_config("temp.conf"))
+    return gains
+
+
+def _apply(ctx, gains: dict, artifact_key: str = None) -> dict:
+    """
+    Aplica os ganhos pelo caminho mais rápido disponível: atualização ao
+    vivo no nó; se o nó não estiver acessível, reload completo.
+    """
+    start = time.perf_counter()
+    method = "live"
+    # Modo isolado: a instância só sobe em comandos que aplicam
+    ctx.pipewire_manager.start_isolated_instance()
+    ok = ctx.pipewire_manager.set_gains_live(gains)
+    if ok:
+        # Config em disco igual ao que está tocando (swap atômico se houver artefato)
+        if not (artifact_key and ctx.preset_manager.config_cache.activate(artifact_key)):
+            ctx.pipewire_manager.generate_pipewire_config(gains)
+    else:
+        method = "reload"
+        ok = ctx.pipewire_manager.hot_reload_dynamic(gains)
+    if ok:
+        ctx.config_manager.write_config("temp.conf", gains)
+    return {
+        "ok": ok,
+        "method": method,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000.0, 1),
+        "gains": {str(freq): gain for freq, gain in gains.items()},
+    }
+
+
+# ==== COMANDOS ====
+
+def cmd_list(args) -> int:
+    ctx = _context()
+    _emit({"presets": ctx.preset_manager.list_presets()})
+    return 0
+
+
+def cmd_show(args) -> int:
+    ctx = _context()
+    if args.name:
+        gains = ctx.preset_manager.get_preset_gains(args.name)
+        if not gains:
+            _emit({"ok": False, "error": f"preset não encontrado: {args.name}"})
+            return 1
+    else:
+        gains = _current_gains(ctx)
+    _emit({"name": args.name or "", "gains": {str(f): g for f, g in gains.items()}})
+    return 0
+
+
+def cmd_apply(args) -> int:
+    ctx = _context()
+    artifact = ctx.preset_manager.get_preset_artifact(args.name)
+    if artifact is None:
+        _emit({"ok": False, "error": f"preset não encontrado: {args.name}"})
+        return 1
+    key, gains = artifact
+    result = _apply(ctx, gains, artifact_key=key)
+    result["preset"] = args.name
+    _emit(result)
+    return 0 if result["ok"] else 1
+
+
+def cmd_set(args) -> int:
+    ctx = _context()
+    gains = _current_gains(ctx)
+    for band in args.bands:
+        try:
+            freq_str, gain_str = band.split("=", 1)
+            freq, gain = int(freq_str), float(gain_str)
+        except ValueError:
+            _emit({"ok": False, "error": f"banda inválida (use FREQ=GANHO): {band}"})
+            return 2
+        if freq not in FREQUENCIES:
+            _emit({"ok": False, "error": f"frequência inválida: {freq}"})
+            return 2
+        gains[freq] = max(MIN_GAIN, min(gain, MAX_GAIN))
+    result = _apply(ctx, gains)
+    _emit(result)
+    return 0 if result["ok"] else 1
+
+
+def cmd_export(args) -> int:
+    ctx = _context()
+    if args.name:
+        gains = ctx.preset_manager.get_preset_gains(args.name)
+        if not gains:
+            _emit({"ok": False, "error": f"preset não encontrado: {args.name}"})
+            return 1
+    else:
+        gains = _current_gains(ctx)
+
+    if args.format == "conf":
+        content = ctx.pipewire_manager.render_pipewire_config(gains)
+    else:
+        content = json.dumps(
+            {"name": args.name or "", "gains": {str(f): g for f, g in gains.items()}},
+            ensure_ascii=False
+        )
+
+    if args.output:
+        from simplepipewireq.utils.fileio import atomic_write_text
+        atomic_write_text(args.output, content)
+        _emit({"ok": True, "output": args.output, "format": args.format})
+    else:
+        sys.stdout.write(content if content.endswith("\n") else content + "\n")
+    return 0
+
+
+def cmd_isolated(args) -> int:
+    ctx = _context()
+    enabled = args.state == "on"
+    ok = ctx.pipewire_manager.enable_isolated_mode(enabled)
+    if ok:
+        ctx.config_manager.set_setting("isolated_mode", enabled)
+    instance = ctx.pipewire_manager.isolated_instance
+    _emit({"ok": ok, "isolated_mode": enabled, "pid": instance.pid if instance else None})
+    return 0 if ok else 1
+
+
+def cmd_bypass(args) -> int:
+    ctx = _context()
+    bypass = ctx.bypass
+    if not ctx.graph_monitor.load_snapshot():
+        _emit({"ok": False, "error": "grafo do PipeWire indisponível"})
+        return 1
+    if args.state == "toggle":
+        ok = bypass.toggle()
+    else:
+        ok = bypass.set_bypassed(args.state == "on")
+    _emit({
+        "ok": ok,
+        "bypassed": bypass.is_bypassed(),
+        "elapsed_ms": round(bypass.last_switch_ms, 1) if bypass.last_switch_ms is not None else None,
+    })
+    return 0 if ok else 1
+
+
+def cmd_fleet(args) -> int:
+    from pathlib import Path
+    from simplepipewireq.core.fleet import FleetApplier, discover_sessions
+    sockets = [Path(s) for s in args.socket] or discover_sessions(Path(args.runtime_root))
+    if not args.name:
+        _emit({"sessions": [str(s) for s in sockets]})
+        return 0
+
+    ctx = _context()
+    gains = ctx.preset_manager.get_preset_gains(args.name)
+    if not gains:
+        _emit({"ok": False, "error": f"preset não encontrado: {args.name}"})
+        return 1
+    if not sockets:
+        _emit({"ok": False, "error": "nenhuma sessão do PipeWire encontrada"})
+        return 1
+
+    start = time.perf_counter()
+    targets = ctx.pipewire_manager.effective_gains(
+        {freq: gains.get(freq, 0.0) for freq in FREQUENCIES}
+    )
+    results = FleetApplier(max_workers=args.jobs).apply(sockets, targets, force=args.force)
+    ok = all(r.ok for r in results)
+    _emit({
+        "ok": ok,
+        "preset": args.name,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000.0, 1),
+        "applied": sum(r.status == "applied" for r in results),
+        "skipped": sum(r.status == "skipped" for r in results),
+        "failed": sum(r.status == "failed" for r in results),
+        "sessions": [r.to_dict() for r in results],
+    })
+    return 0 if ok else 1
+
+
+def cmd_plan(args) -> int:
+    """Mostra a ação que um apply executaria, sem executar (dry-run)."""
+    ctx = _context()
+    if args.name:
+        gains = ctx.preset_manager.get_preset_gains(args.name)
+        if not gains:
+            _emit({"ok": False, "error": f"preset não encontrado: {args.name}"})
+            return 1
+    else:
+        gains = _current_gains(ctx)
+    plan = ctx.reconciler.plan(gains)
+    result = {"ok": True}
+    result.update(plan.to_dict())
+    if args.name:
+        result["preset"] = args.name
+    _emit(result)
+    return 0
+
+
+def cmd_bench(args) -> int:
+    """Mede partida a frio da CLI e o custo das operações de core."""
+    runs = max(1, args.runs)
+
+    # Partida a frio: novo interpretador importando a CLI e os managers
+    probe = (
+        "import sys, simplepipewireq.cli, simplepipewireq.core.context; "
+        "sys.exit(1 if 'gi' in sys.modules else 0)"
+    )
+    cold = []
+    gi_loaded = False
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", probe])
+        cold.append((time.perf_counter() - start) * 1000.0)
+        gi_loaded = gi_loaded or result.returncode != 0
+    cold.sort()
+
+    ctx = _context()
+    gains = {freq: (i % 5) - 2.0 for i, freq in enumerate(FREQUENCIES)}
+
+    # 1000 renderizações: o tempo total em ms equivale a µs por renderização
+    start = time.perf_counter()
+    for _ in range(1000):
+        content = ctx.pipewire_manager.render_pipewire_config(gains)
+    render_us = (time.perf_counter() - start) * 1000.0
+
+    data = {
+        "cold_start_ms": {
+            "min": round(cold[0], 1),
+            "median": round(cold[len(cold) // 2], 1),
+            "max": round(cold[-1], 1),
+            "budget": CLI_COLD_START_BUDGET_MS,
+            "within_budget": cold[len(cold) // 2] <= CLI_COLD_START_BUDGET_MS,
+        },
+        "gi_imported": gi_loaded,
+        "render_config_us": round(render_us, 1),
+        "config_bytes": len(content),
+    }
+
+    if args.live:
+        latencies = []
+        for i in range(runs):
+            start = time.perf_counter()
+            ok = ctx.pipewire_manager.set_gains_live({FREQUENCIES[0]: float(i % 2)})
+            latencies.append((time.perf_counter() - start) * 1000.0)
+            if not ok:
+                data["live_error"] = "nó do equalizador indisponível"
+                break
+        if latencies:
+            latencies.sort()
+            data["live_update_ms"] = {
+                "min": round(latencies[0], 1),
+                "median": round(latencies[len(latencies) // 2], 1),
+                "max": round(latencies[-1], 1),
+            }
+
+    _emit(data)
+    return 0 if data["cold_start_ms"]["within_budget"] and not gi_loaded else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="simplepipewireq-cli",
+        description="Controle do SimplePipeWireEQ por linha de comando (saída JSON)."
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="logs detalhados em stderr")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("list", help="lista os presets").set_defaults(func=cmd_list)
+
+    p = sub.add_parser("show", help="mostra os ganhos de um preset (ou o estado atual)")
+    p.add_argument("name", nargs="?")
+    p.set_defaults(func=cmd_show)
+
+    p = sub.add_parser("apply", help="aplica um preset")
+    p.add_argument("name")
+    p.set_defaults(func=cmd_apply)
+
+    p = sub.add_parser("set", help="altera bandas do estado atual e aplica")
+    p.add_argument("bands", nargs="+", metavar="FREQ=GANHO")
+    p.set_defaults(func=cmd_set)
+
+    p = sub.add_parser("export", help="exporta um preset (ou o estado atual)")
+    p.add_argument("name", nargs="?")
+    p.add_argument("-f", "--format", choices=["json", "conf"], default="json")
+    p.add_argument("-o", "--output", help="arquivo de saída (padrão: stdout)")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("isolated", help="liga/desliga o filter-chain numa instância própria do PipeWire")
+    p.add_argument("state", choices=["on", "off"])
+    p.set_defaults(func=cmd_isolated)
+
+    p = sub.add_parser("bypass", help="A/B: ouve sem (on) ou com (off) o equalizador")
+    p.add_argument("state", choices=["on", "off", "toggle"])
+    p.set_defaults(func=cmd_bypass)
+
+    p = sub.add_parser("fleet", help="aplica um preset nas sessões de PipeWire de vários usuários")
+    p.add_argument("name", nargs="?", help="preset (sem nome: só lista as sessões)")
+    p.add_argument("-s", "--socket", action="append", default=[],
+                   help="socket de uma sessão (repetível; padrão: descobrir)")
+    p.add_argument("--runtime-root", default=str(FLEET_RUNTIME_ROOT),
+                   help="diretório com os XDG_RUNTIME_DIR das sessões")
+    p.add_argument("-j", "--jobs", type=int, default=FLEET_MAX_WORKERS, help="sessões em paralelo")
+    p.add_argument("--force", action="store_true", help="envia mesmo se a sessão já estiver no alvo")
+    p.set_defaults(func=cmd_fleet)
+
+    p = sub.add_parser("plan", help="mostra a ação mínima que um apply executaria (dry-run)")
+    p.add_argument("name", nargs="?", help="preset (padrão: estado atual)")
+    p.set_defaults(func=cmd_plan)
+
+    p = sub.add_parser("bench", help="mede partida a frio e operações de core")
+    p.add_argument("-n", "--runs", type=int, default=10)
+    p.add_argument("--live", action="store_true", help="inclui latência de atualização ao vivo")
+    p.set_defaults(func=cmd_bench)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    """Entry point de simplepipewireq-cli."""
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(levelname)s: %(message)s',
+        stream=sys.stderr
+    )
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
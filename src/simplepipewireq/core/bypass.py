@@ -0,0 +1,101 @@
+import json
+import logging
+import subprocess
+import time
+from simplepipewireq.core.graph_monitor import GraphEvent, GraphMonitor
+from simplepipewireq.utils.constants import (
+    EQ_NODE_NAME, PIPEWIRE_METADATA_CMD, DEFAULT_SINK_METADATA_KEY
+)
+from simplepipewireq.utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+class EqBypass:
+    """
+    Comparação A/B instantânea: com e sem equalização.
+
+    Os dois caminhos existem o tempo todo no grafo: o sink do EQ e o
+    dispositivo de saída real (caminho plano). A troca só muda o sink padrão
+    (metadata `default.configured.audio.sink`) e o gerenciador de sessão move
+    os streams que seguem o padrão. Nada é recriado, então alternar leva
+    alguns milissegundos (`last_switch_ms`).
+
+    O estado é lido do grafo: "em bypass" significa que o sink padrão não é
+    o do EQ. Assim a CLI e a interface enxergam o mesmo estado.
+    """
+
+    def __init__(self, monitor: GraphMonitor):
+        self.monitor = monitor
+        self._bypassed = None       # Estado esperado até o grafo confirmar
+        self._engaged_here = False  # Bypass ligado por este processo
+        self.last_switch_ms = None
+        monitor.add_listener(self._on_event)
+
+    def _on_event(self, event: GraphEvent) -> None:
+        if event.kind == "metadata" or event.kind == "disconnected":
+            # O grafo passa a ser a referência (inclusive para trocas externas)
+            self._bypassed = None
+
+    def is_bypassed(self) -> bool:
+        if self._bypassed is not None:
+            return self._bypassed
+        default = self.monitor.default_sink_name()
+        return default is not None and default != EQ_NODE_NAME
+
+    def toggle(self) -> bool:
+        return self.set_bypassed(not self.is_bypassed())
+
+    def set_bypassed(self, bypassed: bool) -> bool:
+        """
+        Liga (som sem EQ) ou desliga (som pelo EQ) o bypass.
+
+        Returns:
+            bool: True se o sink padrão foi trocado
+        """
+        if not self.monitor.connected:
+            logger.warning("A/B: grafo do PipeWire ainda não carregado")
+            return False
+        if bypassed:
+            target = self.monitor.output_sink_name(exclude=EQ_NODE_NAME)
+        else:
+            target = EQ_NODE_NAME if self.monitor.find_node(EQ_NODE_NAME) is not None else None
+        if target is None:
+            logger.error("A/B: sink de destino não encontrado no grafo")
+            return False
+
+        start = time.perf_counter()
+        with tracer.span("bypass", target=target) as span:
+            ok = self._set_default_sink(target)
+            span.set(ok=ok)
+        self.last_switch_ms = (time.perf_counter() - start) * 1000.0
+        if ok:
+            self._bypassed = bypassed
+            self._engaged_here = bypassed
+            logger.info(
+                f"A/B: {'sem' if bypassed else 'com'} equalização "
+                f"({target}) em {self.last_switch_ms:.0f} ms"
+            )
+        return ok
+
+    def restore(self) -> None:
+        """Volta para o EQ se o bypass foi ligado por este processo."""
+        if self._engaged_here and self.is_bypassed():
+            self.set_bypassed(False)
+
+    def _set_default_sink(self, node_name: str) -> bool:
+        value = json.dumps({"name": node_name})
+        try:
+            result = subprocess.run(
+                PIPEWIRE_METADATA_CMD + ["0", DEFAULT_SINK_METADATA_KEY, value, "Spa:String:JSON"],
+                capture_output=True,
+                text=True,
+                timeout=2.0
+            )
+            if result.returncode != 0:
+                logger.error(f"Erro ao trocar o sink padrão: {result.stderr.strip()}")
+                return False
+            return True
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.error(f"Erro ao executar pw-metadata: {e}")
+            return False
@@ -0,0 +1,300 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Optional, Tuple
+from simplepipewireq.utils.constants import (
+    CONFIG_CACHE_DIR, CONFIG_CACHE_MAX_ENTRIES, FREQUENCIES, APP_VERSION
+)
+from simplepipewireq.utils.fileio import atomic_write_text
+
+logger = logging.getLogger(__name__)
+
+class ConfigCache:
+    """
+    Cache endereçado por conteúdo das configs PipeWire já compiladas.
+
+    Cada config renderizada vira `<hash>.conf` (o artefato que o PipeWire lê)
+    e `<hash>.json` (artefatos derivados: ganhos e hash, usados para enviar
+    os ganhos ao vivo sem reparsear). O índice `presets.json` associa cada
+    preset ao seu hash, de modo que trocar de preset é só um swap atômico do
+    arquivo ativo para um artefato pronto. Cada entrada do índice guarda
+    também o carimbo (mtime, tamanho e hash do conteúdo) do `.conf` de origem
+    do preset: se o arquivo mudar fora do app, o artefato é recompilado.
+
+    O cache é invalidado (e reconstruído sob demanda) quando a versão do app
+    ou o template de config mudam.
+    """
+
+    INDEX_FILE = "presets.json"
+    STAMP_FILE = "STAMP"
+
+    def __init__(self, pipewire_manager, cache_dir: Path = CONFIG_CACHE_DIR,
+                 max_entries: int = CONFIG_CACHE_MAX_ENTRIES):
+        self.pipewire_manager = pipewire_manager
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self._index = None  # Carregado sob demanda
+        self._validated = False
+
+    # ==== API PÚBLICA ====
+
+    def store_preset(self, name: str, gains_dict: dict, source: Path = None) -> Optional[str]:
+        """
+        Compila e guarda o artefato de um preset, atualizando o índice.
+
+        Args:
+            name: Nome do preset
+            gains_dict: Ganhos do preset
+            source: Arquivo .conf de origem, cujo carimbo vai para o índice
+
+        Returns:
+            Optional[str]: Chave (hash hex) do artefato, ou None se falhar.
+        """
+        key = self.build(gains_dict)
+        if key is None:
+            return None
+        index = self._load_index()
+        index[name] = {"key": key, "source": self._source_stamp(source) if source else None}
+        self._save_index()
+        return key
+
+    def forget_preset(self, name: str) -> None:
+        """Remove o preset do índice (o artefato sai na próxima evicção)."""
+        index = self._load_index()
+        if index.pop(name, None) is not None:
+            self._save_index()
+
+    def get_preset_artifact(self, name: str, gains_loader=None,
+                            source: Path = None) -> Optional[Tuple[str, dict]]:
+        """
+        Retorna (chave, ganhos) do artefato de um preset, reconstruindo-o se
+        estiver ausente, inválido ou mais velho que o arquivo de origem.
+
+        Args:
+            name: Nome do preset
+            gains_loader: Callable(name) -> dict usado para reconstruir
+            source: Arquivo .conf de origem do preset (conferido pelo carimbo)
+
+        Returns:
+            Optional[Tuple[str, dict]]: (chave, ganhos) ou None
+        """
+        self._ensure_valid()
+        entry = self._load_index().get(name)
+        key = self._entry_key(entry)
+        if key and self._source_matches(name, entry, source):
+            meta = self._read_meta(key)
+            if meta is not None:
+                # O artefato pode ter sido compilado em outro modo (preciso,
+                # compensação de loudness): recompila se a config mudou
+                config_hash, _ = self.pipewire_manager.render_pipewire_config_cached(meta["gains"])
+                if config_hash == meta["hash"]:
+                    self._touch(key)
+                    return key, meta["gains"]
+                key = self.store_preset(name, meta["gains"], source)
+                return (key, meta["gains"]) if key is not None else None
+
+        if gains_loader is None:
+            return None
+        gains = gains_loader(name)
+        if not gains:
+            return None
+        key = self.store_preset(name, gains, source)
+        if key is None:
+            return None
+        return key, gains
+
+    def build(self, gains_dict: dict) -> Optional[str]:
+        """
+        Compila a config para os ganhos e grava o artefato (idempotente).
+
+        Returns:
+            Optional[str]: Chave (hash hex) do artefato, ou None se falhar.
+        """
+        try:
+            self._ensure_valid()
+            config_hash, content = self.pipewire_manager.render_pipewire_config_cached(gains_dict)
+            key = f"{config_hash:016x}"
+            conf_path = self._conf_path(key)
+            if not conf_path.exists():
+                gains = {str(freq): float(gains_dict.get(freq, 0.0)) for freq in FREQUENCIES}
+                atomic_write_text(self._meta_path(key), json.dumps({"hash": config_hash, "gains": gains}))
+                atomic_write_text(conf_path, content)
+                self._evict()
+            else:
+                self._touch(key)
+            return key
+        except Exception as e:
+            logger.error(f"Erro ao compilar config em cache: {e}")
+            return None
+
+    def activate(self, key: str) -> bool:
+        """
+        Troca atomicamente o arquivo de config ativo pelo artefato da chave.
+
+        Returns:
+            bool: True se sucesso, False se o artefato não existe ou falhou.
+        """
+        meta = self._read_meta(key)
+        conf_path = self._conf_path(key)
+        if meta is None or not conf_path.exists():
+            logger.warning(f"Artefato de config ausente no cache: {key}")
+            return False
+        self._touch(key)
+        return self.pipewire_manager.activate_config_file(conf_path, meta["hash"])
+
+    def clear(self) -> None:
+        """Remove todo o conteúdo do cache."""
+        if self.cache_dir.exists():
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self._index = None
+        self._validated = False
+
+    # ==== INTERNOS ====
+
+    def _conf_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.conf"
+
+    def _meta_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _read_meta(self, key: str) -> Optional[dict]:
+        """Lê os artefatos derivados: {"hash": int, "gains": {freq: gain}} ou None."""
+        try:
+            with open(self._meta_path(key)) as f:
+                data = json.load(f)
+            if not self._conf_path(key).exists():
+                return None
+            return {
+                "hash": int(data["hash"]),
+                "gains": {int(freq): float(gain) for freq, gain in data["gains"].items()},
+            }
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @staticmethod
+    def _entry_key(entry) -> Optional[str]:
+        """Chave de uma entrada do índice (índices antigos guardavam só a chave)."""
+        if isinstance(entry, dict):
+            return entry.get("key")
+        return entry
+
+    @staticmethod
+    def _source_stamp(path: Path, content_hash: bool = True) -> Optional[dict]:
+        """Carimbo do arquivo de origem: {"mtime", "size", "sha"}, ou None se ilegível."""
+        try:
+            stat = Path(path).stat()
+            stamp = {"mtime": stat.st_mtime_ns, "size": stat.st_size}
+            if content_hash:
+                stamp["sha"] = hashlib.blake2b(Path(path).read_bytes(), digest_size=8).hexdigest()
+            return stamp
+        except OSError:
+            return None
+
+    def _source_matches(self, name: str, entry, source: Optional[Path]) -> bool:
+        """
+        True se o artefato ainda corresponde ao arquivo de origem. mtime e
+        tamanho iguais bastam; se só o mtime mudou (arquivo regravado com o
+        mesmo conteúdo), o hash decide e o carimbo é atualizado.
+        """
+        if source is None:
+            return True
+        recorded = entry.get("source") if isinstance(entry, dict) else None
+        if not recorded:
+            return False
+        current = self._source_stamp(source, content_hash=False)
+        if current is None:
+            return False
+        if current["mtime"] == recorded.get("mtime") and current["size"] == recorded.get("size"):
+            return True
+        current = self._source_stamp(source)
+        if current is None or current["sha"] != recorded.get("sha"):
+            logger.info(f"Preset {name} mudou no disco, recompilando sua config")
+            return False
+        entry["source"] = current
+        self._save_index()
+        return True
+
+    def _touch(self, key: str) -> None:
+        """Atualiza o mtime para a política LRU de evicção."""
+        try:
+            os.utime(self._meta_path(key))
+        except OSError:
+            pass
+
+    def _stamp(self) -> str:
+        """Identifica versão do app + template (hash de uma config de referência)."""
+        flat = {freq: 0.0 for freq in FREQUENCIES}
+        content = self.pipewire_manager.render_pipewire_config(flat)
+        return f"{APP_VERSION}:{self.pipewire_manager.config_hash(content):016x}"
+
+    def _ensure_valid(self) -> None:
+        """Invalida o cache se a versão do app ou do template mudou."""
+        if self._validated:
+            return
+        stamp = self._stamp()
+        stamp_path = self.cache_dir / self.STAMP_FILE
+        try:
+            if stamp_path.read_text() == stamp:
+                self._validated = True
+                return
+        except OSError:
+            pass
+
+        # O índice de presets é mantido: os artefatos são recompilados sob demanda
+        index = self._load_index()
+        if self.cache_dir.exists():
+            logger.info("Template ou versão mudaram, reconstruindo cache de configs")
+            self.clear()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(stamp_path, stamp)
+        self._index = index
+        self._save_index()
+        self._validated = True
+
+    def _load_index(self) -> dict:
+        if self._index is None:
+            try:
+                with open(self.cache_dir / self.INDEX_FILE) as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self) -> None:
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(self.cache_dir / self.INDEX_FILE, json.dumps(self._index))
+        except OSError as e:
+            logger.error(f"Erro ao salvar índice do cache de configs: {e}")
+
+    def _evict(self) -> None:
+        """Remove os artefatos menos usados além do limite (não referenciados primeiro)."""
+        try:
+            metas = list(self.cache_dir.glob("*.json"))
+        except OSError:
+            return
+        metas = [p for p in metas if p.name != self.INDEX_FILE]
+        excess = len(metas) - self.max_entries
+        if excess <= 0:
+            return
+
+        referenced = {self._entry_key(entry) for entry in self._load_index().values()}
+
+        def sort_key(path):
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                mtime = 0
+            return (path.stem in referenced, mtime)
+
+        for meta_path in sorted(metas, key=sort_key)[:excess]:
+            key = meta_path.stem
+            for path in (self._conf_path(key), meta_path):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            logger.debug(f"Artefato removido do cache de configs: {key}")
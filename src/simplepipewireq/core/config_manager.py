@@ -1,7 +1,14 @@
 import configparser
+import io
 import logging
+import threading
+import time
 from pathlib import Path
-from simplepipewireq.utils.constants import TEMP_CONF, MIN_GAIN, MAX_GAIN, CONFIG_DIR
+from simplepipewireq.utils.constants import (
+    TEMP_CONF, MIN_GAIN, MAX_GAIN, CONFIG_DIR, SETTINGS_FILE,
+    PERSIST_DEBOUNCE_SECONDS, PERSIST_MAX_DELAY_SECONDS
+)
+from simplepipewireq.utils.fileio import atomic_write_text
 
 logger = logging.getLogger(__name__)
 
@@ -10,6 +17,20 @@ class ConfigManager:
         """Inicializa o ConfigManager e garante que o diretório de configuração existe."""
         self._ensure_config_dir()
 
+        # Estado da persistência em background (write-behind)
+        self._cond = threading.Condition()
+        self._pending = {}          # {Path: gains_dict} aguardando escrita
+        self._first_pending_at = None
+        self._last_pending_at = None
+        self._scheduled_seq = 0
+        self._written_seq = 0
+        self._flush_requested = False
+        self._closing = False
+        self._writer_thread = None
+        
+        # Preferências da aplicação (carregadas sob demanda)
+        self._settings = None
+
     def _ensure_config_dir(self):
         """Cria o diretório de configuração se não existir."""
         if not CONFIG_DIR.exists():
@@ -43,28 +64,140 @@ class ConfigManager:
         """
         try:
             filepath = self._resolve_path(filename)
-            
-            config = configparser.ConfigParser()
-            config['equalizer'] = {}
-            
-            for freq, gain in gains_dict.items():
-                if not self.validate_gain(gain):
-                    logger.warning(f"Ganho inválido para {freq}Hz: {gain}. Ajustando para limites.")
-                    gain = max(MIN_GAIN, min(gain, MAX_GAIN))
-                
-                # As chaves no INI serão gain_60hz, gain_150hz, etc.
-                key = f"gain_{freq}hz"
-                config['equalizer'][key] = str(float(gain))
-            
-            with open(filepath, 'w') as configfile:
-                config.write(configfile)
-                
+            # Escrita atômica: temp + fsync + rename, nunca deixa arquivo truncado
+            atomic_write_text(filepath, self._render_ini(gains_dict))
             return True
             
         except Exception as e:
             logger.error(f"Erro ao escrever configuração em {filename}: {e}")
             return False
 
+    def _render_ini(self, gains_dict: dict) -> str:
+        """Serializa o dicionário de ganhos no formato INI."""
+        config = configparser.ConfigParser()
+        config['equalizer'] = {}
+        
+        for freq, gain in gains_dict.items():
+            if not self.validate_gain(gain):
+                logger.warning(f"Ganho inválido para {freq}Hz: {gain}. Ajustando para limites.")
+                gain = max(MIN_GAIN, min(gain, MAX_GAIN))
+            
+            # As chaves no INI serão gain_60hz, gain_150hz, etc.
+            key = f"gain_{freq}hz"
+            config['equalizer'][key] = str(float(gain))
+        
+        buffer = io.StringIO()
+        config.write(buffer)
+        return buffer.getvalue()
+
+    # ==== PERSISTÊNCIA EM BACKGROUND (WRITE-BEHIND) ====
+
+    def schedule_write(self, filename: str, gains_dict: dict) -> None:
+        """
+        Agenda a escrita dos ganhos sem bloquear a thread chamadora.
+        
+        Mudanças rápidas para o mesmo arquivo são agrupadas: apenas o último
+        estado é escrito, após PERSIST_DEBOUNCE_SECONDS sem novas mudanças
+        (ou no máximo PERSIST_MAX_DELAY_SECONDS após a primeira).
+        
+        Args:
+            filename: Nome do arquivo (ou caminho completo).
+            gains_dict: Dicionário {frequencia: ganho}. É copiado na chamada.
+        """
+        filepath = self._resolve_path(filename)
+        now = time.monotonic()
+        
+        with self._cond:
+            if self._closing:
+                # Após o shutdown não há worker; escreve de forma síncrona
+                self.write_config(str(filepath), dict(gains_dict))
+                return
+            
+            if not self._pending:
+                self._first_pending_at = now
+            self._pending[filepath] = dict(gains_dict)
+            self._last_pending_at = now
+            self._scheduled_seq += 1
+            self._ensure_writer_thread()
+            self._cond.notify_all()
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Força a escrita imediata de tudo que está pendente e aguarda.
+        
+        Args:
+            timeout: Tempo máximo de espera em segundos (None = sem limite).
+            
+        Returns:
+            bool: True se todas as escritas agendadas até agora terminaram.
+        """
+        with self._cond:
+            target_seq = self._scheduled_seq
+            if self._written_seq >= target_seq:
+                return True
+            self._flush_requested = True
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._written_seq >= target_seq, timeout)
+
+    def shutdown(self, timeout: float = 5.0) -> bool:
+        """
+        Grava o estado pendente e encerra o worker de persistência.
+        Deve ser chamado ao fechar a aplicação.
+        """
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+            thread = self._writer_thread
+        if thread is not None:
+            thread.join(timeout)
+        if not flushed:
+            logger.error("Timeout ao gravar estado pendente no encerramento")
+        return flushed
+
+    def _ensure_writer_thread(self):
+        """Inicia o worker de escrita sob demanda (chamar com o lock adquirido)."""
+        if self._writer_thread is None or not self._writer_thread.is_alive():
+            self._writer_thread = threading.Thread(
+                target=self._writer_loop,
+                name="simplepipewireq-config-writer",
+                daemon=True
+            )
+            self._writer_thread.start()
+
+    def _writer_loop(self):
+        """Loop do worker: espera o debounce, agrupa e grava fora da thread da UI."""
+        while True:
+            with self._cond:
+                while not self._pending and not self._closing:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                
+                # Debounce: espera ficar quieto, limitado por um atraso máximo
+                while not (self._flush_requested or self._closing):
+                    due_at = min(
+                        self._last_pending_at + PERSIST_DEBOUNCE_SECONDS,
+                        self._first_pending_at + PERSIST_MAX_DELAY_SECONDS
+                    )
+                    remaining = due_at - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                
+                batch = self._pending
+                batch_seq = self._scheduled_seq
+                self._pending = {}
+                self._flush_requested = False
+            
+            for filepath, gains in batch.items():
+                if self.write_config(str(filepath), gains):
+                    logger.debug(f"Estado persistido em {filepath}")
+            
+            with self._cond:
+                self._written_seq = batch_seq
+                self._cond.notify_all()
+
     def read_config(self, filename: str) -> dict:
         """
         Lê um arquivo .conf e retorna um dicionário de ganhos.
@@ -114,6 +247,51 @@ class ConfigManager:
             logger.error(f"Erro ao ler configuração de {filename}: {e}")
             return {}
 
+    # ==== PREFERÊNCIAS DA APLICAÇÃO ====
+
+    def get_setting(self, key: str, default: str = None) -> str:
+        """Retorna uma preferência da seção [settings] de SETTINGS_FILE."""
+        return self._load_settings().get('settings', key, fallback=default)
+
+    def get_bool_setting(self, key: str, default: bool = False) -> bool:
+        """Retorna uma preferência booleana (true/false, yes/no, 1/0)."""
+        try:
+            return self._load_settings().getboolean('settings', key, fallback=default)
+        except ValueError:
+            return default
+
+    def set_setting(self, key: str, value) -> bool:
+        """
+        Grava uma preferência. Booleanos são gravados como true/false.
+        
+        Returns:
+            bool: True se sucesso, False caso contrário.
+        """
+        settings = self._load_settings()
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        settings['settings'][key] = str(value)
+        try:
+            SETTINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
+            buffer = io.StringIO()
+            settings.write(buffer)
+            atomic_write_text(SETTINGS_FILE, buffer.getvalue())
+            return True
+        except OSError as e:
+            logger.error(f"Erro ao gravar preferência {key}: {e}")
+            return False
+
+    def _load_settings(self) -> configparser.ConfigParser:
+        if self._settings is None:
+            self._settings = configparser.ConfigParser()
+            try:
+                self._settings.read(SETTINGS_FILE)
+            except configparser.Error as e:
+                logger.warning(f"Arquivo de preferências inválido, ignorando: {e}")
+            if 'settings' not in self._settings:
+                self._settings['settings'] = {}
+        return self._settings
+
     def _resolve_path(self, filename: str) -> Path:
         """Helper para resolver caminho absoluto ou relativo a CONFIG_DIR"""
         path = Path(filename)
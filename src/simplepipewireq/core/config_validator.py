@@ -0,0 +1,290 @@
+import math
+import re
+from pathlib import Path
+from simplepipewireq.utils.constants import MIN_GAIN, MAX_GAIN
+
+FILTER_CHAIN_MODULE = "libpipewire-module-filter-chain"
+
+# Tokens do SPA-JSON: o JSON relaxado das configs do PipeWire (chaves e
+# valores sem aspas, "=" ou ":" entre chave e valor, vírgulas opcionais,
+# comentários com "#")
+_TOKEN = re.compile(r'''
+    (?P<skip>(?:\s+|\#[^\n]*)+)
+  | (?P<string>"(?:[^"\\]|\\.)*")
+  | (?P<open>[{\[])
+  | (?P<close>[}\]])
+  | (?P<sep>[=:,])
+  | (?P<bare>[^\s{}\[\]=:,"\#]+)
+  | (?P<error>.)
+''', re.VERBOSE | re.DOTALL)
+
+_NUMBER = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?$')
+_HEX4 = re.compile(r'[0-9a-fA-F]{4}$')
+_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+# Controles dos filtros biquad builtin e seus limites
+_BIQUAD_LIMITS = {
+    "Freq": (0.0, 96000.0),
+    "Q": (0.0, 100.0),
+    "Gain": (MIN_GAIN, MAX_GAIN),
+}
+
+
+class ConfigValidationError(ValueError):
+    """Config rejeitada pela validação prévia (sintaxe SPA-JSON ou esquema)."""
+
+    def __init__(self, message: str, line: int = None):
+        self.line = line
+        super().__init__(f"linha {line}: {message}" if line else message)
+
+
+# ==== PARSER SPA-JSON ====
+
+def _unescape(raw: str) -> str:
+    if "\\" not in raw:
+        return raw
+    out = []
+    i = 0
+    while i < len(raw):
+        char = raw[i]
+        if char != "\\":
+            out.append(char)
+            i += 1
+            continue
+        code = raw[i + 1:i + 2]
+        if code == "u":
+            digits = raw[i + 2:i + 6]
+            if not _HEX4.match(digits):
+                raise ConfigValidationError(f"escape \\u inválido: {raw[i:i + 6]!r}")
+            out.append(chr(int(digits, 16)))
+            i += 6
+        else:
+            out.append(_ESCAPES.get(code, code))
+            i += 2
+    return "".join(out)
+
+
+def _bare_value(word: str):
+    if word == "true":
+        return True
+    if word == "false":
+        return False
+    if word == "null":
+        return None
+    if _NUMBER.match(word):
+        return float(word) if any(c in word for c in ".eE") else int(word)
+    return word
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.text = text
+        self.index = 0
+        # [(tipo, valor, posição)]; separadores são opcionais e descartados
+        self.tokens = [
+            (m.lastgroup, m.group(), m.start()) for m in _TOKEN.finditer(text)
+            if m.lastgroup != "skip" and m.lastgroup != "sep"
+        ]
+        for kind, value, pos in self.tokens:
+            if kind == "error":
+                self.fail("string sem aspas de fechamento" if value == '"' else
+                          f"caractere inesperado {value!r}", pos)
+
+    def fail(self, message: str, pos: int = None):
+        if pos is None:
+            pos = self.tokens[self.index][2] if self.index < len(self.tokens) else len(self.text)
+        raise ConfigValidationError(message, self.text.count("\n", 0, pos) + 1)
+
+    def string(self, text: str) -> str:
+        """Conteúdo do token string atual, com os escapes resolvidos."""
+        try:
+            return _unescape(text[1:-1])
+        except ConfigValidationError as e:
+            self.fail(str(e))
+
+    def next(self):
+        return self.tokens[self.index] if self.index < len(self.tokens) else None
+
+    def parse_document(self) -> dict:
+        # O documento é um objeto sem as chaves externas
+        token = self.next()
+        if token is not None and token[1] == "{":
+            self.index += 1
+            value = self.parse_object("}")
+            if self.next() is not None:
+                self.fail("conteúdo após o fim do objeto")
+            return value
+        return self.parse_object(None)
+
+    def parse_object(self, closer) -> dict:
+        result = {}
+        while True:
+            token = self.next()
+            if token is None:
+                if closer is not None:
+                    self.fail(f"objeto sem '{closer}' de fechamento")
+                return result
+            kind, text, _ = token
+            if kind == "close":
+                if text != closer:
+                    self.fail(f"'{text}' inesperado")
+                self.index += 1
+                return result
+            if kind == "string":
+                key = self.string(text)
+            elif kind == "bare":
+                key = text
+            else:
+                self.fail(f"chave esperada, encontrado '{text}'")
+            self.index += 1
+            if self.next() is None:
+                self.fail(f"valor ausente para '{key}'")
+            result[key] = self.parse_value()
+
+    def parse_array(self) -> list:
+        result = []
+        while True:
+            token = self.next()
+            if token is None:
+                self.fail("lista sem ']' de fechamento")
+            if token[0] == "close":
+                if token[1] != "]":
+                    self.fail(f"'{token[1]}' inesperado")
+                self.index += 1
+                return result
+            result.append(self.parse_value())
+
+    def parse_value(self):
+        kind, text, _ = self.tokens[self.index]
+        if kind == "open":
+            self.index += 1
+            return self.parse_object("}") if text == "{" else self.parse_array()
+        if kind == "string":
+            value = self.string(text)
+            self.index += 1
+            return value
+        if kind == "bare":
+            self.index += 1
+            return _bare_value(text)
+        self.fail(f"valor esperado, encontrado '{text}'")
+
+
+def parse_spa_json(text: str) -> dict:
+    """
+    Faz o parse de uma config no formato SPA-JSON do PipeWire.
+
+    Raises:
+        ConfigValidationError: Se a sintaxe for inválida
+    """
+    return _Parser(text).parse_document()
+
+
+# ==== ESQUEMA DO FILTER-CHAIN ====
+
+def _require(condition: bool, path: str, message: str) -> None:
+    if not condition:
+        raise ConfigValidationError(f"{path}: {message}")
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check_port(ref, names: set, path: str) -> None:
+    if ref is None:
+        return  # Porta explicitamente desconectada
+    _require(isinstance(ref, str), path, "referência de porta deve ser string")
+    node = ref.split(":", 1)[0] if ":" in ref else ref
+    _require(node in names, path, f"nó inexistente '{node}'")
+
+
+def _validate_graph(graph, path: str) -> None:
+    _require(isinstance(graph, dict), path, "deve ser um objeto")
+    nodes = graph.get("nodes")
+    _require(isinstance(nodes, list) and nodes, f"{path}.nodes", "lista de nós vazia ou ausente")
+
+    names = set()
+    for i, node in enumerate(nodes):
+        node_path = f"{path}.nodes[{i}]"
+        _require(isinstance(node, dict), node_path, "deve ser um objeto")
+        for key in ("type", "name", "label"):
+            _require(isinstance(node.get(key), str) and node.get(key), f"{node_path}.{key}", "ausente")
+        name = node["name"]
+        _require(name not in names, f"{node_path}.name", f"nome duplicado '{name}'")
+        names.add(name)
+
+        control = node.get("control", {})
+        _require(isinstance(control, dict), f"{node_path}.control", "deve ser um objeto")
+        biquad = node["type"] == "builtin" and node["label"].startswith("bq_")
+        for key, value in control.items():
+            if not (_is_number(value) and math.isfinite(value)):
+                _require(False, f"{node_path}.control.{key}", f"valor inválido {value!r}")
+            limits = _BIQUAD_LIMITS.get(key) if biquad else None
+            if limits is not None:
+                low, high = limits
+                if not (low <= value <= high and (key == "Gain" or value > low)):
+                    _require(False, f"{node_path}.control.{key}",
+                             f"{value} fora do intervalo ({low}, {high})")
+
+    links = graph.get("links", [])
+    _require(isinstance(links, list), f"{path}.links", "deve ser uma lista")
+    for i, link in enumerate(links):
+        link_path = f"{path}.links[{i}]"
+        _require(isinstance(link, dict), link_path, "deve ser um objeto")
+        for key in ("output", "input"):
+            _require(key in link, f"{link_path}.{key}", "ausente")
+            _check_port(link[key], names, f"{link_path}.{key}")
+
+    for key in ("inputs", "outputs"):
+        ports = graph.get(key, [])
+        _require(isinstance(ports, list), f"{path}.{key}", "deve ser uma lista")
+        for i, ref in enumerate(ports):
+            _check_port(ref, names, f"{path}.{key}[{i}]")
+
+
+def validate_config(text: str) -> dict:
+    """
+    Valida a sintaxe e o esquema de uma config de filter-chain.
+
+    Confere o que faria o PipeWire rejeitar o módulo: nós sem tipo, nome ou
+    label, nomes duplicados, controles não numéricos ou fora dos limites,
+    ligações para nós inexistentes e props do sink sem node.name.
+
+    Returns:
+        dict: A config interpretada
+
+    Raises:
+        ConfigValidationError: Com o caminho do primeiro problema encontrado
+    """
+    config = parse_spa_json(text)
+    modules = config.get("context.modules")
+    _require(isinstance(modules, list), "context.modules", "lista de módulos ausente")
+
+    found = False
+    for i, module in enumerate(modules):
+        path = f"context.modules[{i}]"
+        _require(isinstance(module, dict), path, "deve ser um objeto")
+        _require(isinstance(module.get("name"), str), f"{path}.name", "ausente")
+        if module["name"] != FILTER_CHAIN_MODULE:
+            continue
+        found = True
+        args = module.get("args")
+        _require(isinstance(args, dict), f"{path}.args", "ausente")
+        _validate_graph(args.get("filter.graph"), f"{path}.args.filter.graph")
+        for key in ("capture.props", "playback.props"):
+            props = args.get(key, {})
+            _require(isinstance(props, dict), f"{path}.args.{key}", "deve ser um objeto")
+        capture_name = args.get("capture.props", {}).get("node.name")
+        _require(isinstance(capture_name, str) and capture_name,
+                 f"{path}.args.capture.props.node.name", "ausente")
+    _require(found, "context.modules", f"nenhum {FILTER_CHAIN_MODULE}")
+    return config
+
+
+def validate_config_file(path: Path) -> dict:
+    """validate_config() sobre um arquivo; erros de leitura também são rejeitados."""
+    try:
+        text = Path(path).read_text()
+    except OSError as e:
+        raise ConfigValidationError(f"não foi possível ler {path}: {e}") from e
+    return validate_config(text)
@@ -0,0 +1,188 @@
+import threading
+from simplepipewireq.core.config_manager import ConfigManager
+from simplepipewireq.core.pipewire_manager import PipeWireManager
+from simplepipewireq.core.preset_manager import PresetManager
+from simplepipewireq.core.param_pusher import ParamPusher
+from simplepipewireq.core.preset_morpher import PresetMorpher
+from simplepipewireq.core.graph_monitor import GraphMonitor
+from simplepipewireq.core.watchdog import EqWatchdog
+from simplepipewireq.core.device_rules import DeviceAutoSwitcher
+from simplepipewireq.core.bypass import EqBypass
+from simplepipewireq.core.loudness import LoudnessCompensator
+from simplepipewireq.core.midi_input import MidiInput
+from simplepipewireq.core.history import GainsHistory
+from simplepipewireq.core.reconciler import Reconciler
+from simplepipewireq.utils.constants import FREQUENCIES
+
+class AppContext:
+    """
+    Managers compartilhados pela aplicação, construídos sob demanda.
+
+    Aplicação e janela usam a mesma instância de cada manager (antes cada
+    um criava o seu PipeWireManager). Nada é construído até o primeiro
+    acesso, para não pesar no tempo até a janela aparecer.
+
+    O estado do equalizador (`gains` e o histórico) também fica aqui, para
+    sobreviver à janela no modo em segundo plano. Mudanças de banda vindas
+    de outras threads (MIDI) e da thread da UI passam por `update_gains`,
+    que altera o dicionário no lugar sob um lock: nenhuma se perde.
+
+    `use_dbus=False` (CLI) controla o systemd por `systemctl`, sem `gi`.
+    """
+
+    def __init__(self, use_dbus: bool = True):
+        self.use_dbus = use_dbus
+        self._lock = threading.RLock()
+        self._instances = {}
+        self._gains_lock = threading.Lock()
+        self.gains = {freq: 0.0 for freq in FREQUENCIES}
+
+    def update_gains(self, changes: dict) -> dict:
+        """Altera bandas de `gains` (de qualquer thread); retorna uma cópia do resultado."""
+        with self._gains_lock:
+            self.gains.update(changes)
+            return dict(self.gains)
+
+    def gains_snapshot(self) -> dict:
+        with self._gains_lock:
+            return dict(self.gains)
+
+    def restore_state(self) -> dict:
+        """
+        Carrega o último estado salvo (temp.conf) em `gains`.
+
+        Só lê o arquivo; conferir com a config ativa fica para depois da
+        janela aparecer (PipeWireManager.matches_active_config).
+        """
+        gains = {freq: 0.0 for freq in FREQUENCIES}
+        if self.config_manager.get_temp_config_path().exists():
+            gains.update(self.config_manager.read_config("temp.conf"))
+        self.gains = gains
+        return gains
+
+    def restored_gain_offsets(self):
+        """
+        Deslocamentos a considerar ao conferir o estado restaurado: os da
+        config ativa se a compensação de loudness segue ligada (ela só
+        volta depois e os refaz), senão None (a config deve ficar sem eles).
+        """
+        if not self.config_manager.get_bool_setting("loudness_mode"):
+            return None
+        return self.pipewire_manager.saved_gain_offsets()
+
+    def _lazy(self, name, factory):
+        """Retorna a instância compartilhada, construindo-a no primeiro acesso."""
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                instance = factory()
+                self._instances[name] = instance
+            return instance
+
+    def is_built(self, name: str) -> bool:
+        """Indica se o manager já foi construído."""
+        return name in self._instances
+
+    @property
+    def pipewire_manager(self) -> PipeWireManager:
+        return self._lazy("pipewire_manager", self._build_pipewire_manager)
+
+    def _build_pipewire_manager(self) -> PipeWireManager:
+        manager = PipeWireManager(use_dbus=self.use_dbus)
+        # A supervisão do modo isolado ouve o grafo (quando o monitor roda)
+        manager.watch_graph(self.graph_monitor)
+        if self.config_manager.get_bool_setting("isolated_mode"):
+            # Só aponta para a config isolada; a instância sobe depois
+            # (janela: após o primeiro frame; CLI: só nos comandos que aplicam)
+            manager.use_isolated_config()
+        if self.config_manager.get_bool_setting("accurate_mode"):
+            manager.enable_accurate_mode(True)
+        return manager
+
+    @property
+    def config_manager(self) -> ConfigManager:
+        return self._lazy("config_manager", ConfigManager)
+
+    @property
+    def preset_manager(self) -> PresetManager:
+        return self._lazy("preset_manager", lambda: PresetManager(self.pipewire_manager))
+
+    @property
+    def param_pusher(self) -> ParamPusher:
+        return self._lazy("param_pusher", lambda: ParamPusher(self.pipewire_manager))
+
+    @property
+    def morpher(self) -> PresetMorpher:
+        return self._lazy("morpher", lambda: PresetMorpher(self.param_pusher))
+
+    @property
+    def graph_monitor(self) -> GraphMonitor:
+        return self._lazy("graph_monitor", GraphMonitor)
+
+    @property
+    def reconciler(self) -> Reconciler:
+        return self._lazy("reconciler", lambda: Reconciler(self.pipewire_manager, self.graph_monitor))
+
+    @property
+    def watchdog(self) -> EqWatchdog:
+        return self._lazy("watchdog", lambda: EqWatchdog(
+            self.pipewire_manager, self.config_manager, self.graph_monitor, self.param_pusher
+        ))
+
+    @property
+    def bypass(self) -> EqBypass:
+        return self._lazy("bypass", lambda: EqBypass(self.graph_monitor))
+
+    @property
+    def loudness(self) -> LoudnessCompensator:
+        return self._lazy("loudness", lambda: LoudnessCompensator(
+            self.pipewire_manager, self.graph_monitor
+        ))
+
+    @property
+    def midi(self) -> MidiInput:
+        return self._lazy("midi", lambda: MidiInput(
+            self, self.config_manager.get_setting("midi_port", "")
+        ))
+
+    @property
+    def history(self) -> GainsHistory:
+        return self._lazy("history", GainsHistory)
+
+    @property
+    def device_switcher(self) -> DeviceAutoSwitcher:
+        return self._lazy("device_switcher", self._build_device_switcher)
+
+    def _build_device_switcher(self) -> DeviceAutoSwitcher:
+        switcher = DeviceAutoSwitcher(self, self.graph_monitor)
+        # Mantém o estado em dia também sem janela aberta
+        switcher.add_listener(self._on_device_switch)
+        return switcher
+
+    def _on_device_switch(self, sink, preset_name, gains, ok):
+        if ok:
+            self.gains = dict(gains)
+
+    def shutdown(self) -> None:
+        """Para workers e grava o estado pendente dos managers já construídos."""
+        if self.is_built("pipewire_manager"):
+            # Applies em andamento desistem das esperas e deixam a última config boa
+            self.pipewire_manager.cancel_applies("encerrando")
+        if self.is_built("bypass"):
+            self.bypass.restore()
+        if self.is_built("loudness"):
+            self.loudness.stop()
+        if self.is_built("midi"):
+            self.midi.stop()
+        if self.is_built("device_switcher"):
+            self.device_switcher.stop()
+        if self.is_built("watchdog"):
+            self.watchdog.stop()
+        if self.is_built("graph_monitor"):
+            self.graph_monitor.stop()
+        if self.is_built("morpher"):
+            self.morpher.cancel()
+        if self.is_built("param_pusher"):
+            self.param_pusher.stop()
+        if self.is_built("config_manager"):
+            self.config_manager.shutdown()
@@ -0,0 +1,85 @@
+import contextlib
+import threading
+import time
+
+
+class DeadlineExceeded(Exception):
+    """Prazo do apply esgotado ou apply cancelado."""
+
+
+class Deadline:
+    """
+    Prazo único de um apply, consumido por todas as etapas.
+
+    Cada espera (subprocess, sleep, restart de unit, prontidão do daemon)
+    usa no máximo o tempo que resta. O prazo também pode ser cancelado de
+    outra thread (apply mais novo, app fechando): as esperas em andamento
+    acordam na hora e as próximas etapas nem começam.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._on_cancel = []
+        self.reason = None  # "timeout", "substituído", "encerrando"...
+
+    def cancel(self, reason: str = "cancelado") -> None:
+        with self._lock:
+            if self.reason is None:
+                self.reason = reason
+            self._cancelled.set()
+            callbacks, self._on_cancel = self._on_cancel, []
+        for callback in callbacks:
+            callback()
+
+    @contextlib.contextmanager
+    def on_cancel(self, callback):
+        """Chama callback() se o prazo for cancelado durante o bloco (ex: matar um subprocesso)."""
+        with self._lock:
+            cancelled = self._cancelled.is_set()
+            if not cancelled:
+                self._on_cancel.append(callback)
+        if cancelled:
+            callback()
+        try:
+            yield
+        finally:
+            with self._lock:
+                if callback in self._on_cancel:
+                    self._on_cancel.remove(callback)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def remaining(self) -> float:
+        """Segundos restantes (0 se esgotado ou cancelado)."""
+        if self._cancelled.is_set():
+            return 0.0
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        if self.remaining() > 0:
+            return False
+        if self.reason is None:
+            self.reason = "timeout"
+        return True
+
+    def check(self, step: str = "") -> None:
+        """Levanta DeadlineExceeded se não há mais tempo para `step`."""
+        if self.expired():
+            raise DeadlineExceeded(f"{step or 'apply'}: {self.reason}")
+
+    def clamp(self, timeout: float) -> float:
+        """Limita um timeout ao tempo restante; DeadlineExceeded se não resta nada."""
+        remaining = self.remaining()
+        if remaining <= 0:
+            self.check()
+        return min(timeout, remaining) if timeout is not None else remaining
+
+    def sleep(self, seconds: float) -> bool:
+        """Dorme até `seconds` (acorda se cancelado); False se o prazo acabou."""
+        self._cancelled.wait(min(seconds, self.remaining()))
+        return not self.expired()
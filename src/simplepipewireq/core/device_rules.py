@@ -0,0 +1,204 @@
+import fnmatch
+import json
+import logging
+import threading
+import time
+from typing import Callable, List, Optional
+from simplepipewireq.core.graph_monitor import GraphEvent, GraphMonitor
+from simplepipewireq.utils.constants import DEVICE_RULES_FILE, EQ_NODE_NAME
+from simplepipewireq.utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+class DeviceRules:
+    """
+    Regras que associam dispositivos de saída a presets.
+
+    Arquivo JSON (DEVICE_RULES_FILE):
+
+        {
+          "rules": [
+            {"match": {"node.name": "bluez_output.*"}, "preset": "Fone BT"},
+            {"match": {"device.route": "*headphones*"}, "preset": "Fone"},
+            {"match": {"device.product.name": "*USB*"}, "preset": "DAC"}
+          ],
+          "default": "Flat"
+        }
+
+    Cada `match` compara propriedades do sink e da placa (curingas de
+    fnmatch, sem diferenciar maiúsculas); a primeira regra cujas chaves
+    casam todas vence. O arquivo é relido quando muda.
+    """
+
+    def __init__(self, path=DEVICE_RULES_FILE):
+        self.path = path
+        self._mtime = None
+        self.rules = []
+        self.default = None
+
+    def _reload_if_changed(self) -> None:
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except OSError:
+            self._mtime, self.rules, self.default = None, [], None
+            return
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+        try:
+            data = json.loads(self.path.read_text())
+            self.rules = [
+                rule for rule in data.get("rules", [])
+                if isinstance(rule.get("match"), dict) and rule.get("preset")
+            ]
+            self.default = data.get("default") or None
+            logger.info(f"Regras de dispositivo carregadas: {len(self.rules)}")
+        except (OSError, ValueError, AttributeError) as e:
+            logger.error(f"Erro ao ler {self.path}: {e}")
+            self.rules, self.default = [], None
+
+    def has_rules(self) -> bool:
+        self._reload_if_changed()
+        return bool(self.rules or self.default)
+
+    def preset_for(self, props: dict) -> Optional[str]:
+        """Preset da primeira regra que casa com `props`, ou o padrão."""
+        self._reload_if_changed()
+        for rule in self.rules:
+            if all(
+                fnmatch.fnmatchcase(str(props.get(key, "")).lower(), str(pattern).lower())
+                for key, pattern in rule["match"].items()
+            ):
+                return rule["preset"]
+        return self.default
+
+
+class DeviceAutoSwitcher:
+    """
+    Troca de preset automática quando a saída de áudio muda.
+
+    Observa o GraphMonitor: mudança do sink padrão (metadata), sinks
+    conectados/removidos e mudança de rota da placa (fone plugado no mesmo
+    conector). Quando o dispositivo de saída muda, aplica o preset da
+    regra pelo caminho mais rápido: ganhos enviados ao vivo ao nó em
+    execução e swap atômico do arquivo para a config pré-compilada; reload
+    só se o nó não estiver acessível.
+    """
+
+    def __init__(self, context, monitor: GraphMonitor, rules: DeviceRules = None):
+        self.context = context
+        self.monitor = monitor
+        self.rules = rules or DeviceRules()
+
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = None
+        self._device_key = None      # (sink, rota) do último dispositivo visto
+        self._listeners: List[Callable] = []
+        self.current_preset = None
+        self.last_switch_ms = None
+
+    def add_listener(self, callback: Callable) -> None:
+        """callback(sink, preset, ganhos, sucesso) após cada troca automática."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped = False
+        self.monitor.add_listener(self._on_event)
+        self.monitor.start()
+        self._thread = threading.Thread(
+            target=self._run, name="simplepipewireq-device-switch", daemon=True
+        )
+        self._thread.start()
+        self._wake.set()
+
+    def stop(self) -> None:
+        self.monitor.remove_listener(self._on_event)
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(2.0)
+
+    # ==== EVENTOS ====
+
+    def _on_event(self, event: GraphEvent) -> None:
+        if event.kind in ("connected", "metadata", "device_changed", "device_added", "device_removed"):
+            self._wake.set()
+        elif event.kind in ("node_added", "node_removed"):
+            if event.props.get("media.class") == "Audio/Sink":
+                self._wake.set()
+
+    def current_output(self) -> Optional[str]:
+        """node.name do dispositivo de saída real (não o sink do EQ)."""
+        return self.monitor.output_sink_name(exclude=EQ_NODE_NAME)
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._stopped:
+                return
+            if not self.monitor.connected:
+                continue
+
+            sink = self.current_output()
+            props = self.monitor.sink_properties(sink) if sink else None
+            if props is None:
+                continue
+            key = (sink, props.get("device.route"))
+            first = self._device_key is None
+            if key == self._device_key:
+                continue
+            self._device_key = key
+            if first:
+                # Estado inicial: o que o usuário aplicou continua valendo
+                continue
+
+            preset = self.rules.preset_for(props)
+            if preset is None:
+                continue
+            self._apply(sink, preset)
+
+    def _apply(self, sink: str, preset: str) -> None:
+        ctx = self.context
+        artifact = ctx.preset_manager.get_preset_artifact(preset)
+        if artifact is None:
+            logger.error(f"Preset da regra de dispositivo não encontrado: {preset}")
+            return
+        key, gains = artifact
+
+        start = time.perf_counter()
+        with tracer.apply("device-switch", sink=sink, preset=preset) as root:
+            pipewire_manager = ctx.pipewire_manager
+            ok = pipewire_manager.set_gains_live(gains)
+            strategy = "ao vivo"
+            if ok:
+                if not ctx.preset_manager.config_cache.activate(key):
+                    pipewire_manager.generate_pipewire_config(gains)
+            else:
+                ok = pipewire_manager.hot_reload_dynamic(gains)
+                strategy = root.attrs.get("strategy") or "reload"
+            root.set(strategy=strategy, ok=ok)
+        self.last_switch_ms = (time.perf_counter() - start) * 1000.0
+
+        if ok:
+            self.current_preset = preset
+            ctx.param_pusher.forget_last_pushed()
+            ctx.config_manager.schedule_write("temp.conf", gains)
+            logger.info(
+                f"Saída '{sink}': preset '{preset}' aplicado em {self.last_switch_ms:.0f} ms ({strategy})"
+            )
+        else:
+            logger.error(f"Falha ao aplicar preset '{preset}' para a saída '{sink}'")
+        for callback in list(self._listeners):
+            try:
+                callback(sink, preset, gains, ok)
+            except Exception as e:
+                logger.error(f"Erro em listener da troca automática: {e}")
@@ -0,0 +1,189 @@
+import math
+from typing import Dict, List
+from simplepipewireq.core.response import peaking_coefficients, peaking_response_db
+from simplepipewireq.utils.constants import (
+    FREQUENCIES, EQ_FILTER_Q, MIN_GAIN, MAX_GAIN, RESPONSE_SAMPLE_RATE,
+    EQ_SOLVER_MIDPOINT_WEIGHT, EQ_SOLVER_REGULARIZATION
+)
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: sem ele o solver usa Python puro
+    np = None
+
+
+def _invert(matrix: List[List[float]]) -> List[List[float]]:
+    """Inversa por Gauss-Jordan com pivoteamento parcial (matriz pequena)."""
+    n = len(matrix)
+    aug = [list(row) + [1.0 if i == j else 0.0 for j in range(n)] for i, row in enumerate(matrix)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(aug[r][col]))
+        if abs(aug[pivot][col]) < 1e-12:
+            raise ValueError("matriz de interação singular")
+        aug[col], aug[pivot] = aug[pivot], aug[col]
+        scale = aug[col][col]
+        aug[col] = [value / scale for value in aug[col]]
+        for row in range(n):
+            if row != col and aug[row][col]:
+                factor = aug[row][col]
+                aug[row] = [a - factor * b for a, b in zip(aug[row], aug[col])]
+    return [row[n:] for row in aug]
+
+
+class EqSolver:
+    """
+    Compensa a interação entre bandas vizinhas do EQ gráfico.
+
+    Com filtros peaking de Q 0.707 a uma oitava de distância as bandas se
+    sobrepõem: +6 dB em duas bandas vizinhas dão cerca de +9 dB entre elas.
+    O solver calcula os ganhos reais dos filtros cuja resposta combinada
+    mais se aproxima das posições dos sliders.
+
+    A matriz de interação (resposta de cada banda, com um ganho protótipo,
+    nos centros das bandas e nos pontos médios entre elas) é calculada uma
+    vez, junto com sua pseudo-inversa ponderada; cada solve é um produto
+    matriz-vetor seguido de uma iteração de correção contra a resposta
+    exata, para compensar a não linearidade do ganho em dB.
+    """
+
+    def __init__(self, q: float = EQ_FILTER_Q, sample_rate: float = RESPONSE_SAMPLE_RATE,
+                 prototype_gain: float = MAX_GAIN):
+        self.q = q
+        self.sample_rate = sample_rate
+        # Centros das bandas e médias geométricas entre vizinhas
+        centres = [float(freq) for freq in FREQUENCIES]
+        midpoints = [math.sqrt(a * b) for a, b in zip(centres, centres[1:])]
+        self.points = centres + midpoints
+        weights = [1.0] * len(centres) + [EQ_SOLVER_MIDPOINT_WEIGHT] * len(midpoints)
+
+        # matrix[k][j]: dB no ponto k por dB de ganho na banda j
+        self._columns = [
+            [value / prototype_gain for value in
+             peaking_response_db(freq, prototype_gain, self.points, q, sample_rate)]
+            for freq in FREQUENCIES
+        ]
+        self.matrix = [list(row) for row in zip(*self._columns)]
+        self._weights = weights
+        # Pseudo-inversas por conjunto de bandas livres (as demais presas no limite)
+        self._pinv_cache = {}
+        all_bands = tuple(range(len(FREQUENCIES)))
+        self._pinv = self._pseudo_inverse(all_bands)
+
+        if np is not None:
+            w = 2.0 * np.pi * np.array(self.points) / sample_rate
+            self._cos_w = np.cos(w)
+            self._cos_2w = np.cos(2.0 * w)
+
+    def _pseudo_inverse(self, free: tuple):
+        """(BᵀWB + λI)⁻¹BᵀW restrita às bandas `free` (bandas × pontos)."""
+        cached = self._pinv_cache.get(free)
+        if cached is not None:
+            return cached
+        columns = [self._columns[j] for j in free]
+        weights = self._weights
+        points = range(len(self.points))
+        normal = [
+            [sum(weights[k] * a[k] * b[k] for k in points) + (EQ_SOLVER_REGULARIZATION if a is b else 0.0)
+             for b in columns]
+            for a in columns
+        ]
+        inverse = _invert(normal)
+        pinv = [
+            [sum(inverse[i][j] * columns[j][k] for j in range(len(free))) * weights[k] for k in points]
+            for i in range(len(free))
+        ]
+        if np is not None:
+            pinv = np.array(pinv)
+        self._pinv_cache[free] = pinv
+        return pinv
+
+    @staticmethod
+    def is_vectorized() -> bool:
+        return np is not None
+
+    def targets(self, gains: Dict[int, float]) -> List[float]:
+        """Resposta desejada em cada ponto: sliders nos centros, média entre eles."""
+        centres = [float(gains.get(freq, 0.0)) for freq in FREQUENCIES]
+        return centres + [(a + b) / 2.0 for a, b in zip(centres, centres[1:])]
+
+    def solve(self, gains: Dict[int, float]) -> Dict[int, float]:
+        """
+        Ganhos dos filtros para que a resposta siga os sliders.
+
+        Args:
+            gains: Posições dos sliders {freq: dB}
+
+        Returns:
+            dict: Ganhos reais dos filtros {freq: dB}, dentro de [MIN_GAIN, MAX_GAIN]
+        """
+        target = self.targets(gains)
+        if not any(target):
+            return {freq: 0.0 for freq in FREQUENCIES}
+        solution = self._bounded_solve(target)
+        # Correção da não linearidade: o modelo linear erra um pouco com
+        # ganhos longe do protótipo; resolve de novo descontando esse erro
+        linear = self._matvec(self.matrix, solution)
+        realized = self.realized(solution)
+        adjusted = [t + l - r for t, l, r in zip(target, linear, realized)]
+        solution = self._bounded_solve(adjusted)
+        return {freq: value for freq, value in zip(FREQUENCIES, solution)}
+
+    def _bounded_solve(self, target: List[float]) -> List[float]:
+        """
+        Mínimos quadrados com os ganhos limitados a [MIN_GAIN, MAX_GAIN].
+
+        Bandas que passam do limite ficam presas nele e as demais são
+        resolvidas de novo contra o que sobrou do alvo (conjunto ativo).
+        """
+        bands = len(FREQUENCIES)
+        fixed = {}
+        solution = [0.0] * bands
+        while len(fixed) < bands:
+            free = tuple(j for j in range(bands) if j not in fixed)
+            residual = list(target)
+            for j, gain in fixed.items():
+                column = self._columns[j]
+                residual = [r - gain * c for r, c in zip(residual, column)]
+            values = self._matvec(self._pseudo_inverse(free), residual)
+            out_of_range = False
+            for j, value in zip(free, values):
+                solution[j] = value
+                if value > MAX_GAIN or value < MIN_GAIN:
+                    fixed[j] = MAX_GAIN if value > MAX_GAIN else MIN_GAIN
+                    out_of_range = True
+            if not out_of_range:
+                break
+        for j, gain in fixed.items():
+            solution[j] = gain
+        return solution
+
+    @staticmethod
+    def _matvec(matrix, vector: List[float]) -> List[float]:
+        if np is not None:
+            return (np.asarray(matrix) @ np.asarray(vector)).tolist()
+        return [sum(m * v for m, v in zip(row, vector)) for row in matrix]
+
+    def realized(self, filter_gains: List[float]) -> List[float]:
+        """Resposta exata (dB) nos pontos de controle para os ganhos dos filtros."""
+        if np is not None:
+            return self._realized_numpy(filter_gains).tolist()
+        total = [0.0] * len(self.points)
+        for freq, gain in zip(FREQUENCIES, filter_gains):
+            if gain == 0.0:
+                continue
+            for k, value in enumerate(peaking_response_db(freq, gain, self.points, self.q, self.sample_rate)):
+                total[k] += value
+        return total
+
+    def _realized_numpy(self, filter_gains: List[float]) -> "np.ndarray":
+        total = np.zeros(len(self.points))
+        for freq, gain in zip(FREQUENCIES, filter_gains):
+            if gain == 0.0:
+                continue
+            b0, b1, b2, a1, a2 = peaking_coefficients(freq, gain, self.q, self.sample_rate)
+            num = (b0 * b0 + b1 * b1 + b2 * b2 + 2.0 * (b0 * b1 + b1 * b2) * self._cos_w
+                   + 2.0 * b0 * b2 * self._cos_2w)
+            den = (1.0 + a1 * a1 + a2 * a2 + 2.0 * (a1 + a1 * a2) * self._cos_w
+                   + 2.0 * a2 * self._cos_2w)
+            total += 10.0 * np.log10(np.maximum(num, 1e-30) / np.maximum(den, 1e-30))
+        return total
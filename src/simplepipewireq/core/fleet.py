@@ -0,0 +1,150 @@
+import json
+import logging
+import stat
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from simplepipewireq.core.graph_monitor import node_band_gains
+from simplepipewireq.core.pipewire_manager import PipeWireManager
+from simplepipewireq.utils.constants import (
+    FREQUENCIES, EQ_NODE_NAME, PIPEWIRE_DUMP_CMD, PIPEWIRE_CLI_CMD,
+    FLEET_RUNTIME_ROOT, FLEET_SOCKET_NAME, FLEET_MAX_WORKERS, FLEET_SESSION_TIMEOUT,
+    FLEET_GAIN_TOLERANCE_DB
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SessionResult:
+    """Resultado da aplicação em uma sessão."""
+    socket: str
+    status: str             # "applied", "skipped" (já no alvo) ou "failed"
+    elapsed_ms: float
+    node_id: Optional[int] = None
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status != "failed"
+
+    def to_dict(self) -> dict:
+        return {
+            "socket": self.socket,
+            "status": self.status,
+            "elapsed_ms": round(self.elapsed_ms, 1),
+            "node_id": self.node_id,
+            "error": self.error,
+        }
+
+
+def discover_sessions(runtime_root: Path = FLEET_RUNTIME_ROOT,
+                      socket_name: str = FLEET_SOCKET_NAME) -> List[Path]:
+    """
+    Sockets do PipeWire das sessões de usuário (`<runtime_root>/*/pipewire-0`).
+
+    Só entram sockets de verdade; diretórios sem permissão de leitura são
+    ignorados. A ordem é a numérica dos UIDs.
+    """
+    sockets = []
+    try:
+        entries = list(Path(runtime_root).iterdir())
+    except OSError as e:
+        logger.error(f"Não foi possível listar {runtime_root}: {e}")
+        return []
+    for entry in entries:
+        path = entry / socket_name
+        try:
+            if stat.S_ISSOCK(path.stat().st_mode):
+                sockets.append(path)
+        except OSError:
+            continue
+    return sorted(sockets, key=lambda p: (not p.parent.name.isdigit(),
+                                          int(p.parent.name) if p.parent.name.isdigit() else 0,
+                                          p.parent.name))
+
+
+def eq_node_state(dump: list) -> Tuple[Optional[int], Dict[int, float]]:
+    """ID do nó do EQ e ganhos atuais das bandas, a partir da saída do pw-dump."""
+    for obj in dump:
+        info = obj.get("info") or {}
+        if (info.get("props") or {}).get("node.name") == EQ_NODE_NAME:
+            return obj.get("id"), node_band_gains(info)
+    return None, {}
+
+
+class FleetApplier:
+    """
+    Aplica a mesma curva nas sessões de PipeWire de vários usuários.
+
+    Cada sessão é acessada pelo socket do seu daemon (`pw-dump -r` e
+    `pw-cli -r`): o estado atual do nó do EQ é lido e, se as bandas já estão
+    no alvo, a sessão é pulada; senão os ganhos vão ao vivo em um único
+    set-param. As sessões são processadas em paralelo por um pool limitado
+    de threads, e cada comando tem o próprio timeout, então uma sessão
+    travada não segura as outras.
+    """
+
+    def __init__(self, max_workers: int = FLEET_MAX_WORKERS,
+                 timeout: float = FLEET_SESSION_TIMEOUT):
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+
+    def apply(self, sockets: List[Path], gains: Dict[int, float],
+              force: bool = False) -> List[SessionResult]:
+        """
+        Aplica `gains` (ganhos dos filtros) em cada sessão.
+
+        Args:
+            sockets: Sockets das sessões (ver discover_sessions)
+            gains: {freq: dB} completos
+            force: Enviar mesmo para sessões que já estão no alvo
+
+        Returns:
+            List[SessionResult]: Na mesma ordem de `sockets`
+        """
+        if not sockets:
+            return []
+        props = PipeWireManager.live_props(gains)
+        workers = min(self.max_workers, len(sockets))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="simplepipewireq-fleet") as pool:
+            return list(pool.map(lambda s: self._apply_one(str(s), gains, props, force), sockets))
+
+    def _apply_one(self, socket: str, gains: dict, props: str, force: bool) -> SessionResult:
+        start = time.perf_counter()
+
+        def result(status, node_id=None, error=""):
+            elapsed = (time.perf_counter() - start) * 1000.0
+            if error:
+                logger.warning(f"Sessão {socket}: {error}")
+            return SessionResult(socket, status, elapsed, node_id, error)
+
+        try:
+            dump = self._run(PIPEWIRE_DUMP_CMD + ["-r", socket])
+            if dump.returncode != 0:
+                return result("failed", error=dump.stderr.strip() or "pw-dump falhou")
+            node_id, current = eq_node_state(json.loads(dump.stdout or "[]"))
+            if node_id is None:
+                return result("failed", error="nó do equalizador não encontrado")
+            if not force and all(
+                abs(current.get(freq, float("nan")) - gains.get(freq, 0.0)) <= FLEET_GAIN_TOLERANCE_DB
+                for freq in FREQUENCIES
+            ):
+                return result("skipped", node_id)
+
+            applied = self._run(
+                PIPEWIRE_CLI_CMD + ["-r", socket, "set-param", str(node_id), "Props", props]
+            )
+            if applied.returncode != 0:
+                return result("failed", node_id, applied.stderr.strip() or "set-param falhou")
+            return result("applied", node_id)
+        except subprocess.TimeoutExpired:
+            return result("failed", error=f"timeout ({self.timeout:.0f} s)")
+        except (OSError, ValueError) as e:
+            return result("failed", error=str(e))
+
+    def _run(self, cmd: list) -> subprocess.CompletedProcess:
+        return subprocess.run(cmd, capture_output=True, text=True, timeout=self.timeout)
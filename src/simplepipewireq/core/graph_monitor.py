@@ -0,0 +1,335 @@
+import json
+import logging
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+from simplepipewireq.utils.constants import (
+    PIPEWIRE_DUMP_MONITOR_CMD, PIPEWIRE_DUMP_CMD, FREQUENCIES, EQ_BAND_NODE_PREFIX,
+    GRAPH_RECONNECT_MIN_DELAY, GRAPH_RECONNECT_MAX_DELAY
+)
+
+logger = logging.getLogger(__name__)
+
+_BAND_CONTROLS = {f"{EQ_BAND_NODE_PREFIX}{i}:Gain": freq for i, freq in enumerate(FREQUENCIES)}
+
+
+def node_band_gains(info: Optional[dict]) -> Dict[int, float]:
+    """
+    Ganhos das bandas em execução, a partir das infos de um nó do pw-dump.
+
+    Os controles do filter-chain aparecem em Props como uma lista plana
+    ["eq_band_0:Gain", 0.0, "eq_band_1:Gain", 1.5, ...].
+    """
+    gains = {}
+    for props in ((info or {}).get("params") or {}).get("Props") or []:
+        params = props.get("params")
+        if not isinstance(params, list):
+            continue
+        for name, value in zip(params[::2], params[1::2]):
+            freq = _BAND_CONTROLS.get(name)
+            if freq is not None and isinstance(value, (int, float)):
+                gains[freq] = float(value)
+    return gains
+
+_TYPE_NODE = "PipeWire:Interface:Node"
+_TYPE_DEVICE = "PipeWire:Interface:Device"
+_TYPE_METADATA = "PipeWire:Interface:Metadata"
+
+
+@dataclass
+class GraphEvent:
+    """
+    Evento do grafo do PipeWire.
+
+    kind: "connected", "disconnected", "node_added", "node_changed",
+          "node_removed", "device_added", "device_changed",
+          "device_removed" ou "metadata"
+    """
+    kind: str
+    object_id: Optional[int] = None
+    props: dict = field(default_factory=dict)
+    data: object = None
+
+
+class GraphMonitor:
+    """
+    Acompanha o grafo do PipeWire por eventos (`pw-dump --monitor`).
+
+    Um único processo pw-dump fica conectado e imprime cada mudança do grafo;
+    as mudanças viram GraphEvent entregues aos listeners na thread do leitor
+    (os listeners devem ser rápidos e repassar trabalho pesado adiante).
+    Quando o daemon reinicia, o pw-dump perde a conexão: o monitor emite
+    "disconnected", reconecta com backoff curto e emite "connected" com
+    data={"reconnected": True} ao receber o novo estado.
+
+    Mantém uma cópia do estado: `nodes` e `devices` ({id: info}) e
+    `metadata` ({metadata.name: {chave: valor}}).
+    """
+
+    def __init__(self):
+        self.nodes: Dict[int, dict] = {}
+        self.devices: Dict[int, dict] = {}
+        self.metadata: Dict[str, dict] = {}
+        self._metadata_ids: Dict[int, str] = {}
+        self._listeners: List[Callable[[GraphEvent], None]] = []
+        self._lock = threading.Lock()
+        self._process = None
+        self._thread = None
+        self._stopped = False
+        self.connected = False
+
+    def add_listener(self, callback: Callable[[GraphEvent], None]) -> None:
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback) -> None:
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    # ==== CONSULTA ====
+
+    def find_node(self, node_name: str) -> Optional[int]:
+        """ID do nó com este node.name, ou None."""
+        with self._lock:
+            for node_id, info in self.nodes.items():
+                if info.get("props", {}).get("node.name") == node_name:
+                    return node_id
+        return None
+
+    def node_info(self, node_id: int) -> Optional[dict]:
+        with self._lock:
+            return self.nodes.get(node_id)
+
+    def get_metadata(self, key: str, name: str = "default"):
+        """Valor de uma chave de metadata (ex: "default.audio.sink")."""
+        with self._lock:
+            return self.metadata.get(name, {}).get(key)
+
+    def default_sink_name(self) -> Optional[str]:
+        value = self.get_metadata("default.audio.sink")
+        if isinstance(value, dict):
+            return value.get("name")
+        return None
+
+    def sinks(self) -> List[dict]:
+        """Props dos nós Audio/Sink do grafo."""
+        with self._lock:
+            return [
+                info.get("props", {}) for info in self.nodes.values()
+                if info.get("props", {}).get("media.class") == "Audio/Sink"
+            ]
+
+    def output_sink_name(self, exclude: str = None) -> Optional[str]:
+        """
+        node.name do dispositivo de saída real.
+
+        É o sink padrão, a menos que o padrão seja `exclude` (o sink do EQ):
+        nesse caso, o sink de maior prioridade, para onde o EQ envia o áudio.
+        """
+        default = self.default_sink_name()
+        if default and default != exclude:
+            return default
+        candidates = [
+            props for props in self.sinks()
+            if props.get("node.name") not in (None, exclude)
+        ]
+        if not candidates:
+            return None
+        best = max(candidates, key=lambda props: int(props.get("priority.session", 0) or 0))
+        return best.get("node.name")
+
+    def sink_properties(self, node_name: str) -> Optional[dict]:
+        """
+        Props de um sink combinadas com as do dispositivo (placa) dele.
+
+        Inclui "device.route": nome da rota de saída ativa do dispositivo
+        (ex: "analog-output-headphones"), que muda ao plugar um fone no
+        mesmo conector.
+        """
+        with self._lock:
+            node = next(
+                (info for info in self.nodes.values()
+                 if info.get("props", {}).get("node.name") == node_name),
+                None
+            )
+            if node is None:
+                return None
+            node_props = node.get("props", {})
+            props = {}
+            device = self.devices.get(node_props.get("device.id"))
+            if device is not None:
+                props.update(device.get("props", {}))
+                profile_device = node_props.get("card.profile.device")
+                for route in (device.get("params", {}) or {}).get("Route", []) or []:
+                    if route.get("direction") == "Output" and (
+                            profile_device is None or route.get("device") == profile_device):
+                        props["device.route"] = route.get("name")
+                        break
+            props.update(node_props)
+            return props
+
+    # ==== CICLO DE VIDA ====
+
+    def load_snapshot(self, timeout: float = 5.0) -> bool:
+        """
+        Carrega o estado atual do grafo com um único `pw-dump`, sem monitorar.
+
+        Para usos de curta duração (CLI); com o monitor rodando não é necessário.
+        """
+        try:
+            result = subprocess.run(
+                PIPEWIRE_DUMP_CMD, capture_output=True, text=True, timeout=timeout
+            )
+            if result.returncode != 0:
+                logger.error(f"Erro ao executar pw-dump: {result.stderr.strip()}")
+                return False
+            batch = json.loads(result.stdout)
+        except (OSError, subprocess.SubprocessError, ValueError) as e:
+            logger.error(f"Erro ao ler o grafo do PipeWire: {e}")
+            return False
+        self._clear_state()
+        self._apply_batch(batch, initial=True)
+        self.connected = True
+        return True
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._run, name="simplepipewireq-graph", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped = True
+        process = self._process
+        if process is not None:
+            process.terminate()
+        if self._thread is not None:
+            self._thread.join(2.0)
+
+    def _run(self):
+        delay = GRAPH_RECONNECT_MIN_DELAY
+        reconnecting = False
+        while not self._stopped:
+            try:
+                self._process = subprocess.Popen(
+                    PIPEWIRE_DUMP_MONITOR_CMD,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True
+                )
+            except OSError as e:
+                logger.error(f"Erro ao iniciar monitor do grafo: {e}")
+                return
+
+            got_state = self._read_stream(self._process, reconnecting)
+            self._process.wait()
+            self._process = None
+            if self._stopped:
+                return
+
+            if self.connected:
+                self.connected = False
+                logger.warning("Conexão com o PipeWire perdida (daemon reiniciado?)")
+                self._clear_state()
+                self._dispatch(GraphEvent("disconnected"))
+            reconnecting = True
+
+            # Reconexão imediata após uma sessão válida; backoff se o daemon
+            # ainda não voltou
+            delay = GRAPH_RECONNECT_MIN_DELAY if got_state else min(delay * 2, GRAPH_RECONNECT_MAX_DELAY)
+            time.sleep(delay)
+
+    def _read_stream(self, process, reconnecting: bool) -> bool:
+        """Lê os lotes JSON do pw-dump até o processo terminar."""
+        decoder = json.JSONDecoder()
+        lines = []
+        got_state = False
+        for line in process.stdout:
+            lines.append(line)
+            # pw-dump imprime cada lote como um array com "]" sozinho na linha
+            if not line.startswith("]"):
+                continue
+            text = "".join(lines)
+            lines = []
+            try:
+                batch, _ = decoder.raw_decode(text.strip())
+            except ValueError as e:
+                logger.debug(f"Lote inválido do pw-dump ignorado: {e}")
+                continue
+            if not got_state:
+                got_state = True
+                self._apply_batch(batch, initial=True)
+                self.connected = True
+                self._dispatch(GraphEvent("connected", data={"reconnected": reconnecting}))
+            else:
+                self._apply_batch(batch)
+        return got_state
+
+    # ==== ESTADO ====
+
+    def _clear_state(self) -> None:
+        with self._lock:
+            self.nodes.clear()
+            self.devices.clear()
+            self.metadata.clear()
+            self._metadata_ids.clear()
+
+    def _apply_batch(self, batch: list, initial: bool = False) -> None:
+        events = []
+        with self._lock:
+            for obj in batch:
+                object_id = obj.get("id")
+                obj_type = obj.get("type")
+                info = obj.get("info")
+
+                if obj_type == _TYPE_METADATA or object_id in self._metadata_ids:
+                    name = self._metadata_ids.get(object_id)
+                    if name is None:
+                        name = obj.get("props", {}).get("metadata.name", str(object_id))
+                        self._metadata_ids[object_id] = name
+                    entries = obj.get("metadata")
+                    if entries is None and "metadata" in obj:
+                        self.metadata.pop(name, None)
+                        self._metadata_ids.pop(object_id, None)
+                        continue
+                    values = {}
+                    for entry in entries or []:
+                        if entry.get("subject", 0) == 0:
+                            values[entry.get("key")] = entry.get("value")
+                    self.metadata[name] = values
+                    if not initial:
+                        events.append(GraphEvent("metadata", object_id, data={"name": name, "values": values}))
+                    continue
+
+                if obj_type == _TYPE_NODE or object_id in self.nodes:
+                    table, prefix = self.nodes, "node"
+                elif obj_type == _TYPE_DEVICE or object_id in self.devices:
+                    table, prefix = self.devices, "device"
+                else:
+                    continue
+                if info is None:
+                    old = table.pop(object_id, None)
+                    if old is not None:
+                        events.append(GraphEvent(f"{prefix}_removed", object_id, old.get("props", {})))
+                    continue
+                kind = f"{prefix}_changed" if object_id in table else f"{prefix}_added"
+                table[object_id] = info
+                if not initial:
+                    events.append(GraphEvent(kind, object_id, info.get("props", {}), info))
+        for event in events:
+            self._dispatch(event)
+
+    def _dispatch(self, event: GraphEvent) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for callback in listeners:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Erro em listener do grafo ({event.kind}): {e}")
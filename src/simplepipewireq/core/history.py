@@ -0,0 +1,128 @@
+import logging
+from array import array
+from typing import Optional, Tuple
+from simplepipewireq.utils.constants import FREQUENCIES, HISTORY_MEMORY_BUDGET_BYTES
+
+logger = logging.getLogger(__name__)
+
+class GainsHistory:
+    """
+    Histórico de desfazer/refazer dos estados de ganho.
+
+    Os estados ficam num ring buffer compacto baseado em `array` (float32
+    por banda + hash de 64 bits da config renderizada), em vez de uma lista
+    de dicts. A capacidade é derivada de um orçamento de memória; ao
+    encher, os estados mais antigos são sobrescritos.
+    """
+
+    def __init__(self, memory_budget: int = HISTORY_MEMORY_BUDGET_BYTES):
+        self._bands = len(FREQUENCIES)
+        entry_size = self._bands * array('f').itemsize + array('Q').itemsize
+        self.capacity = max(2, memory_budget // entry_size)
+
+        self._gains = array('f', bytes(self.capacity * self._bands * array('f').itemsize))
+        self._hashes = array('Q', bytes(self.capacity * array('Q').itemsize))
+        self._start = 0      # Slot físico do estado mais antigo
+        self._count = 0      # Estados válidos no buffer
+        self._cursor = -1    # Índice lógico do estado atual (-1 = vazio)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def memory_usage(self) -> int:
+        """Bytes ocupados pelos buffers do histórico."""
+        return (self._gains.itemsize * len(self._gains)
+                + self._hashes.itemsize * len(self._hashes))
+
+    def can_undo(self) -> bool:
+        return self._cursor > 0
+
+    def can_redo(self) -> bool:
+        return 0 <= self._cursor < self._count - 1
+
+    def push(self, gains_dict: dict, config_hash: int = 0) -> bool:
+        """
+        Registra um novo estado como atual, descartando o ramo de refazer.
+        Estados idênticos ao atual não são duplicados.
+
+        Args:
+            gains_dict: Dicionário de ganhos {freq: gain}
+            config_hash: Hash da config renderizada (0 = ainda não renderizada)
+
+        Returns:
+            bool: True se um novo estado foi registrado.
+        """
+        if self._cursor >= 0 and self._matches(self._cursor, gains_dict):
+            if config_hash:
+                self._hashes[self._slot(self._cursor)] = config_hash
+            return False
+
+        # Descarta o ramo de refazer
+        self._count = self._cursor + 1
+
+        if self._count == self.capacity:
+            # Buffer cheio: o mais antigo é sobrescrito
+            self._start = (self._start + 1) % self.capacity
+            self._count -= 1
+
+        self._count += 1
+        self._cursor = self._count - 1
+        self._store(self._cursor, gains_dict, config_hash)
+        return True
+
+    def set_current_hash(self, config_hash: int) -> None:
+        """Associa o hash da config renderizada ao estado atual."""
+        if self._cursor >= 0:
+            self._hashes[self._slot(self._cursor)] = config_hash
+
+    def current(self) -> Optional[Tuple[dict, int]]:
+        """Retorna (ganhos, hash) do estado atual, ou None se vazio."""
+        if self._cursor < 0:
+            return None
+        return self._load(self._cursor)
+
+    def undo(self) -> Optional[Tuple[dict, int]]:
+        """Volta um estado. Retorna (ganhos, hash) ou None se não houver."""
+        if not self.can_undo():
+            return None
+        self._cursor -= 1
+        return self._load(self._cursor)
+
+    def redo(self) -> Optional[Tuple[dict, int]]:
+        """Avança um estado. Retorna (ganhos, hash) ou None se não houver."""
+        if not self.can_redo():
+            return None
+        self._cursor += 1
+        return self._load(self._cursor)
+
+    def clear(self) -> None:
+        self._start = 0
+        self._count = 0
+        self._cursor = -1
+
+    def _slot(self, index: int) -> int:
+        """Converte índice lógico em slot físico do ring buffer."""
+        return (self._start + index) % self.capacity
+
+    def _store(self, index: int, gains_dict: dict, config_hash: int):
+        slot = self._slot(index)
+        base = slot * self._bands
+        for i, freq in enumerate(FREQUENCIES):
+            self._gains[base + i] = gains_dict.get(freq, 0.0)
+        self._hashes[slot] = config_hash
+
+    def _load(self, index: int) -> Tuple[dict, int]:
+        slot = self._slot(index)
+        base = slot * self._bands
+        gains = {
+            freq: round(self._gains[base + i], 2)
+            for i, freq in enumerate(FREQUENCIES)
+        }
+        return gains, self._hashes[slot]
+
+    def _matches(self, index: int, gains_dict: dict) -> bool:
+        base = self._slot(index) * self._bands
+        for i, freq in enumerate(FREQUENCIES):
+            if abs(self._gains[base + i] - gains_dict.get(freq, 0.0)) > 0.005:
+                return False
+        return True
@@ -0,0 +1,335 @@
+import logging
+import os
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+from simplepipewireq.core.graph_monitor import GraphEvent, GraphMonitor
+from simplepipewireq.utils.constants import (
+    PIPEWIRE_BINARY, ISOLATED_CONFIG_DIR, ISOLATED_CONFIG_NAME, ISOLATED_PID_FILE,
+    ISOLATED_READY_TIMEOUT, ISOLATED_MAX_RESTARTS, ISOLATED_RESTART_WINDOW,
+    ISOLATED_SUPERVISE_INTERVAL, ISOLATED_GRAPH_GRACE, EQ_NODE_NAME
+)
+from simplepipewireq.utils.fileio import atomic_write_text
+from simplepipewireq.utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Config base da instância: só o necessário para um cliente que hospeda o
+# filter-chain (o módulo em si vem do drop-in gerado pelo PipeWireManager)
+_BASE_CONFIG = """# SimplePipeWireEQ - Instância isolada do filter-chain
+# Gerada automaticamente pela aplicação
+
+context.properties = {
+    log.level = 0
+}
+
+context.spa-libs = {
+    audio.convert.* = audioconvert/libspa-audioconvert
+    support.*       = support/libspa-support
+}
+
+context.modules = [
+    {   name = libpipewire-module-rt
+        args = { nice.level = -11 }
+        flags = [ ifexists nofail ]
+    }
+    { name = libpipewire-module-protocol-native }
+    { name = libpipewire-module-client-node }
+    { name = libpipewire-module-adapter }
+]
+"""
+
+
+def _pid_alive(pid: int) -> bool:
+    """True se o processo existe e não é zumbi."""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            stat = f.read()
+    except OSError:
+        return False
+    end = stat.rfind(b")")
+    return stat[end + 2:end + 3] != b"Z"
+
+
+def _is_our_instance(pid: int) -> bool:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            cmdline = f.read().split(b"\0")
+    except OSError:
+        return False
+    return ISOLATED_CONFIG_NAME.encode() in cmdline
+
+
+class FilterChainInstance:
+    """
+    Instância dedicada do PipeWire (`pipewire -c`) que hospeda só o filter-chain.
+
+    A instância é um cliente do daemon principal: reconfigurar o equalizador
+    reinicia apenas este processo (alguns milissegundos), sem sinalizar nem
+    reiniciar o pipewire/pipewire-pulse do usuário, e os demais streams
+    continuam tocando.
+
+    O processo roda em sessão própria e sobrevive ao app; o PID fica em
+    ISOLATED_PID_FILE para ser adotado na próxima execução. Enquanto o app
+    roda, um supervisor reinicia a instância se ela cair (no máximo
+    ISOLATED_MAX_RESTARTS vezes em ISOLATED_RESTART_WINDOW segundos).
+
+    Com um GraphMonitor (`watch_graph`), o supervisor também reage ao grafo:
+    se o nó do equalizador some ou o daemon principal volta de um restart,
+    e o nó não reaparece em ISOLATED_GRAPH_GRACE segundos, a instância está
+    órfã (processo vivo, filter-chain fora do grafo) e é reiniciada.
+    """
+
+    def __init__(self, ready_check: Callable[[], bool] = None):
+        """
+        Args:
+            ready_check: Função que retorna True quando o nó do equalizador
+                         está no grafo (usada após reiniciar)
+        """
+        self.ready_check = ready_check
+        self._lock = threading.RLock()
+        self._process = None  # Popen quando a instância é filha deste processo
+        self._pid = None      # PID atual (filho ou adotado)
+        self._stopping = False
+        self._crashes = deque(maxlen=ISOLATED_MAX_RESTARTS)
+        self._supervisor = None
+        self._monitor = None
+        self._graph_lost = threading.Event()  # Sinalizado pelos eventos do grafo
+        self.last_restart_ms = None
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._pid
+
+    def is_running(self) -> bool:
+        pid = self._pid
+        return pid is not None and _pid_alive(pid)
+
+    def watch_graph(self, monitor: GraphMonitor) -> None:
+        """Passa a vigiar o nó do equalizador nos eventos do monitor."""
+        if self._monitor is monitor:
+            return
+        self.unwatch_graph()
+        self._monitor = monitor
+        monitor.add_listener(self._on_graph_event)
+
+    def unwatch_graph(self) -> None:
+        monitor, self._monitor = self._monitor, None
+        if monitor is not None:
+            monitor.remove_listener(self._on_graph_event)
+
+    # ==== CICLO DE VIDA ====
+
+    def start(self) -> bool:
+        """Adota a instância em execução ou inicia uma nova."""
+        with self._lock:
+            self._stopping = False
+            if self.is_running() or self._adopt():
+                self._ensure_supervisor()
+                return True
+            return self._spawn()
+
+    def restart(self, timeout: float = ISOLATED_READY_TIMEOUT, deadline=None) -> bool:
+        """
+        Reinicia a instância para carregar a config atual e aguarda o nó.
+
+        Args:
+            timeout: Segundos aguardando o nó aparecer
+            deadline: Prazo do apply; a espera termina se ele for cancelado
+
+        Returns:
+            bool: True se a instância voltou e o nó apareceu
+        """
+        start = time.perf_counter()
+        with tracer.span("isolated restart") as span:
+            with self._lock:
+                self._stopping = False
+                self._terminate()
+                ok = self._spawn()
+            ok = ok and self._wait_ready(timeout, deadline)
+            span.set(ok=ok)
+        self.last_restart_ms = (time.perf_counter() - start) * 1000.0
+        if ok:
+            logger.info(f"Instância isolada reiniciada em {self.last_restart_ms:.0f} ms")
+        return ok
+
+    def stop(self) -> None:
+        """Encerra a instância (o equalizador sai do grafo)."""
+        with self._lock:
+            self._stopping = True
+            self._terminate()
+        self.unwatch_graph()
+        self._graph_lost.set()  # Acorda o supervisor para que ele saia
+        try:
+            ISOLATED_PID_FILE.unlink()
+        except OSError:
+            pass
+
+    # ==== PROCESSO ====
+
+    def _spawn(self) -> bool:
+        env = dict(os.environ, PIPEWIRE_CONFIG_DIR=str(ISOLATED_CONFIG_DIR))
+        try:
+            ISOLATED_CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+            base = ISOLATED_CONFIG_DIR / ISOLATED_CONFIG_NAME
+            if not base.exists() or base.read_text() != _BASE_CONFIG:
+                atomic_write_text(base, _BASE_CONFIG)
+            process = subprocess.Popen(
+                [PIPEWIRE_BINARY, "-c", ISOLATED_CONFIG_NAME],
+                env=env,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,  # Não morre junto com o app
+            )
+        except OSError as e:
+            logger.error(f"Erro ao iniciar instância isolada: {e}")
+            self._process = self._pid = None
+            return False
+
+        self._process = process
+        self._pid = process.pid
+        try:
+            ISOLATED_PID_FILE.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(ISOLATED_PID_FILE, f"{process.pid}\n")
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar {ISOLATED_PID_FILE}: {e}")
+        logger.info(f"Instância isolada iniciada (PID: {process.pid})")
+        self._ensure_supervisor()
+        return True
+
+    def _adopt(self) -> bool:
+        """Adota uma instância deixada por uma execução anterior do app."""
+        try:
+            pid = int(ISOLATED_PID_FILE.read_text().strip())
+        except (OSError, ValueError):
+            return False
+        if not (_pid_alive(pid) and _is_our_instance(pid)):
+            return False
+        self._process = None
+        self._pid = pid
+        logger.info(f"Instância isolada adotada (PID: {pid})")
+        return True
+
+    def _terminate(self) -> None:
+        process, pid = self._process, self._pid
+        self._process = self._pid = None
+        if pid is None or not _pid_alive(pid):
+            return
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+        if process is not None:
+            try:
+                process.wait(timeout=1.0)
+                return
+            except subprocess.TimeoutExpired:
+                pass
+        else:
+            # Processo adotado: não é filho, não dá para usar wait()
+            deadline = time.monotonic() + 1.0
+            while _pid_alive(pid) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            if not _pid_alive(pid):
+                return
+        logger.warning(f"Instância isolada não terminou, enviando SIGKILL (PID: {pid})")
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        if process is not None:
+            process.wait()
+
+    def _wait_ready(self, timeout: float = ISOLATED_READY_TIMEOUT, deadline=None) -> bool:
+        if self.ready_check is None:
+            return self.is_running()
+        expires_at = time.monotonic() + timeout
+        while time.monotonic() < expires_at:
+            if not self.is_running():
+                logger.error("Instância isolada terminou logo após iniciar")
+                return False
+            if self.ready_check():
+                return True
+            if deadline is None:
+                time.sleep(0.02)
+            elif not deadline.sleep(0.02):
+                # Acorda na hora se o apply for cancelado (substituído, app fechando)
+                logger.warning(f"Espera pela instância isolada interrompida ({deadline.reason})")
+                return False
+        logger.warning("Timeout aguardando o nó da instância isolada")
+        return False
+
+    # ==== SUPERVISÃO ====
+
+    def _ensure_supervisor(self) -> None:
+        if self._supervisor is None or not self._supervisor.is_alive():
+            self._supervisor = threading.Thread(
+                target=self._supervise, name="simplepipewireq-isolated", daemon=True
+            )
+            self._supervisor.start()
+
+    def _on_graph_event(self, event: GraphEvent) -> None:
+        """Chamado pelo GraphMonitor (thread dele): só acorda o supervisor."""
+        if event.kind == "node_removed" and event.props.get("node.name") == EQ_NODE_NAME:
+            self._graph_lost.set()
+        elif event.kind == "connected" and (event.data or {}).get("reconnected"):
+            # Daemon principal reiniciado: a instância pode ter ficado órfã
+            self._graph_lost.set()
+
+    def _supervise(self):
+        while True:
+            with self._lock:
+                if self._stopping or self._pid is None:
+                    return
+                process, pid = self._process, self._pid
+
+            graph_lost = self._graph_lost.wait(ISOLATED_SUPERVISE_INTERVAL)
+            alive = process.poll() is None if process is not None else _pid_alive(pid)
+            if alive and not graph_lost:
+                continue
+            if alive:
+                self._graph_lost.clear()
+                if not self._orphaned(pid):
+                    continue
+                reason = "ficou fora do grafo"
+            else:
+                reason = "terminou inesperadamente"
+
+            with self._lock:
+                if self._stopping:
+                    return
+                if self._pid != pid:
+                    continue  # Reinício intencional (restart)
+                now = time.monotonic()
+                if (len(self._crashes) == self._crashes.maxlen
+                        and now - self._crashes[0] < ISOLATED_RESTART_WINDOW):
+                    logger.error("Instância isolada caiu repetidamente; supervisão desativada")
+                    if alive:
+                        self._terminate()
+                    self._process = self._pid = None
+                    return
+                self._crashes.append(now)
+                logger.warning(f"Instância isolada {reason} (PID: {pid}), reiniciando...")
+                if alive:
+                    self._terminate()
+                self._spawn()
+
+    def _orphaned(self, pid: int) -> bool:
+        """
+        Após um evento do grafo: True se o processo segue vivo mas o nó do
+        equalizador não voltou ao grafo dentro de ISOLATED_GRAPH_GRACE.
+        """
+        if self.ready_check is None:
+            return False
+        expires_at = time.monotonic() + ISOLATED_GRAPH_GRACE
+        while time.monotonic() < expires_at:
+            if self._stopping or self._pid != pid:
+                return False  # Parada ou reinício intencional em curso
+            if self.ready_check():
+                return False
+            time.sleep(0.25)
+        return not self._stopping and self._pid == pid
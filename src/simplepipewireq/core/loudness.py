@@ -0,0 +1,152 @@
+import logging
+import math
+import threading
+from typing import Optional
+from simplepipewireq.core.graph_monitor import GraphEvent, GraphMonitor
+from simplepipewireq.utils.constants import (
+    FREQUENCIES, EQ_NODE_NAME, LOUDNESS_COMPENSATION,
+    LOUDNESS_MAX_ATTENUATION_DB, LOUDNESS_UPDATE_THRESHOLD_DB
+)
+
+logger = logging.getLogger(__name__)
+
+
+def compensation_offsets(attenuation_db: float) -> dict:
+    """
+    Reforço por banda para um volume `attenuation_db` abaixo do máximo.
+
+    Linear na atenuação (até LOUDNESS_MAX_ATTENUATION_DB), com a inclinação
+    de cada banda em LOUDNESS_COMPENSATION; zero no volume máximo.
+    """
+    attenuation = min(attenuation_db, LOUDNESS_MAX_ATTENUATION_DB) if attenuation_db > 0 else 0.0
+    return {freq: LOUDNESS_COMPENSATION.get(freq, 0.0) * attenuation for freq in FREQUENCIES}
+
+
+def node_volume_db(info: Optional[dict]) -> Optional[float]:
+    """
+    Volume de um nó em dB a partir dos Props do pw-dump (volume ×
+    maior channelVolume, ambos lineares). None se o nó não tem volume.
+    """
+    if not info:
+        return None
+    props_list = (info.get("params", {}) or {}).get("Props") or []
+    for props in props_list:
+        channel_volumes = props.get("channelVolumes")
+        if not channel_volumes:
+            continue
+        linear = float(props.get("volume", 1.0)) * max(float(v) for v in channel_volumes)
+        if linear <= 0.0:
+            return -math.inf
+        return 20.0 * math.log10(linear)
+    return None
+
+
+class LoudnessCompensator:
+    """
+    Compensação de loudness dependente do volume.
+
+    Em volume baixo o ouvido perde graves e agudos (curvas isofônicas);
+    o compensador soma à curva do usuário um reforço por banda que cresce
+    conforme o volume cai. O volume vem dos eventos do GraphMonitor: o do
+    sink padrão e, quando o padrão é o sink do EQ, também o do dispositivo
+    de saída para onde ele envia o áudio.
+
+    Sem polling: a thread dorme até um evento de nó ou metadata. Eventos em
+    rajada (giro do botão de volume) se fundem e só o estado mais recente é
+    calculado; o envio ao vivo só acontece quando alguma banda muda mais que
+    LOUDNESS_UPDATE_THRESHOLD_DB.
+    """
+
+    def __init__(self, pipewire_manager, monitor: GraphMonitor):
+        self.pipewire_manager = pipewire_manager
+        self.monitor = monitor
+        self._wake = threading.Event()
+        self._stopped = True
+        self._thread = None
+        self._applied = {}          # Deslocamentos atualmente aplicados
+        self.attenuation_db = None
+        self.updates = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopped = False
+        self.monitor.add_listener(self._on_event)
+        self.monitor.start()
+        self._thread = threading.Thread(
+            target=self._run, name="simplepipewireq-loudness", daemon=True
+        )
+        self._thread.start()
+        self._wake.set()
+
+    def stop(self) -> None:
+        """Para de acompanhar o volume e remove a compensação."""
+        self.monitor.remove_listener(self._on_event)
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(2.0)
+            self._thread = None
+        self._applied = {}
+        if self.pipewire_manager.gain_offsets:
+            self.pipewire_manager.set_gain_offsets({})
+
+    # ==== EVENTOS ====
+
+    def _on_event(self, event: GraphEvent) -> None:
+        if event.kind in ("node_changed", "node_added"):
+            if event.props.get("media.class") == "Audio/Sink":
+                if event.kind == "node_added" and event.props.get("node.name") == EQ_NODE_NAME:
+                    # Nó recriado (reload): os ganhos vieram do arquivo
+                    self._applied = {}
+                self._wake.set()
+        elif event.kind in ("metadata", "connected"):
+            if event.kind == "connected":
+                self._applied = {}  # Daemon reiniciado: nós recriados
+            self._wake.set()
+
+    def current_attenuation_db(self) -> Optional[float]:
+        """Quanto o volume efetivo está abaixo do máximo (dB), ou None."""
+        monitor = self.monitor
+        default = monitor.default_sink_name()
+        names = [default] if default else []
+        if default in (None, EQ_NODE_NAME):
+            output = monitor.output_sink_name(exclude=EQ_NODE_NAME)
+            if output:
+                names.append(output)
+
+        level_db = None
+        for name in names:
+            node_id = monitor.find_node(name)
+            volume_db = node_volume_db(monitor.node_info(node_id)) if node_id is not None else None
+            if volume_db is not None:
+                level_db = volume_db if level_db is None else level_db + volume_db
+        return None if level_db is None else -level_db
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._stopped:
+                return
+            if not self.monitor.connected:
+                continue
+            attenuation = self.current_attenuation_db()
+            if attenuation is None:
+                continue
+            offsets = compensation_offsets(attenuation)
+            applied = self._applied
+            if applied and all(
+                abs(offsets[freq] - applied.get(freq, 0.0)) < LOUDNESS_UPDATE_THRESHOLD_DB
+                for freq in FREQUENCIES
+            ):
+                continue
+            self.attenuation_db = attenuation
+            if self.pipewire_manager.set_gain_offsets(offsets, resend=not applied):
+                self._applied = offsets
+                self.updates += 1
+                logger.debug(f"Loudness: volume {-attenuation:.1f} dB, graves +{offsets[FREQUENCIES[0]]:.1f} dB")
@@ -0,0 +1,380 @@
+import json
+import logging
+import os
+import re
+import select
+import shutil
+import subprocess
+import threading
+import time
+from typing import Callable, Iterator, List, Optional, Tuple
+from simplepipewireq.utils.constants import (
+    FREQUENCIES, MIN_GAIN, MAX_GAIN, MIDI_MAP_FILE, MIDI_SEQ_DUMP_CMD, MIDI_DEFAULT_FIRST_CC,
+    MIDI_UPDATE_HZ, MIDI_SETTLE_SECONDS, MIDI_RETRY_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+# Linha do aseqdump: " 24:0   Control change          0, controller 20, value 64"
+_SEQ_CONTROL = re.compile(r'Control change\s+(\d+),\s*controller\s+(\d+),\s*value\s+(\d+)')
+
+
+def cc_to_gain(value: int) -> float:
+    """Valor de CC (0-127) para dB, com 64 exatamente em 0 dB."""
+    value = max(0, min(127, value))
+    if value >= 64:
+        gain = MAX_GAIN * (value - 64) / 63.0
+    else:
+        gain = MIN_GAIN * (64 - value) / 64.0
+    return round(gain, 1)
+
+
+class MidiMap:
+    """
+    Associação entre controles MIDI (CC) e bandas.
+
+    Arquivo JSON (MIDI_MAP_FILE):
+
+        {
+          "channel": 0,
+          "controls": {"0": 31, "1": 63, "2": 125, "3": 250, "4": 500,
+                       "5": 1000, "6": 2000, "7": 4000, "16": 8000, "17": 16000}
+        }
+
+    `channel` (0-15) é opcional: sem ele qualquer canal vale. Sem arquivo,
+    os CCs MIDI_DEFAULT_FIRST_CC em diante vão para as bandas em ordem. O
+    arquivo é relido quando muda.
+    """
+
+    def __init__(self, path=MIDI_MAP_FILE):
+        self.path = path
+        self._mtime = None
+        self.channel = None
+        self.controls = self._default_controls()
+
+    @staticmethod
+    def _default_controls() -> dict:
+        return {MIDI_DEFAULT_FIRST_CC + i: freq for i, freq in enumerate(FREQUENCIES)}
+
+    def _reload_if_changed(self) -> None:
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except OSError:
+            if self._mtime is not None:
+                self._mtime, self.channel, self.controls = None, None, self._default_controls()
+            return
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+        try:
+            data = json.loads(self.path.read_text())
+            controls = {
+                int(cc): int(freq) for cc, freq in data.get("controls", {}).items()
+                if int(freq) in FREQUENCIES
+            }
+            channel = data.get("channel")
+            self.channel = int(channel) if channel is not None else None
+            self.controls = controls or self._default_controls()
+            logger.info(f"Mapa MIDI carregado: {len(self.controls)} controles")
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.error(f"Erro ao ler {self.path}: {e}")
+            self.channel, self.controls = None, self._default_controls()
+
+    def band_for(self, channel: int, controller: int) -> Optional[int]:
+        """Frequência da banda ligada ao controle, ou None."""
+        self._reload_if_changed()
+        if self.channel is not None and channel != self.channel:
+            return None
+        return self.controls.get(controller)
+
+
+# ==== FONTES DE MENSAGENS ====
+
+class RawMidiParser:
+    """
+    Extrai Control Change de um fluxo de bytes MIDI.
+
+    Trata running status, mensagens de tempo real intercaladas (0xF8-0xFF)
+    e ignora SysEx e as demais mensagens de canal.
+    """
+
+    # Bytes de dados de cada tipo de mensagem de canal (nibble alto)
+    _DATA_LENGTH = {0x80: 2, 0x90: 2, 0xA0: 2, 0xB0: 2, 0xC0: 1, 0xD0: 1, 0xE0: 2}
+
+    def __init__(self):
+        self._status = None
+        self._data = []
+        self._sysex = False
+
+    def feed(self, chunk: bytes) -> List[Tuple[int, int, int]]:
+        """Retorna [(canal, controle, valor)] dos CCs completos em `chunk`."""
+        messages = []
+        for byte in chunk:
+            if byte >= 0xF8:
+                continue  # Tempo real: não interrompe a mensagem em curso
+            if byte >= 0x80:
+                self._data = []
+                if byte == 0xF0:
+                    self._sysex, self._status = True, None
+                elif byte >= 0xF0:
+                    self._sysex, self._status = False, None  # Fim de SysEx / comuns
+                else:
+                    self._sysex, self._status = False, byte
+                continue
+            if self._sysex or self._status is None:
+                continue
+            self._data.append(byte)
+            kind = self._status & 0xF0
+            if len(self._data) == self._DATA_LENGTH[kind]:
+                if kind == 0xB0:
+                    messages.append((self._status & 0x0F, self._data[0], self._data[1]))
+                self._data = []  # Running status: o próximo byte de dados reaproveita o status
+        return messages
+
+
+class RawMidiSource:
+    """Porta raw MIDI do ALSA (/dev/snd/midiC*D*)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._closed = threading.Event()
+
+    def messages(self) -> Iterator[Tuple[int, int, int]]:
+        parser = RawMidiParser()
+        fd = os.open(self.path, os.O_RDONLY | os.O_NONBLOCK)
+        try:
+            while not self._closed.is_set():
+                # Timeout curto para perceber close() sem depender do dispositivo
+                ready, _, _ = select.select([fd], [], [], 0.5)
+                if not ready:
+                    continue
+                chunk = os.read(fd, 256)
+                if not chunk:
+                    return  # Dispositivo removido
+                yield from parser.feed(chunk)
+        finally:
+            os.close(fd)
+
+    def close(self) -> None:
+        self._closed.set()
+
+
+class SequencerMidiSource:
+    """Porta do sequenciador ALSA, lida pelo `aseqdump` (alsa-utils)."""
+
+    def __init__(self, port: str):
+        self.port = port
+        self._process = None
+        self._closed = False
+
+    def messages(self) -> Iterator[Tuple[int, int, int]]:
+        self._process = subprocess.Popen(
+            MIDI_SEQ_DUMP_CMD + [self.port],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+        if self._closed:
+            self._process.kill()
+        try:
+            for line in self._process.stdout:
+                match = _SEQ_CONTROL.search(line)
+                if match:
+                    yield tuple(int(group) for group in match.groups())
+        finally:
+            self.close()
+            self._process.wait()
+
+    def close(self) -> None:
+        self._closed = True
+        if self._process is not None and self._process.poll() is None:
+            self._process.kill()
+
+
+def is_raw_port(port: str) -> bool:
+    return port.startswith("/dev/")
+
+
+def open_source(port: str):
+    """Fonte de mensagens para a porta configurada (raw MIDI ou sequenciador)."""
+    if is_raw_port(port):
+        return RawMidiSource(port)
+    return SequencerMidiSource(port)
+
+
+# ==== ENTRADA ====
+
+class MidiInput:
+    """
+    Faders físicos controlando as bandas.
+
+    Uma thread lê a porta MIDI e guarda só o valor mais recente de cada
+    banda; outra envia esses valores pelo mesmo caminho dos sliders em modo
+    tempo real (ParamPusher) no máximo MIDI_UPDATE_HZ vezes por segundo.
+    Uma varredura rápida de fader (centenas de CCs por segundo) vira
+    poucos envios, cada um com o estado mais recente das bandas tocadas;
+    nada se acumula na fila do PipeWire.
+
+    Quando os faders param por MIDI_SETTLE_SECONDS, o estado é gravado
+    (config do PipeWire e temp.conf) e os listeners são avisados, para a
+    janela registrar o histórico.
+    """
+
+    def __init__(self, context, port: str, midi_map: MidiMap = None):
+        self.context = context
+        self.port = port
+        self.midi_map = midi_map or MidiMap()
+        self._cond = threading.Condition()
+        self._pending = {}           # {freq: dB} recebido e ainda não enviado
+        self._stopped = True
+        self._source = None
+        self._threads = []
+        self._listeners: List[Callable] = []
+        self.received = 0            # CCs mapeados recebidos
+        self.flushed = 0             # Envios ao PipeWire
+
+    def add_listener(self, callback: Callable) -> None:
+        """callback(mudanças, assentou) após cada envio e quando os faders param."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self) -> bool:
+        if not self.port:
+            logger.warning("Entrada MIDI sem porta configurada (midi_port)")
+            return False
+        if self.running:
+            return True
+        if not is_raw_port(self.port) and shutil.which(MIDI_SEQ_DUMP_CMD[0]) is None:
+            # Sem aseqdump não há o que tentar de novo: avisa uma vez só
+            logger.error(self._seq_dump_missing_message())
+            return False
+        self._stopped = False
+        self._threads = [
+            threading.Thread(target=self._read_loop, name="simplepipewireq-midi-read", daemon=True),
+            threading.Thread(target=self._flush_loop, name="simplepipewireq-midi-flush", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"Entrada MIDI iniciada: {self.port}")
+        return True
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+            source = self._source
+        if source is not None:
+            source.close()
+        for thread in self._threads:
+            thread.join(2.0)
+        self._threads = []
+
+    @staticmethod
+    def _seq_dump_missing_message() -> str:
+        return (f"'{MIDI_SEQ_DUMP_CMD[0]}' não encontrado (pacote alsa-utils): "
+                "entrada MIDI desativada")
+
+    # ==== LEITURA ====
+
+    def _read_loop(self):
+        while not self._stopped:
+            source = open_source(self.port)
+            with self._cond:
+                if self._stopped:
+                    return
+                self._source = source
+            try:
+                for channel, controller, value in source.messages():
+                    self._on_control(channel, controller, value)
+                if not self._stopped:
+                    logger.warning(f"Porta MIDI {self.port} fechada")
+            except FileNotFoundError as e:
+                if isinstance(source, SequencerMidiSource):
+                    # aseqdump removido com a entrada rodando
+                    logger.error(self._seq_dump_missing_message())
+                    with self._cond:
+                        self._source = None
+                        self._stopped = True
+                        self._cond.notify_all()
+                    return
+                logger.warning(f"Erro na porta MIDI {self.port}: {e}")
+            except (OSError, subprocess.SubprocessError) as e:
+                logger.warning(f"Erro na porta MIDI {self.port}: {e}")
+            with self._cond:
+                self._source = None
+                # Porta sumiu (dispositivo desconectado): tenta de novo depois
+                self._cond.wait_for(lambda: self._stopped, MIDI_RETRY_SECONDS)
+
+    def _on_control(self, channel: int, controller: int, value: int) -> None:
+        freq = self.midi_map.band_for(channel, controller)
+        if freq is None:
+            return
+        with self._cond:
+            self._pending[freq] = cc_to_gain(value)
+            self.received += 1
+            self._cond.notify_all()
+
+    # ==== ENVIO ====
+
+    def _flush_loop(self):
+        interval = 1.0 / MIDI_UPDATE_HZ
+        last_flush = 0.0
+        unsettled = False
+        while True:
+            with self._cond:
+                timeout = MIDI_SETTLE_SECONDS if unsettled else None
+                self._cond.wait_for(lambda: self._pending or self._stopped, timeout)
+                if self._stopped:
+                    return
+                if not self._pending:
+                    changes = None
+                else:
+                    wait = last_flush + interval - time.monotonic()
+                    if wait > 0:
+                        # Limita a taxa; o que chegar até lá se funde em _pending
+                        self._cond.wait_for(lambda: self._stopped, wait)
+                        if self._stopped:
+                            return
+                    changes, self._pending = self._pending, {}
+            if changes is None:
+                unsettled = False
+                self._settle()
+                continue
+            last_flush = time.monotonic()
+            unsettled = True
+            self._push(changes)
+
+    def _push(self, changes: dict) -> None:
+        context = self.context
+        if context.is_built("morpher"):
+            # Fader físico interrompe uma transição de preset, como o slider
+            context.morpher.cancel()
+        # Alteração no lugar, sob o lock dos ganhos: não perde um slider
+        # mexido ao mesmo tempo na thread da UI
+        context.update_gains(changes)
+        context.param_pusher.submit(changes)
+        self.flushed += 1
+        self._notify(changes, False)
+
+    def _settle(self) -> None:
+        gains = self.context.gains_snapshot()
+        self.context.param_pusher.wait_idle(1.0)
+        self.context.pipewire_manager.generate_pipewire_config(gains)
+        self.context.config_manager.schedule_write("temp.conf", gains)
+        logger.debug(f"MIDI: {self.received} mensagens em {self.flushed} envios")
+        self._notify({}, True)
+
+    def _notify(self, changes: dict, settled: bool) -> None:
+        for callback in list(self._listeners):
+            try:
+                callback(changes, settled)
+            except Exception as e:
+                logger.error(f"Erro em listener MIDI: {e}")
@@ -0,0 +1,147 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class ParamPusher:
+    """
+    Envia ganhos ao nó do equalizador em execução, fora da thread chamadora.
+
+    Mantém um único "slot" com o estado mais recente: se o PipeWire estiver
+    lento, atualizações intermediárias são descartadas (contadas como
+    `dropped`) em vez de enfileiradas. Só as bandas que mudaram desde o
+    último envio são transmitidas.
+    """
+
+    def __init__(self, pipewire_manager):
+        self.pipewire_manager = pipewire_manager
+
+        self._cond = threading.Condition()
+        self._pending = None        # Último estado submetido ainda não enviado
+        self._busy = False
+        self._stopped = False
+        self._thread = None
+        self._last_pushed = {}      # {freq: gain} confirmado pelo PipeWire
+
+        # Estatísticas
+        self.pushed = 0
+        self.dropped = 0
+        self.failed = 0
+        self._push_times = []       # Instantes (monotonic) dos últimos envios
+
+    def submit(self, gains_dict: dict) -> None:
+        """
+        Agenda o envio dos ganhos sem bloquear. Substitui qualquer estado
+        pendente ainda não enviado.
+
+        Args:
+            gains_dict: Dicionário de ganhos {freq: gain} (pode ser parcial)
+        """
+        with self._cond:
+            if self._stopped:
+                return
+            if self._pending is not None:
+                self.dropped += 1
+                # Bandas ausentes no novo estado continuam valendo do anterior
+                merged = dict(self._pending)
+                merged.update(gains_dict)
+                self._pending = merged
+            else:
+                self._pending = dict(gains_dict)
+            self._ensure_thread()
+            self._cond.notify_all()
+
+    def is_busy(self) -> bool:
+        """Retorna True se há um envio em andamento ou pendente."""
+        with self._cond:
+            return self._busy or self._pending is not None
+
+    def wait_idle(self, timeout: float = None) -> bool:
+        """Aguarda até não haver envios em andamento nem pendentes."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._busy and self._pending is None, timeout
+            )
+
+    def forget_last_pushed(self) -> None:
+        """
+        Esquece o último estado enviado, forçando o próximo envio completo.
+        Usar quando o nó foi recriado (ex: após reload do PipeWire).
+        """
+        with self._cond:
+            self._last_pushed = {}
+
+    def stats(self) -> dict:
+        """
+        Retorna estatísticas de envio.
+
+        Returns:
+            dict: pushed, dropped, failed e rate_hz (taxa nos últimos envios)
+        """
+        with self._cond:
+            times = list(self._push_times)
+            stats = {
+                "pushed": self.pushed,
+                "dropped": self.dropped,
+                "failed": self.failed,
+            }
+        rate = 0.0
+        if len(times) >= 2 and times[-1] > times[0]:
+            rate = (len(times) - 1) / (times[-1] - times[0])
+        stats["rate_hz"] = rate
+        return stats
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Encerra o worker, descartando o que estiver pendente."""
+        with self._cond:
+            self._stopped = True
+            self._pending = None
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _ensure_thread(self):
+        """Inicia o worker sob demanda (chamar com o lock adquirido)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run,
+                name="simplepipewireq-param-pusher",
+                daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    self._busy = False
+                    self._cond.notify_all()
+                    return
+                gains = self._pending
+                self._pending = None
+                self._busy = True
+                changed = {
+                    freq: gain for freq, gain in gains.items()
+                    if self._last_pushed.get(freq) != gain
+                }
+
+            ok = True
+            if changed:
+                ok = self.pipewire_manager.set_gains_live(changed)
+
+            with self._cond:
+                if ok:
+                    if changed:
+                        self._last_pushed.update(changed)
+                        self.pushed += 1
+                        self._push_times.append(time.monotonic())
+                        del self._push_times[:-32]
+                else:
+                    self.failed += 1
+                    self._last_pushed = {}
+                self._busy = False
+                self._cond.notify_all()
@@ -1,28 +1,237 @@
+import contextlib
+import functools
 import logging
+import os
 import re
 import subprocess
 import json
 import time
+import hashlib
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, Dict, List, Tuple
 from simplepipewireq.utils.constants import (
-    PIPEWIRE_CONFIG_FILE, FREQUENCIES, PIPEWIRE_CONF_DIR, 
-    PIPEWIRE_RELOAD_CMD, PIPEWIRE_STATUS_CMD,
+    PIPEWIRE_CONFIG_FILE, FREQUENCIES, MIN_GAIN, MAX_GAIN, GAIN_DECIMALS,
+    PIPEWIRE_SERVICE_UNIT, PIPEWIRE_PULSE_SERVICE_UNIT,
     PIPEWIRE_RELOAD_SIGNAL, PIPEWIRE_PROCESS_NAME,
     PIPEWIRE_CLI_CMD, PIPEWIRE_LIST_NODES_CMD, PIPEWIRE_ENUM_PARAMS_CMD,
-    PIPEWIRE_SET_PARAM_CMD, EQ_NODE_NAME, EQ_NODE_DESCRIPTION
+    PIPEWIRE_SET_PARAM_CMD, EQ_NODE_NAME, EQ_NODE_DESCRIPTION, EQ_OUTPUT_NODE_NAME,
+    EQ_BAND_NODE_PREFIX, EQ_FILTER_Q, RENDER_CACHE_SIZE, ISOLATED_CONFIG_FILE,
+    APPLY_DEADLINE_SECONDS, SYSTEMD_JOB_TIMEOUT, ISOLATED_READY_TIMEOUT, ACTIVE_OFFSETS_FILE
 )
+from simplepipewireq.core import process_control
+from simplepipewireq.core.config_validator import (
+    ConfigValidationError, validate_config, validate_config_file
+)
+from simplepipewireq.core.deadline import Deadline, DeadlineExceeded
+from simplepipewireq.core.eq_solver import EqSolver
+from simplepipewireq.core.isolated_instance import FilterChainInstance
+from simplepipewireq.utils.fileio import atomic_write_text
+from simplepipewireq.utils.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
+
+def _reload_operation(method):
+    """
+    Marca o método como reload em andamento (ver is_reloading) e o executa
+    sob o prazo do apply (ver apply_scope).
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._reload_lock:
+            self._reloads_in_progress += 1
+        try:
+            with self.apply_scope():
+                ok = method(self, *args, **kwargs)
+            if ok:
+                self._remember_known_good()
+            return ok
+        except DeadlineExceeded as e:
+            logger.warning(f"{method.__name__} interrompido: {e}")
+            return False
+        finally:
+            with self._reload_lock:
+                self._reloads_in_progress -= 1
+    return wrapper
+
 class PipeWireManager:
-    def __init__(self):
-        pass
+    def __init__(self, use_dbus: bool = True):
+        # ID do nó do equalizador usado pelo caminho de atualização ao vivo
+        self._live_node_id = None
+        # Configs renderizadas recentemente: {chave dos ganhos: (hash, conteúdo)}
+        self._render_cache = OrderedDict()
+        self._render_lock = threading.Lock()
+        # Arquivo de config do filter-chain (drop-in do daemon principal ou,
+        # no modo isolado, da instância dedicada)
+        self.config_file = PIPEWIRE_CONFIG_FILE
+        self.isolated_instance = None
+        self._graph_monitor = None
+        # Hash da última config escrita em config_file
+        self.last_config_hash = 0
+        # Motivo da última config rejeitada pela validação prévia (ou None)
+        self.last_config_error = None
+        # Hashes de configs renderizadas que já passaram pela validação
+        self._validated_hashes = set()
+        # Arquivo em disco já validado: (inode, mtime, tamanho)
+        self._validated_file_key = None
+        # Reloads em andamento (o watchdog ignora o nó sumindo nesse período)
+        self._reloads_in_progress = 0
+        self._reload_lock = threading.Lock()
+        # Restart de units via D-Bus (conexão aberta no primeiro uso);
+        # sem D-Bus (use_dbus=False), via systemctl, sem importar `gi`
+        self.systemd = process_control.SystemdUserManager(use_dbus)
+        # Prazo do apply da thread atual e prazos em andamento: {prazo: dono}
+        self._local = threading.local()
+        self._active_deadlines = {}
+        # Última config carregada com sucesso: (arquivo, conteúdo)
+        self._known_good = None
+        # Deslocamentos somados à curva do usuário (ex: compensação de
+        # loudness) e últimos ganhos do usuário enviados ou gerados
+        self.gain_offsets = {}
+        self._user_gains = {freq: 0.0 for freq in FREQUENCIES}
+        # Deslocamentos gravados em ACTIVE_OFFSETS_FILE (None = ainda não lido)
+        self._persisted_offsets = None
+        # Modo preciso: solver da interação entre bandas (None = desligado)
+        self.eq_solver = None
+
+    # ==== PRAZO E CANCELAMENTO ====
+
+    @contextlib.contextmanager
+    def apply_scope(self, seconds: float = APPLY_DEADLINE_SECONDS, owner: str = None):
+        """
+        Executa um apply sob um prazo único (Deadline).
+        
+        Todas as etapas dentro do bloco (subprocessos, sleeps, restart de
+        units, espera pelo daemon) consomem o mesmo prazo. Escopos aninhados
+        reutilizam o prazo de fora. Um apply novo cancela ("substituído")
+        só os applies em andamento do mesmo dono: o Apply do usuário não é
+        cancelado por watchdog, troca de dispositivo, loudness ou MIDI, que
+        rodam em suas próprias threads. Se o apply esgotar o prazo ou for
+        cancelado sem ter sido substituído, e nenhum outro apply estiver em
+        andamento, a última config boa volta para o disco, para que o
+        sistema fique num estado conhecido.
+
+        Args:
+            seconds: Prazo do apply
+            owner: Quem pede o apply (padrão: o nome da thread atual)
+        """
+        deadline = getattr(self._local, "deadline", None)
+        if deadline is not None:
+            yield deadline
+            return
+        
+        owner = owner or threading.current_thread().name
+        deadline = Deadline(seconds)
+        with self._reload_lock:
+            for other, other_owner in self._active_deadlines.items():
+                if other_owner == owner:
+                    other.cancel("substituído")
+            self._active_deadlines[deadline] = owner
+        self._local.deadline = deadline
+        try:
+            with tracer.span("deadline", seconds=seconds, owner=owner) as span:
+                try:
+                    yield deadline
+                finally:
+                    span.set(reason=deadline.reason)
+        finally:
+            self._local.deadline = None
+            with self._reload_lock:
+                self._active_deadlines.pop(deadline, None)
+                others_running = bool(self._active_deadlines)
+            if deadline.reason and deadline.reason != "substituído":
+                if others_running:
+                    # O apply ainda em andamento deixa o próprio estado
+                    logger.warning(f"Apply de {owner} interrompido ({deadline.reason})")
+                else:
+                    logger.warning(
+                        f"Apply de {owner} interrompido ({deadline.reason}); "
+                        "restaurando a última config boa"
+                    )
+                    self._restore_known_good()
+
+    def cancel_applies(self, reason: str = "cancelado") -> None:
+        """Cancela os applies em andamento (ex: app fechando)."""
+        with self._reload_lock:
+            for deadline in self._active_deadlines:
+                deadline.cancel(reason)
+
+    def _deadline(self) -> Optional[Deadline]:
+        return getattr(self._local, "deadline", None)
+
+    def _deadline_expired(self, step: str) -> bool:
+        deadline = self._deadline()
+        if deadline is not None and deadline.expired():
+            logger.warning(f"{step}: prazo do apply esgotado ({deadline.reason})")
+            return True
+        return False
+
+    def _remember_known_good(self) -> None:
+        try:
+            self._known_good = (self.config_file, self.config_file.read_text())
+        except OSError:
+            pass
+
+    def _restore_known_good(self) -> None:
+        """Volta o arquivo de config para a última versão carregada com sucesso."""
+        self._live_node_id = None
+        if self._known_good is None or self._known_good[0] != self.config_file:
+            return
+        path, content = self._known_good
+        try:
+            if not path.exists() or path.read_text() != content:
+                atomic_write_text(path, content)
+                logger.info(f"Última config boa restaurada em {path}")
+        except OSError as e:
+            logger.error(f"Erro ao restaurar config: {e}")
+
+    def _run(self, cmd: list, **kwargs) -> subprocess.CompletedProcess:
+        """
+        subprocess.run com span de tracing.
+        
+        Dentro de um apply, o timeout é limitado ao prazo restante e o
+        processo é morto se o apply for cancelado.
+        """
+        deadline = self._deadline()
+        with tracer.span("subprocess", cmd=" ".join(cmd[:3])):
+            if deadline is None:
+                return subprocess.run(cmd, **kwargs)
+            
+            timeout = deadline.clamp(kwargs.pop("timeout", None))
+            if kwargs.pop("capture_output", False):
+                kwargs["stdout"] = kwargs["stderr"] = subprocess.PIPE
+            with subprocess.Popen(cmd, **kwargs) as process:
+                with deadline.on_cancel(process.kill):
+                    try:
+                        stdout, stderr = process.communicate(timeout=timeout)
+                    except subprocess.TimeoutExpired:
+                        process.kill()
+                        process.communicate()
+                        raise
+            deadline.check(cmd[0])
+            return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+
+    def _sleep(self, seconds: float, reason: str = "") -> None:
+        """time.sleep com span de tracing; acorda se o apply for cancelado."""
+        with tracer.span("sleep", seconds=seconds, reason=reason):
+            deadline = self._deadline()
+            if deadline is None:
+                time.sleep(seconds)
+            else:
+                deadline.sleep(seconds)
+
+    def is_reloading(self) -> bool:
+        """True enquanto um reload iniciado pelo app está em andamento."""
+        with self._reload_lock:
+            return self._reloads_in_progress > 0
 
     def is_configured(self) -> bool:
         """Verifica se arquivo de config foi criado."""
-        return PIPEWIRE_CONFIG_FILE.exists()
+        return self.config_file.exists()
 
+    @_reload_operation
     def setup_initial_config(self) -> bool:
         """
         Cria configuração inicial (todos ganhos em 0dB) e recarrega PipeWire.
@@ -42,75 +251,82 @@ class PipeWireManager:
             logger.error("Falha ao gerar config inicial")
             return False
         
-        if not self.reload_config():
+        if self.isolated_instance is not None:
+            reloaded = self.isolated_instance.restart()
+        else:
+            reloaded = self.reload_config()
+        if not reloaded:
             logger.error("Falha ao recarregar PipeWire após setup inicial")
             return False
         
         logger.info("Setup inicial do PipeWireEQ concluído com sucesso")
         return True
 
-    def generate_pipewire_config(self, gains_dict: dict) -> bool:
+    def render_pipewire_config(self, gains_dict: dict) -> str:
         """
-        Gera arquivo de configuração Lua para PipeWire.
+        Gera o conteúdo da configuração Lua para PipeWire, sem escrever em disco.
+        
+        Cada banda é um nó builtin `bq_peaking` próprio, ligado em série.
+        Assim o ganho de cada banda é um controle ("Gain") que pode ser
+        alterado com o nó rodando, sem recarregar o módulo.
         
         Args:
             gains_dict: Dict {freq: gain}
-                       Ex: {60: 0.0, 150: 2.5, 400: -1.0, ...}
         
         Returns:
-            bool: True se sucesso, False se falha
+            str: Conteúdo do arquivo de configuração
         """
-        try:
-            # Criar diretório se não existir
-            PIPEWIRE_CONF_DIR.mkdir(parents=True, exist_ok=True)
-            
-            # Construir array de filtros
-            filters_lua = []
-            for freq in FREQUENCIES:
-                gain = gains_dict.get(freq, 0.0)
-                # Formatar ganho como float com 1 casa decimal
-                gain_str = f"{gain:.1f}"
-                filters_lua.append(
-                    f'{{ type = bq_peaking, freq = {freq}, gain = {gain_str}, q = 0.707 }}'
-                )
-            
-            filters_str = ",\n                                ".join(filters_lua)
-            
-            # Template com param_eq em modo stereo nativo (1 nó, 2 canais)
-            # Portas do param_eq: "In 1", "In 2", "Out 1", "Out 2"
-            lua_content = f"""# SimplePipeWireEQ - Configuração de Equalizador Paramétrico
+        # Construir nós de filtro (um por banda)
+        nodes_lua = []
+        for i, freq in enumerate(FREQUENCIES):
+            gain = gains_dict.get(freq, 0.0)
+            # Mesma precisão do envio ao vivo (GAIN_DECIMALS)
+            gain_str = f"{gain:.{GAIN_DECIMALS}f}"
+            nodes_lua.append(
+                f'{{ type = builtin, name = {EQ_BAND_NODE_PREFIX}{i}, label = bq_peaking, '
+                f'control = {{ "Freq" = {freq} "Q" = {EQ_FILTER_Q} "Gain" = {gain_str} }} }}'
+            )
+        
+        # Ligações em série: banda i -> banda i+1
+        links_lua = []
+        for i in range(len(FREQUENCIES) - 1):
+            links_lua.append(
+                f'{{ output = "{EQ_BAND_NODE_PREFIX}{i}:Out" input = "{EQ_BAND_NODE_PREFIX}{i + 1}:In" }}'
+            )
+        
+        nodes_str = "\n                    ".join(nodes_lua)
+        links_str = "\n                    ".join(links_lua)
+        first_band = f"{EQ_BAND_NODE_PREFIX}0"
+        last_band = f"{EQ_BAND_NODE_PREFIX}{len(FREQUENCIES) - 1}"
+        
+        # Nós mono: o filter-chain duplica o grafo para cada canal (FL/FR)
+        return f"""# SimplePipeWireEQ - Configuração de Equalizador Paramétrico
 # Gerada automaticamente pela aplicação
 
 context.modules = [
     {{
         name = libpipewire-module-filter-chain
         args = {{
-            node.description = "SimplePipeWireEQ Equalizer Sink"
-            media.name       = "SimplePipeWireEQ Equalizer Sink"
+            node.description = "{EQ_NODE_DESCRIPTION}"
+            media.name       = "{EQ_NODE_DESCRIPTION}"
             filter.graph = {{
                 nodes = [
-                    {{
-                        type   = builtin
-                        name   = eq
-                        label  = param_eq
-                        config = {{
-                            filters = [
-                                {filters_str}
-                            ]
-                        }}
-                    }}
+                    {nodes_str}
+                ]
+                links = [
+                    {links_str}
                 ]
-                inputs  = [ "eq:In 1" "eq:In 2" ]
-                outputs = [ "eq:Out 1" "eq:Out 2" ]
+                inputs  = [ "{first_band}:In" ]
+                outputs = [ "{last_band}:Out" ]
             }}
             capture.props = {{
-                node.name       = "effect_input.simplepipewireq"
+                node.name       = "{EQ_NODE_NAME}"
                 media.class     = Audio/Sink
                 audio.channels  = 2
                 audio.position  = [ FL FR ]
             }}
             playback.props = {{
-                node.name       = "effect_output.simplepipewireq"
+                node.name       = "{EQ_OUTPUT_NODE_NAME}"
                 node.passive    = true
                 audio.channels  = 2
                 audio.position  = [ FL FR ]
@@ -119,57 +335,313 @@ context.modules = [
     }}
 ]
 """
+
+    def effective_gains(self, gains_dict: dict, offsets: dict = None) -> dict:
+        """
+        Ganhos enviados aos filtros: os do usuário somados aos deslocamentos
+        (gain_offsets, se `offsets` não for dado), limitados a
+        [MIN_GAIN, MAX_GAIN] e, no modo preciso, corrigidos pelo solver (que
+        precisa da curva completa).
+        """
+        if offsets is None:
+            offsets = self.gain_offsets
+        if offsets:
+            gains_dict = {
+                freq: min(MAX_GAIN, max(MIN_GAIN, gain + offsets.get(freq, 0.0)))
+                for freq, gain in gains_dict.items()
+            }
+        solver = self.eq_solver
+        if solver is not None:
+            gains_dict = solver.solve(gains_dict)
+        return gains_dict
+
+    @property
+    def accurate_mode(self) -> bool:
+        return self.eq_solver is not None
+
+    def enable_accurate_mode(self, enabled: bool = True, resend: bool = False) -> bool:
+        """
+        Liga ou desliga o modo preciso (compensação da interação entre bandas).
+        
+        Args:
+            resend: Reenviar a curva ao nó em execução com o novo modo
+        
+        Returns:
+            bool: True se sucesso (ou nada a reenviar)
+        """
+        if enabled == self.accurate_mode:
+            return True
+        self.eq_solver = EqSolver() if enabled else None
+        logger.info(f"Modo preciso {'ativado' if enabled else 'desativado'}")
+        if not resend:
+            return True
+        return self.set_gains_live(dict(self._user_gains))
+
+    def set_gain_offsets(self, offsets: dict, resend: bool = False) -> bool:
+        """
+        Troca os deslocamentos somados à curva do usuário.
+        
+        As bandas cujo deslocamento mudou são reenviadas ao vivo ao nó em
+        execução; o arquivo de config recebe os deslocamentos no próximo
+        apply.
+        
+        Args:
+            offsets: {freq: dB}
+            resend: Reenviar todas as bandas (ex: nó recriado por um reload)
+        
+        Returns:
+            bool: True se o envio ao vivo funcionou (ou nada mudou)
+        """
+        old = self.gain_offsets
+        changed = [
+            freq for freq in FREQUENCIES
+            if resend or abs(offsets.get(freq, 0.0) - old.get(freq, 0.0)) > 1e-6
+        ]
+        self.gain_offsets = {freq: value for freq, value in offsets.items() if value}
+        if not changed:
+            return True
+        user_gains = self._user_gains
+        return self.set_gains_live({freq: user_gains.get(freq, 0.0) for freq in changed})
+
+    @staticmethod
+    def config_hash(content: str) -> int:
+        """Hash de 64 bits (não nulo) do conteúdo de uma config renderizada."""
+        digest = hashlib.blake2b(content.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") or 1
+
+    def render_pipewire_config_cached(self, gains_dict: dict,
+                                      offsets: dict = None) -> Tuple[int, str]:
+        """
+        Renderiza a config reaproveitando o resultado para ganhos já vistos.
+        
+        Args:
+            offsets: Deslocamentos no lugar de gain_offsets (ver effective_gains)
+        
+        Returns:
+            Tuple[int, str]: (hash, conteúdo)
+        """
+        gains_dict = self.effective_gains(gains_dict, offsets)
+        key = tuple(round(float(gains_dict.get(freq, 0.0)), GAIN_DECIMALS) for freq in FREQUENCIES)
+        with self._render_lock:
+            cached = self._render_cache.get(key)
+            if cached is not None:
+                self._render_cache.move_to_end(key)
+                return cached
+        
+        content = self.render_pipewire_config(gains_dict)
+        entry = (self.config_hash(content), content)
+        with self._render_lock:
+            self._render_cache[key] = entry
+            while len(self._render_cache) > RENDER_CACHE_SIZE:
+                self._render_cache.popitem(last=False)
+        return entry
+
+    def active_config_hash(self) -> Optional[int]:
+        """Hash do arquivo de config ativo (o que o PipeWire carregou), ou None se não existe."""
+        try:
+            return self.config_hash(self.config_file.read_text())
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def matches_active_config(self, gains_dict: dict, offsets: dict = None) -> bool:
+        """
+        Indica se a config ativa é exatamente a que seria gerada para os
+        ganhos. Só renderiza e lê o arquivo: nenhuma interação com o PipeWire.
+        
+        Args:
+            offsets: Deslocamentos com que a config foi gerada (ver
+                     saved_gain_offsets); numa conferência, passam a valer
+                     como gain_offsets, já que são os que estão tocando
+        """
+        active_hash = self.active_config_hash()
+        if active_hash is None:
+            return False
+        config_hash, _ = self.render_pipewire_config_cached(gains_dict, offsets)
+        if config_hash != active_hash:
+            return False
+        self.last_config_hash = config_hash
+        self._user_gains.update(gains_dict)
+        if offsets is not None:
+            self.gain_offsets = {freq: value for freq, value in offsets.items() if value}
+        return True
+
+    def saved_gain_offsets(self) -> dict:
+        """Deslocamentos com que a config ativa foi gerada (ACTIVE_OFFSETS_FILE)."""
+        try:
+            data = json.loads(ACTIVE_OFFSETS_FILE.read_text())
+            return {int(freq): float(value) for freq, value in data.items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Erro ao ler {ACTIVE_OFFSETS_FILE}: {e}")
+            return {}
+
+    def _persist_offsets(self) -> None:
+        """Grava os deslocamentos da config recém-escrita (só quando mudam)."""
+        offsets = dict(self.gain_offsets)
+        if self._persisted_offsets is None:
+            self._persisted_offsets = self.saved_gain_offsets()
+        if offsets == self._persisted_offsets:
+            return
+        try:
+            if offsets:
+                ACTIVE_OFFSETS_FILE.parent.mkdir(parents=True, exist_ok=True)
+                atomic_write_text(ACTIVE_OFFSETS_FILE, json.dumps(
+                    {str(freq): value for freq, value in offsets.items()}
+                ))
+            else:
+                ACTIVE_OFFSETS_FILE.unlink(missing_ok=True)
+            self._persisted_offsets = offsets
+        except OSError as e:
+            logger.warning(f"Erro ao gravar {ACTIVE_OFFSETS_FILE}: {e}")
+
+    def get_rendered_config(self, config_hash: int) -> Optional[str]:
+        """Retorna uma config já renderizada pelo hash, se ainda estiver em cache."""
+        with self._render_lock:
+            for entry_hash, content in self._render_cache.values():
+                if entry_hash == config_hash:
+                    return content
+        return None
+
+    def generate_pipewire_config(self, gains_dict: dict, config_hash: int = 0) -> bool:
+        """
+        Gera arquivo de configuração Lua para PipeWire.
+        
+        Args:
+            gains_dict: Dict {freq: gain}
+                       Ex: {60: 0.0, 150: 2.5, 400: -1.0, ...}
+            config_hash: Hash de uma config já renderizada; se estiver em
+                         cache, é reutilizada sem regenerar.
+        
+        Returns:
+            bool: True se sucesso, False se falha
+        """
+        self._user_gains.update(gains_dict)
+        try:
+            # Criar diretório se não existir
+            self.config_file.parent.mkdir(parents=True, exist_ok=True)
+            
+            with tracer.span("render") as span:
+                content = self.get_rendered_config(config_hash) if config_hash else None
+                span.set(cached=content is not None)
+                if content is None:
+                    config_hash, content = self.render_pipewire_config_cached(gains_dict)
             
-            # Escrever arquivo
-            with open(PIPEWIRE_CONFIG_FILE, 'w') as f:
-                f.write(lua_content)
+            # Config inválida nunca chega ao disco (nem ao PipeWire)
+            if config_hash not in self._validated_hashes:
+                with tracer.span("validate"):
+                    validate_config(content)
+                if len(self._validated_hashes) >= RENDER_CACHE_SIZE:
+                    self._validated_hashes.clear()
+                self._validated_hashes.add(config_hash)
+            self.last_config_error = None
             
-            logger.info(f"Arquivo PipeWire gerado: {PIPEWIRE_CONFIG_FILE}")
+            # Escrever arquivo (atômico: nunca fica truncado)
+            with tracer.span("write", bytes=len(content)):
+                atomic_write_text(self.config_file, content)
+            self.last_config_hash = config_hash
+            self._persist_offsets()
+            
+            logger.info(f"Arquivo PipeWire gerado: {self.config_file}")
             return True
             
+        except ConfigValidationError as e:
+            self.last_config_error = str(e)
+            logger.error(f"Config gerada rejeitada pela validação: {e}")
+            return False
         except Exception as e:
             logger.error(f"Erro ao gerar config PipeWire: {e}")
             return False
 
-    def reload_pipewire(self) -> bool:
+    def validate_active_config(self) -> bool:
         """
-        Reinicia o serviço PipeWire para aplicar as mudanças.
-        Nota: filter-chains não suportam hot-reload, restart é necessário.
+        Valida o arquivo de config em disco antes de o PipeWire carregá-lo.
+        
+        Pega configs editadas à mão ou artefatos corrompidos em
+        microssegundos, antes de qualquer sinal ou restart. O resultado fica
+        em cache enquanto o arquivo não muda.
+        
+        Returns:
+            bool: True se a config é válida (ou o arquivo não existe)
         """
         try:
-            result = subprocess.run(
-                PIPEWIRE_RELOAD_CMD,
-                timeout=10,
-                capture_output=True,
-                text=True
-            )
+            st = self.config_file.stat()
+        except OSError:
+            return True  # Sem drop-in: nada do app para o PipeWire carregar
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if key == self._validated_file_key:
+            return True
+        try:
+            with tracer.span("validate", file=self.config_file.name):
+                validate_config_file(self.config_file)
+        except ConfigValidationError as e:
+            self.last_config_error = str(e)
+            logger.error(f"Config em {self.config_file} rejeitada, reload cancelado: {e}")
+            return False
+        self._validated_file_key = key
+        self.last_config_error = None
+        return True
+
+    def activate_config_file(self, source: Path, config_hash: int = 0) -> bool:
+        """
+        Troca atomicamente o arquivo de config ativo por um arquivo já pronto.
+        
+        Usa hard link + rename (sem copiar nem regenerar); se os arquivos
+        estiverem em sistemas de arquivos diferentes, copia de forma atômica.
+        
+        Args:
+            source: Arquivo de config já compilado
+            config_hash: Hash do conteúdo (para last_config_hash)
+        
+        Returns:
+            bool: True se sucesso, False se falha
+        """
+        config_file = self.config_file
+        tmp_path = config_file.with_name(f".{config_file.name}.swap")
+        try:
+            config_file.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+                os.link(source, tmp_path)
+                os.replace(tmp_path, config_file)
+            except OSError:
+                atomic_write_text(config_file, Path(source).read_text())
             
-            if result.returncode == 0:
-                logger.info("PipeWire reiniciado com sucesso")
-                return True
-            else:
-                logger.error(f"Erro ao reiniciar PipeWire: {result.stderr}")
-                return False
+            self.last_config_hash = config_hash
+            self._persist_offsets()
+            logger.info(f"Config ativa trocada para {source}")
+            return True
         except Exception as e:
-            logger.error(f"Erro ao executar reload: {e}")
+            logger.error(f"Erro ao ativar config {source}: {e}")
             return False
 
+    @_reload_operation
+    def reload_pipewire(self) -> bool:
+        """
+        Reinicia o serviço PipeWire para aplicar as mudanças.
+        Nota: filter-chains não suportam hot-reload, restart é necessário.
+        """
+        if not self.validate_active_config():
+            return False
+        if self._deadline_expired("restart do PipeWire"):
+            return False
+        # Retorna quando o job de restart do systemd termina
+        deadline = self._deadline()
+        return self.systemd.restart_unit(
+            PIPEWIRE_SERVICE_UNIT, timeout=deadline.clamp(SYSTEMD_JOB_TIMEOUT), deadline=deadline
+        )
+
     def reload_config(self) -> bool:
         """Alias para compatibilidade."""
         return self.reload_pipewire()
     
     def is_pipewire_running(self) -> bool:
         """Verifica se PipeWire está rodando."""
-        try:
-            result = subprocess.run(
-                PIPEWIRE_STATUS_CMD,
-                timeout=2,
-                capture_output=True,
-                text=True
-            )
-            return result.returncode == 0
-        except Exception:
-            return False
+        if self.systemd.is_active(PIPEWIRE_SERVICE_UNIT):
+            return True
+        # PipeWire fora do systemd (ex: iniciado pela sessão gráfica)
+        return bool(process_control.find_session_pids(PIPEWIRE_PROCESS_NAME))
 
     def parse_preset_file(self, filepath: Path) -> dict:
         """
@@ -194,6 +666,10 @@ context.modules = [
             # Regex ultra-flexível para JSON ou Lua (suporta aspas nas chaves e valores, e : ou =)
             pattern = r'"?type"?\s*[:=]\s*"?bq_peaking"?,\s*"?freq"?\s*[:=]\s*(\d+),\s*"?gain"?\s*[:=]\s*([-\d.]+)'
             matches = re.findall(pattern, content)
+            if not matches:
+                # Formato do arquivo gerado: um nó bq_peaking por banda com controles
+                node_pattern = r'"Freq"\s*=\s*(\d+)(?:\.0*)?\s+"Q"\s*=\s*[\d.]+\s+"Gain"\s*=\s*([-\d.]+)'
+                matches = re.findall(node_pattern, content)
             
             if not matches:
                 # logger.warning(f"Nenhum filtro encontrado em {filepath}") # Silencioso é melhor as vezes
@@ -216,6 +692,7 @@ context.modules = [
 
     # ==== HOT-RELOAD USING SIGHUP ====
     
+    @_reload_operation
     def reload_pipewire_signal(self) -> bool:
         """
         Envia sinal SIGHUP para o processo PipeWire para recarregar configuração.
@@ -223,45 +700,29 @@ context.modules = [
         Returns:
             bool: True se sucesso, False se falha
         """
+        if not self.validate_active_config():
+            return False
         try:
-            from simplepipewireq.utils.constants import PIPEWIRE_RELOAD_SIGNAL, PIPEWIRE_PROCESS_NAME
-            import time
-            
-            # Tentar encontrar o processo primeiro
-            pgrep_result = subprocess.run(
-                ["pgrep", PIPEWIRE_PROCESS_NAME],
-                capture_output=True,
-                text=True
-            )
+            # Apenas o daemon pipewire desta sessão (não pipewire-pulse,
+            # nem processos de outros usuários)
+            with tracer.span("find_pids"):
+                pids = process_control.find_session_pids(
+                    PIPEWIRE_PROCESS_NAME, exclude=self._isolated_pids()
+                )
             
-            if pgrep_result.returncode != 0:
+            if not pids:
                 logger.warning("Nenhum processo PipeWire encontrado")
                 return False
             
-            pids = pgrep_result.stdout.strip().split('\n')
-            if not pids or not pids[0]:
-                logger.warning("Nenhum PID de PipeWire encontrado")
-                return False
-            
-            # Enviar SIGHUP para todos os processos pipewire
-            success_count = 0
-            for pid in pids:
-                if pid:
-                    try:
-                        result = subprocess.run(
-                            ["kill", f"-{PIPEWIRE_RELOAD_SIGNAL}", pid],
-                            capture_output=True,
-                            text=True
-                        )
-                        if result.returncode == 0:
-                            success_count += 1
-                            logger.info(f"Sinal SIGHUP enviado para PipeWire (PID: {pid})")
-                    except Exception as e:
-                        logger.warning(f"Erro ao enviar sinal para PID {pid}: {e}")
+            success_count = process_control.signal_pids(
+                pids, process_control.signal_by_name(PIPEWIRE_RELOAD_SIGNAL)
+            )
+            if success_count:
+                logger.info(f"Sinal SIGHUP enviado para PipeWire (PIDs: {pids})")
             
             if success_count > 0:
                 # Aguardar um pouco para o PipeWire processar a nova configuração
-                time.sleep(0.5)
+                self._sleep(0.5, "processar config")
                 return True
             else:
                 logger.error("Nenhum sinal SIGHUP foi enviado com sucesso")
@@ -271,6 +732,7 @@ context.modules = [
             logger.error(f"Erro ao enviar sinal SIGHUP: {e}")
             return False
     
+    @_reload_operation
     def restart_pipewire_pulse_only(self) -> bool:
         """
         Reinicia apenas o pipewire-pulse (interface PulseAudio).
@@ -280,50 +742,49 @@ context.modules = [
         Returns:
             bool: True se sucesso, False se falha
         """
-        try:
-            result = subprocess.run(
-                ["systemctl", "--user", "restart", "pipewire-pulse"],
-                timeout=10,
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode == 0:
-                logger.info("pipewire-pulse reiniciado com sucesso")
-                return True
-            else:
-                logger.error(f"Erro ao reiniciar pipewire-pulse: {result.stderr}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Erro ao reiniciar pipewire-pulse: {e}")
+        if self._deadline_expired("restart do pipewire-pulse"):
             return False
+        deadline = self._deadline()
+        return self.systemd.restart_unit(
+            PIPEWIRE_PULSE_SERVICE_UNIT, timeout=deadline.clamp(SYSTEMD_JOB_TIMEOUT), deadline=deadline
+        )
     
     def wait_for_pipewire_ready(self, timeout: float = 10.0) -> bool:
         """
         Aguarda o PipeWire estar pronto após reload.
         """
-        import time
         start_time = time.time()
+        deadline = self._deadline()
         
-        while time.time() - start_time < timeout:
-            try:
-                result = subprocess.run(
-                    ["pw-cli", "info", "0"],
-                    capture_output=True,
-                    text=True,
-                    timeout=1
-                )
-                if result.returncode == 0:
-                    logger.info("PipeWire está pronto")
-                    return True
-            except Exception:
-                pass
-            time.sleep(0.2)
-        
-        logger.warning("Timeout esperando PipeWire ficar pronto")
-        return False
+        with tracer.span("wait_ready", timeout=timeout) as span:
+            while time.time() - start_time < timeout:
+                if deadline is not None and deadline.expired():
+                    break
+                try:
+                    result = self._run(
+                        ["pw-cli", "info", "0"],
+                        capture_output=True,
+                        text=True,
+                        timeout=1
+                    )
+                    if result.returncode == 0:
+                        logger.info("PipeWire está pronto")
+                        span.set(ok=True)
+                        return True
+                except Exception:
+                    pass
+                self._sleep(0.2, "poll pronto")
+            
+            if deadline is not None and deadline.expired():
+                span.set(ok=False, reason=deadline.reason)
+                logger.warning(f"Espera pelo PipeWire interrompida ({deadline.reason})")
+                return False
+            
+            span.set(ok=False)
+            logger.warning("Timeout esperando PipeWire ficar pronto")
+            return False
     
+    @_reload_operation
     def hot_reload(self, gains_dict: dict) -> bool:
         """
         Executa reload do equalizador com múltiplas estratégias.
@@ -339,52 +800,72 @@ context.modules = [
         Returns:
             bool: True se succeeded, False se falhou
         """
-        import time
         
         logger.info("Iniciando reload do equalizador...")
         
+        if self.isolated_instance is not None:
+            return self._reload_isolated(gains_dict)
+        
         # Gerar configuração
         if not self.generate_pipewire_config(gains_dict):
             logger.error("Falha ao gerar configuração")
             return False
         
         # Aguardar arquivo ser escrito completamente
-        time.sleep(0.3)
+        self._sleep(0.3, "escrita do arquivo")
         
         # Estratégia 1: SIGHUP
         logger.info("Estratégia 1: Tentando SIGHUP...")
-        if self.reload_pipewire_signal():
-            logger.info("SIGHUP enviado, aguardando PipeWire...")
-            if self.wait_for_pipewire_ready(timeout=10.0):
-                logger.info("Reload via SIGHUP OK")
-                return True
+        with tracer.span("strategy", name="SIGHUP") as span:
+            if self.reload_pipewire_signal():
+                logger.info("SIGHUP enviado, aguardando PipeWire...")
+                if self.wait_for_pipewire_ready(timeout=10.0):
+                    logger.info("Reload via SIGHUP OK")
+                    span.set(ok=True)
+                    tracer.annotate_apply(strategy="SIGHUP")
+                    return True
+                else:
+                    logger.warning("SIGHUP enviado mas PipeWire não ficou pronto")
             else:
-                logger.warning("SIGHUP enviado mas PipeWire não ficou pronto")
-        else:
-            logger.warning("Falha ao enviar SIGHUP")
+                logger.warning("Falha ao enviar SIGHUP")
+            span.set(ok=False)
+        
+        if self._deadline_expired("hot-reload"):
+            return False
         
         # Estratégia 2: Restart pipewire-pulse
         logger.info("Estratégia 2: Tentando restart pipewire-pulse...")
-        if self.restart_pipewire_pulse_only():
-            logger.info("pipewire-pulse reiniciado, aguardando...")
-            if self.wait_for_pipewire_ready(timeout=10.0):
-                logger.info("Reload via pipewire-pulse OK")
-                return True
+        with tracer.span("strategy", name="pipewire-pulse") as span:
+            if self.restart_pipewire_pulse_only():
+                logger.info("pipewire-pulse reiniciado, aguardando...")
+                if self.wait_for_pipewire_ready(timeout=10.0):
+                    logger.info("Reload via pipewire-pulse OK")
+                    span.set(ok=True)
+                    tracer.annotate_apply(strategy="pipewire-pulse")
+                    return True
+                else:
+                    logger.warning("pipewire-pulse reiniciado mas PipeWire não ficou pronto")
             else:
-                logger.warning("pipewire-pulse reiniciado mas PipeWire não ficou pronto")
-        else:
-            logger.warning("Falha ao reiniciar pipewire-pulse")
+                logger.warning("Falha ao reiniciar pipewire-pulse")
+            span.set(ok=False)
+        
+        if self._deadline_expired("hot-reload"):
+            return False
         
         # Estratégia 3: Restart completo
         logger.info("Estratégia 3: Restart completo...")
-        if self.reload_config():
-            logger.info("Restart completo executado, aguardando...")
-            result = self.wait_for_pipewire_ready(timeout=15.0)
-            if result:
-                logger.info("Restart completo OK")
-            else:
-                logger.error("Restart completo falhou ou demorou muito")
-            return result
+        with tracer.span("strategy", name="restart") as span:
+            if self.reload_config():
+                logger.info("Restart completo executado, aguardando...")
+                result = self.wait_for_pipewire_ready(timeout=15.0)
+                if result:
+                    logger.info("Restart completo OK")
+                    tracer.annotate_apply(strategy="restart")
+                else:
+                    logger.error("Restart completo falhou ou demorou muito")
+                span.set(ok=result)
+                return result
+            span.set(ok=False)
         
         logger.error("Todas as estratégias de reload falharam")
         return False
@@ -399,7 +880,7 @@ context.modules = [
             bool: True se carregado, False caso contrário
         """
         try:
-            result = subprocess.run(
+            result = self._run(
                 ["pw-cli", "list-objects", "Module"],
                 capture_output=True,
                 text=True,
@@ -425,7 +906,7 @@ context.modules = [
         """
         try:
             logger.info("Carregando módulo ALSA do PipeWire...")
-            result = subprocess.run(
+            result = self._run(
                 ["pw-cli", "load-module", "libpipewire-module-alsa"],
                 capture_output=True,
                 text=True,
@@ -435,7 +916,7 @@ context.modules = [
             if result.returncode == 0:
                 logger.info("✓ Módulo ALSA carregado com sucesso")
                 # Aguardar dispositivos serem criados
-                time.sleep(1.0)
+                self._sleep(1.0, "dispositivos ALSA")
                 return True
             else:
                 logger.error(f"✗ Erro ao carregar módulo ALSA: {result.stderr}")
@@ -468,7 +949,7 @@ context.modules = [
             Optional[int]: ID do nó se encontrado, None caso contrário
         """
         try:
-            result = subprocess.run(
+            result = self._run(
                 PIPEWIRE_LIST_NODES_CMD,
                 capture_output=True,
                 text=True,
@@ -480,19 +961,21 @@ context.modules = [
                 return None
             
             # Procurar pelo nó do equalizador
-            # O output do pw-cli contém informações sobre todos os nós
+            # O output do pw-cli contém informações sobre todos os nós:
+            # uma linha "id X, type ..." seguida das propriedades do nó
             lines = result.stdout.split('\n')
+            current_id = None
             
             for line in lines:
-                # Procurar pelo nome do nó ou descrição
-                if EQ_NODE_NAME in line or EQ_NODE_DESCRIPTION in line:
-                    # Extrair o ID do nó (formato: id X, ...)
-                    import re
-                    match = re.search(r'id\s+(\d+)', line)
-                    if match:
-                        node_id = int(match.group(1))
-                        logger.info(f"Nó do equalizador encontrado: ID {node_id}")
-                        return node_id
+                header = re.match(r'\s*id\s+(\d+),', line)
+                if header:
+                    current_id = int(header.group(1))
+                
+                # Procurar pelo nome do nó (o nó de captura é o que aceita Props)
+                if f'"{EQ_NODE_NAME}"' in line or (header and EQ_NODE_NAME in line):
+                    if current_id is not None:
+                        logger.info(f"Nó do equalizador encontrado: ID {current_id}")
+                        return current_id
             
             logger.warning("Nó do equalizador não encontrado")
             return None
@@ -516,7 +999,7 @@ context.modules = [
         """
         try:
             # Listar todas as portas
-            result = subprocess.run(
+            result = self._run(
                 ["pw-cli", "list-objects", "Port"],
                 capture_output=True,
                 text=True,
@@ -580,7 +1063,7 @@ context.modules = [
             # O PipeWire usa controle de volume em escala 0.0 a 1.0 (ou maior para boost)
             volume = max(0.0, min(4.0, amplitude))  # Limitar entre 0 e +12dB
             
-            result = subprocess.run(
+            result = self._run(
                 ["pw-cli", "set-param", str(node_id), "Props", 
                  f"{{ channelVolumes: [ {volume}, {volume} ] }}"],
                 capture_output=True,
@@ -599,6 +1082,64 @@ context.modules = [
             logger.error(f"Erro ao atualizar ganhos dinamicamente: {e}")
             return False
     
+    @staticmethod
+    def live_props(gains_dict: dict) -> Optional[str]:
+        """
+        Objeto Props do `pw-cli set-param` com os controles "Gain" das bandas
+        presentes em gains_dict (None se nenhuma banda).
+        """
+        params = []
+        for i, freq in enumerate(FREQUENCIES):
+            if freq in gains_dict:
+                params.append(f'"{EQ_BAND_NODE_PREFIX}{i}:Gain" {float(gains_dict[freq]):.{GAIN_DECIMALS}f}')
+        if not params:
+            return None
+        return f"{{ params = [ {' '.join(params)} ] }}"
+
+    def set_gains_live(self, gains_dict: dict) -> bool:
+        """
+        Altera os ganhos das bandas no nó em execução, sem recarregar nada.
+        
+        Usa `pw-cli set-param <node> Props { params = [...] }` sobre os
+        controles "Gain" dos nós bq_peaking. Apenas as bandas presentes em
+        gains_dict são enviadas, já somadas a gain_offsets; no modo preciso
+        uma banda mexe em todas, então a curva inteira é enviada.
+        
+        Args:
+            gains_dict: Dicionário de ganhos {freq: gain} (pode ser parcial)
+            
+        Returns:
+            bool: True se sucesso, False se falha
+        """
+        self._user_gains.update(gains_dict)
+        if self.eq_solver is not None:
+            gains_dict = dict(self._user_gains)
+        props = self.live_props(self.effective_gains(gains_dict))
+        if props is None:
+            return True
+        
+        # Uma nova tentativa com ID atualizado, caso o nó tenha sido recriado
+        for attempt in range(2):
+            if self._live_node_id is None:
+                self._live_node_id = self.find_eq_node_id()
+                if self._live_node_id is None:
+                    return False
+            try:
+                result = self._run(
+                    PIPEWIRE_SET_PARAM_CMD + [str(self._live_node_id), "Props", props],
+                    capture_output=True,
+                    text=True,
+                    timeout=2
+                )
+                if result.returncode == 0:
+                    return True
+                logger.warning(f"Erro ao atualizar parâmetros ao vivo: {result.stderr.strip()}")
+            except Exception as e:
+                logger.warning(f"Erro ao atualizar parâmetros ao vivo: {e}")
+            self._live_node_id = None
+        
+        return False
+
     def reload_filter_chain_module(self) -> bool:
         """
         Recarrega apenas o módulo filter-chain sem reiniciar o PipeWire.
@@ -625,7 +1166,7 @@ context.modules = [
             # Isso preserva o ID do nó e evita que aplicativos percam a referência
             if self.reload_pipewire_signal():
                 # Aguardar o PipeWire processar a nova configuração
-                time.sleep(0.5)
+                self._sleep(0.5, "processar config")
                 
                 # Verificar se o nó ainda existe (deve existir com o mesmo ID)
                 new_node_id = self.find_eq_node_id()
@@ -656,8 +1197,8 @@ context.modules = [
         """
         try:
             # Verificar se o arquivo de configuração existe
-            if not PIPEWIRE_CONFIG_FILE.exists():
-                logger.error(f"Arquivo de configuração não encontrado: {PIPEWIRE_CONFIG_FILE}")
+            if not self.config_file.exists():
+                logger.error(f"Arquivo de configuração não encontrado: {self.config_file}")
                 return False
             
             # Carregar o módulo usando o arquivo de configuração
@@ -668,7 +1209,7 @@ context.modules = [
             # Enviar SIGHUP para recarregar configuração
             if self.reload_pipewire_signal():
                 # Aguardar o módulo ser carregado
-                time.sleep(0.5)
+                self._sleep(0.5, "carregar módulo")
                 
                 # Verificar se o nó foi criado
                 node_id = self.find_eq_node_id()
@@ -686,6 +1227,7 @@ context.modules = [
             logger.error(f"Erro ao carregar módulo filter-chain: {e}")
             return False
     
+    @_reload_operation
     def hot_reload_dynamic(self, gains_dict: dict) -> bool:
         """
         Executa hot-reload dinâmico usando múltiplas estratégias.
@@ -703,30 +1245,169 @@ context.modules = [
         """
         logger.info("Iniciando hot-reload dinâmico...")
         
+        # Estratégia 1: Recarregar módulo filter-chain
+        ok = self._reload_module(gains_dict)
+        if ok is None:
+            return False  # Config não gerada: nenhum reload resolveria
+        if ok or self.isolated_instance is not None:
+            return ok
+        
+        if self._deadline_expired("hot-reload dinâmico"):
+            return False
+        
+        # Estratégia 2: Usar hot_reload existente (SIGHUP, pipewire-pulse, restart)
+        logger.info("Estratégia 2: Usando hot-reload existente...")
+        if self.hot_reload(gains_dict):
+            logger.info("Hot-reload via método existente OK")
+            return True
+        
+        logger.error("Todas as estratégias de hot-reload dinâmico falharam")
+        return False
+
+    @_reload_operation
+    def reload_eq_module(self, gains_dict: dict) -> bool:
+        """
+        Troca a config e recarrega só o módulo filter-chain (no modo
+        isolado, reinicia só a instância), sem cair para reinícios do
+        PipeWire como hot_reload_dynamic.
+        
+        Returns:
+            bool: True se sucesso, False se falha
+        """
+        return bool(self._reload_module(gains_dict))
+
+    def _reload_module(self, gains_dict: dict) -> Optional[bool]:
+        """Gera a config e recarrega o módulo; None se a config não foi gerada."""
+        if self.isolated_instance is not None:
+            return self._reload_isolated(gains_dict)
+        
         # Garantir que o módulo ALSA está carregado
-        if not self.ensure_alsa_module():
+        with tracer.span("ensure_alsa"):
+            alsa_ok = self.ensure_alsa_module()
+        if not alsa_ok:
             logger.warning("Módulo ALSA não está disponível, áudio pode não funcionar")
         
         # Gerar configuração
         if not self.generate_pipewire_config(gains_dict):
             logger.error("Falha ao gerar configuração")
-            return False
+            return None
         
         # Aguardar arquivo ser escrito completamente
-        time.sleep(0.2)
+        self._sleep(0.2, "escrita do arquivo")
         
-        # Estratégia 1: Recarregar módulo filter-chain
-        logger.info("Estratégia 1: Recarregando módulo filter-chain...")
-        if self.reload_filter_chain_module():
+        logger.info("Recarregando módulo filter-chain...")
+        with tracer.span("strategy", name="filter-chain") as span:
+            ok = self.reload_filter_chain_module()
+            span.set(ok=ok)
+        if ok:
             logger.info("Hot-reload via módulo filter-chain OK")
-            return True
+            tracer.annotate_apply(strategy="SIGHUP (filter-chain)")
+        return ok
+
+    # ==== MODO ISOLADO (INSTÂNCIA DEDICADA DO FILTER-CHAIN) ====
+    
+    def _isolated_pids(self) -> List[int]:
+        instance = self.isolated_instance
+        if instance is not None and instance.pid is not None:
+            return [instance.pid]
+        return []
+    
+    @_reload_operation
+    def enable_isolated_mode(self, enabled: bool = True) -> bool:
+        """
+        Liga ou desliga o modo isolado.
         
-        # Estratégia 2: Usar hot_reload existente (SIGHUP, pipewire-pulse, restart)
-        logger.info("Estratégia 2: Usando hot-reload existente...")
-        if self.hot_reload(gains_dict):
-            logger.info("Hot-reload via método existente OK")
-            return True
+        No modo isolado o filter-chain roda numa instância própria do
+        PipeWire e a config vai para ISOLATED_CONFIG_FILE; reloads reiniciam
+        só essa instância. A troca de modo move a config atual entre os dois
+        locais e reinicia o daemon principal uma única vez, para que o
+        filter-chain não fique hospedado nos dois.
         
-        logger.error("Todas as estratégias de hot-reload dinâmico falharam")
-        return False
+        Returns:
+            bool: True se sucesso, False se falha
+        """
+        if enabled == (self.isolated_instance is not None):
+            # Já ligado (ex: use_isolated_config): só garante a instância rodando
+            return self.start_isolated_instance()
+        
+        old_file = self.config_file
+        new_file = ISOLATED_CONFIG_FILE if enabled else PIPEWIRE_CONFIG_FILE
+        try:
+            if old_file.exists():
+                new_file.parent.mkdir(parents=True, exist_ok=True)
+                atomic_write_text(new_file, old_file.read_text())
+                old_file.unlink()
+                moved = True
+            else:
+                moved = False
+        except OSError as e:
+            logger.error(f"Erro ao mover config para {new_file}: {e}")
+            return False
+        self.config_file = new_file
+        self._live_node_id = None
+        
+        if enabled:
+            self.isolated_instance = self._new_isolated_instance()
+            logger.info("Modo isolado ativado")
+            # O daemon principal ainda hospeda o filter-chain do drop-in removido
+            if moved and not self.reload_pipewire():
+                logger.warning("Falha ao reiniciar o PipeWire; o equalizador pode aparecer duplicado")
+            return self.isolated_instance.start()
+        
+        instance, self.isolated_instance = self.isolated_instance, None
+        instance.stop()
+        logger.info("Modo isolado desativado")
+        return self.reload_pipewire()
+    
+    def _new_isolated_instance(self) -> FilterChainInstance:
+        instance = FilterChainInstance(ready_check=lambda: self.find_eq_node_id() is not None)
+        if self._graph_monitor is not None:
+            instance.watch_graph(self._graph_monitor)
+        return instance
+
+    def watch_graph(self, monitor) -> None:
+        """
+        GraphMonitor cujos eventos a supervisão da instância isolada usa
+        para notar o filter-chain fora do grafo (ver FilterChainInstance).
+        Os eventos só chegam enquanto o monitor roda.
+        """
+        self._graph_monitor = monitor
+        if self.isolated_instance is not None:
+            self.isolated_instance.watch_graph(monitor)
+
+    def use_isolated_config(self) -> None:
+        """
+        Usa o modo isolado já ligado numa execução anterior (config em
+        ISOLATED_CONFIG_FILE), sem mover arquivos nem iniciar processos.
+        A instância só sobe em start_isolated_instance() ou no próximo reload.
+        """
+        if self.isolated_instance is None:
+            self.config_file = ISOLATED_CONFIG_FILE
+            self.isolated_instance = self._new_isolated_instance()
+
+    def start_isolated_instance(self) -> bool:
+        """Adota ou inicia a instância isolada, se o modo estiver ligado."""
+        instance = self.isolated_instance
+        if instance is None:
+            return True
+        return instance.start()
 
+    def _reload_isolated(self, gains_dict: dict) -> bool:
+        """Reload no modo isolado: gera a config e reinicia só a instância."""
+        if not self.generate_pipewire_config(gains_dict):
+            logger.error("Falha ao gerar configuração")
+            return False
+        
+        with tracer.span("strategy", name="isolated") as span:
+            deadline = self._deadline()
+            ok = self.isolated_instance.restart(
+                timeout=deadline.clamp(ISOLATED_READY_TIMEOUT), deadline=deadline
+            )
+            span.set(ok=ok)
+        # A instância nova cria nós com outros IDs
+        self._live_node_id = None
+        if ok:
+            tracer.annotate_apply(strategy="instância isolada")
+        else:
+            logger.error("Falha ao reiniciar a instância isolada")
+        return ok
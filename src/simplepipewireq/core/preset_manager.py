@@ -3,14 +3,22 @@ import re
 from pathlib import Path
 from simplepipewireq.utils.constants import CONFIG_DIR, TEMP_CONF, PIPEWIRE_CONFIG_FILE
 from simplepipewireq.core.pipewire_manager import PipeWireManager
+from simplepipewireq.core.config_cache import ConfigCache
 
 logger = logging.getLogger(__name__)
 
 class PresetManager:
-    def __init__(self):
-        """Inicializa o PresetManager e carrega cache."""
-        self.pipewire_manager = PipeWireManager()
-        self.presets_cache = self.list_presets()
+    def __init__(self, pipewire_manager: PipeWireManager = None):
+        """
+        Inicializa o PresetManager. O diretório de presets só é lido na
+        primeira chamada a list_presets().
+        
+        Args:
+            pipewire_manager: Instância compartilhada (uma nova é criada se None)
+        """
+        self.pipewire_manager = pipewire_manager or PipeWireManager()
+        self.config_cache = ConfigCache(self.pipewire_manager)
+        self.presets_cache = None
 
     def list_presets(self) -> list:
         """
@@ -44,6 +52,17 @@ class PresetManager:
         # Permite alfanuméricos, espaços, hífens e underscores
         return bool(re.match(r'^[\w\s-]+$', name))
 
+    def _preset_path(self, name: str):
+        """
+        Caminho do arquivo do preset, ou None se o nome for inválido. Todo
+        acesso por nome (UI, CLI, D-Bus, regras de dispositivo, fleet) passa
+        por aqui, então nomes como '../../x' nunca saem de CONFIG_DIR.
+        """
+        if not self.validate_preset_name(name):
+            logger.error(f"Nome de preset inválido: {name!r}")
+            return None
+        return CONFIG_DIR / f"{name}.conf"
+
     def save_preset(self, name: str, gains_dict: dict) -> bool:
         r"""
         Salva um preset como arquivo .conf (mesmo formato que o PipeWire lê).
@@ -61,11 +80,9 @@ class PresetManager:
         O `parse_preset_file` busca `type = bq_peaking, freq = (\d+), gain = ([-\d.]+)`.
         Então basta salvar nesse formato.
         """
-        if not self.validate_preset_name(name):
-            logger.error(f"Nome de preset inválido: {name}")
+        filepath = self._preset_path(name)
+        if filepath is None:
             return False
-
-        filepath = CONFIG_DIR / f"{name}.conf"
         
         try:
             # Gerar conteúdo minimamente compatível com o parser
@@ -78,6 +95,8 @@ class PresetManager:
                 f.write("\n".join(lines))
             
             logger.info(f"PresetManager: Arquivo '{filepath}' escrito com sucesso")
+            # Pré-compilar a config PipeWire do preset para troca instantânea
+            self.config_cache.store_preset(name, gains_dict, filepath)
             self.list_presets() # Atualiza cache
             return True
         except Exception as e:
@@ -88,13 +107,16 @@ class PresetManager:
         """
         Deleta um preset.
         """
-        filepath = CONFIG_DIR / f"{name}.conf"
+        filepath = self._preset_path(name)
+        if filepath is None:
+            return False
         if not filepath.exists():
             logger.warning(f"Tentativa de deletar preset inexistente: {name}")
             return False
         
         try:
             filepath.unlink()
+            self.config_cache.forget_preset(name)
             logger.info(f"Preset deletado: {name}")
             self.list_presets()
             return True
@@ -104,7 +126,37 @@ class PresetManager:
 
     def get_preset_gains(self, name: str) -> dict:
         """
-        Retorna os ganhos do preset.
+        Retorna os ganhos do preset ({} se o nome for inválido).
         """
-        filepath = CONFIG_DIR / f"{name}.conf"
+        filepath = self._preset_path(name)
+        if filepath is None:
+            return {}
         return self.pipewire_manager.parse_preset_file(filepath)
+
+    def get_preset_artifact(self, name: str):
+        """
+        Retorna (chave, ganhos) da config pré-compilada do preset,
+        compilando-a se ainda não estiver no cache.
+        
+        Returns:
+            Optional[Tuple[str, dict]]: (chave no cache, {freq: gain}) ou None
+        """
+        filepath = self._preset_path(name)
+        if filepath is None:
+            return None
+        return self.config_cache.get_preset_artifact(name, self.get_preset_gains, filepath)
+
+    def activate_preset(self, name: str) -> bool:
+        """
+        Torna o preset a config ativa do PipeWire, trocando o arquivo
+        atomicamente pelo artefato pré-compilado. Não recarrega o PipeWire.
+        
+        Returns:
+            bool: True se sucesso.
+        """
+        artifact = self.get_preset_artifact(name)
+        if artifact is None:
+            logger.error(f"Não foi possível obter config compilada do preset {name}")
+            return False
+        key, _ = artifact
+        return self.config_cache.activate(key)
@@ -0,0 +1,152 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from simplepipewireq.utils.constants import (
+    FREQUENCIES, GAIN_DECIMALS, MORPH_DURATION_SECONDS, MORPH_STEPS
+)
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class MorphResult:
+    """Resultado de uma transição entre dois conjuntos de ganhos."""
+    steps: int              # Passos agendados
+    pushed: int             # Passos efetivamente enviados ao PipeWire
+    dropped: int            # Passos descartados porque o PipeWire estava ocupado
+    failed: int             # Envios que falharam
+    elapsed: float          # Duração real em segundos
+    cancelled: bool = False
+    timed_out: bool = False  # O último passo não chegou ao PipeWire a tempo
+
+    @property
+    def achieved_rate_hz(self) -> float:
+        """Taxa de atualização efetivamente alcançada."""
+        return self.pushed / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def succeeded(self) -> bool:
+        """
+        True se o estado final chegou ao PipeWire.
+
+        Sem nenhum envio e sem falhas também conta: o alvo já era o que
+        estava tocando (ex: escolher de novo o preset ativo).
+        """
+        return not self.cancelled and not self.timed_out and self.failed == 0
+
+
+class PresetMorpher:
+    """
+    Faz a transição suave (crossfade) dos ganhos atuais para um alvo.
+
+    Um agendador em thread própria interpola o vetor de ganhos em passos
+    regulares e entrega cada passo a um ParamPusher. Se o PipeWire estiver
+    lento, passos intermediários são descartados em vez de enfileirados,
+    e o último passo (o alvo exato) sempre é enviado.
+    """
+
+    def __init__(self, pusher, duration: float = MORPH_DURATION_SECONDS, steps: int = MORPH_STEPS):
+        self.pusher = pusher
+        self.duration = duration
+        self.steps = max(1, steps)
+        self._cancel_event = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def interpolate(from_gains: dict, to_gains: dict, t: float) -> dict:
+        """
+        Interpola linearmente (em dB) entre dois conjuntos de ganhos.
+
+        Args:
+            from_gains: Ganhos iniciais {freq: gain}
+            to_gains: Ganhos finais {freq: gain}
+            t: Posição entre 0.0 (início) e 1.0 (fim)
+        """
+        t = max(0.0, min(1.0, t))
+        result = {}
+        for freq in FREQUENCIES:
+            start = from_gains.get(freq, 0.0)
+            end = to_gains.get(freq, 0.0)
+            result[freq] = round(start + (end - start) * t, GAIN_DECIMALS)
+        return result
+
+    def start(self, from_gains: dict, to_gains: dict, on_step=None, on_done=None) -> None:
+        """
+        Inicia uma transição, cancelando a anterior se houver.
+
+        Args:
+            from_gains: Ganhos atuais {freq: gain}
+            to_gains: Ganhos alvo {freq: gain}
+            on_step: Callback(gains) chamado a cada passo (na thread do agendador)
+            on_done: Callback(MorphResult) chamado ao final (na thread do agendador)
+        """
+        with self._lock:
+            self._cancel_locked()
+            cancel_event = threading.Event()
+            self._cancel_event = cancel_event
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(dict(from_gains), dict(to_gains), cancel_event, on_step, on_done),
+                name="simplepipewireq-morpher",
+                daemon=True
+            )
+            self._thread.start()
+
+    def cancel(self) -> None:
+        """Cancela a transição em andamento (o último passo enviado permanece)."""
+        with self._lock:
+            self._cancel_locked()
+
+    def is_running(self) -> bool:
+        with self._lock:
+            return self._thread is not None and self._thread.is_alive()
+
+    def _cancel_locked(self):
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+            self._cancel_event = None
+
+    def _run(self, from_gains, to_gains, cancel_event, on_step, on_done):
+        before = self.pusher.stats()
+        start = time.monotonic()
+        interval = self.duration / self.steps
+        cancelled = False
+        timed_out = False
+
+        for step in range(1, self.steps + 1):
+            # Espera até o instante do passo (relógio absoluto, sem deriva)
+            delay = start + step * interval - time.monotonic()
+            if delay > 0 and cancel_event.wait(delay):
+                cancelled = True
+                break
+            if cancel_event.is_set():
+                cancelled = True
+                break
+
+            gains = self.interpolate(from_gains, to_gains, step / self.steps)
+            self.pusher.submit(gains)
+            if on_step:
+                on_step(gains)
+
+        if not cancelled:
+            # O passo final precisa chegar ao PipeWire antes de reportar
+            timed_out = not self.pusher.wait_idle(timeout=max(2.0, self.duration))
+
+        elapsed = time.monotonic() - start
+        after = self.pusher.stats()
+        result = MorphResult(
+            steps=self.steps,
+            pushed=after["pushed"] - before["pushed"],
+            dropped=after["dropped"] - before["dropped"],
+            failed=after["failed"] - before["failed"],
+            elapsed=elapsed,
+            cancelled=cancelled,
+            timed_out=timed_out
+        )
+        logger.info(
+            f"Transição concluída: {result.pushed}/{result.steps} passos enviados, "
+            f"{result.dropped} descartados, {result.achieved_rate_hz:.1f} Hz"
+        )
+        if on_done:
+            on_done(result)
@@ -0,0 +1,277 @@
+import contextlib
+import logging
+import os
+import signal
+import subprocess
+from typing import Iterable, List, Optional
+from simplepipewireq.utils.constants import SYSTEMCTL_USER_CMD, SYSTEMD_JOB_TIMEOUT
+from simplepipewireq.utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+_SYSTEMD_BUS_NAME = "org.freedesktop.systemd1"
+_SYSTEMD_PATH = "/org/freedesktop/systemd1"
+_SYSTEMD_MANAGER_IFACE = "org.freedesktop.systemd1.Manager"
+_SYSTEMD_UNIT_IFACE = "org.freedesktop.systemd1.Unit"
+
+
+# ==== PROCESSOS (/proc) ====
+
+def _read_proc(pid: int, name: str) -> Optional[bytes]:
+    try:
+        with open(f"/proc/{pid}/{name}", "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _runtime_dir_of(pid: int) -> Optional[str]:
+    """XDG_RUNTIME_DIR do processo, ou None se não for legível."""
+    environ = _read_proc(pid, "environ")
+    if not environ:
+        return None
+    for entry in environ.split(b"\0"):
+        if entry.startswith(b"XDG_RUNTIME_DIR="):
+            return entry[len(b"XDG_RUNTIME_DIR="):].decode(errors="replace")
+    return None
+
+
+def find_session_pids(name: str, exclude: Iterable[int] = ()) -> List[int]:
+    """
+    PIDs dos processos `name` da sessão atual.
+
+    Compara o nome exato do executável (comm em /proc/<pid>/stat), de
+    modo que "pipewire" não casa com "pipewire-pulse". Só considera
+    processos do mesmo usuário e, quando legível, com o mesmo
+    XDG_RUNTIME_DIR (outras sessões do mesmo usuário ficam de fora).
+
+    Args:
+        name: Nome do processo (ex: "pipewire")
+        exclude: PIDs a ignorar (ex: instâncias iniciadas pelo próprio app)
+    """
+    uid = os.getuid()
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    skip = set(exclude)
+    skip.add(os.getpid())
+    target = name.encode()[:15]  # comm é truncado em 15 bytes pelo kernel
+
+    pids = []
+    try:
+        entries = os.listdir("/proc")
+    except OSError as e:
+        logger.error(f"Erro ao listar /proc: {e}")
+        return pids
+
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        pid = int(entry)
+        if pid in skip:
+            continue
+        # /proc/<pid>/stat: "pid (comm) estado ..."; zumbis não contam
+        stat = _read_proc(pid, "stat")
+        if stat is None:
+            continue
+        end = stat.rfind(b")")
+        if stat[stat.find(b"(") + 1:end] != target or stat[end + 2:end + 3] == b"Z":
+            continue
+        try:
+            if os.stat(f"/proc/{pid}").st_uid != uid:
+                continue
+        except OSError:
+            continue
+        if runtime_dir:
+            proc_runtime_dir = _runtime_dir_of(pid)
+            if proc_runtime_dir is not None and proc_runtime_dir != runtime_dir:
+                continue
+        pids.append(pid)
+    return pids
+
+
+def signal_pids(pids: Iterable[int], sig: int) -> int:
+    """Envia `sig` para cada PID; retorna quantos sinais foram entregues."""
+    delivered = 0
+    for pid in pids:
+        try:
+            os.kill(pid, sig)
+            delivered += 1
+        except ProcessLookupError:
+            logger.debug(f"Processo {pid} já terminou")
+        except PermissionError as e:
+            logger.warning(f"Sem permissão para sinalizar PID {pid}: {e}")
+    return delivered
+
+
+def signal_by_name(name: str) -> int:
+    """Converte o nome de um sinal ("HUP" ou "SIGHUP") no número."""
+    name = name.upper()
+    if not name.startswith("SIG"):
+        name = "SIG" + name
+    return int(getattr(signal, name))
+
+
+# ==== SYSTEMD (usuário) ====
+
+class SystemdUserManager:
+    """
+    Controle de units do systemd do usuário via D-Bus.
+
+    Usa o gerenciador em org.freedesktop.systemd1 no barramento de sessão:
+    `restart_unit` pede RestartUnit e aguarda o sinal JobRemoved do job,
+    sem polling. A conexão é aberta no primeiro uso e `gi` só é importado
+    nesse momento. Sem D-Bus disponível, ou com use_dbus=False (a CLI, que
+    não importa `gi`), usa `systemctl --user`.
+    """
+
+    def __init__(self, use_dbus: bool = True):
+        self._bus = None
+        self._dbus_failed = not use_dbus
+        self._subscribed = False
+
+    def _get_bus(self):
+        if self._bus is None and not self._dbus_failed:
+            try:
+                from gi.repository import Gio
+                self._bus = Gio.bus_get_sync(Gio.BusType.SESSION, None)
+            except Exception as e:
+                logger.info(f"D-Bus indisponível, usando systemctl: {e}")
+                self._dbus_failed = True
+        return self._bus
+
+    def restart_unit(self, unit: str, timeout: float = SYSTEMD_JOB_TIMEOUT, deadline=None) -> bool:
+        """
+        Reinicia `unit` e aguarda a conclusão do job.
+
+        Args:
+            deadline: Prazo do apply; a espera termina se ele for cancelado
+
+        Returns:
+            bool: True se o job terminou com resultado "done"
+        """
+        with tracer.span("systemd restart", unit=unit) as span:
+            bus = self._get_bus()
+            if bus is None:
+                ok = self._systemctl(["restart", unit], timeout, deadline)
+            else:
+                ok = self._restart_dbus(bus, unit, timeout, deadline)
+            span.set(ok=ok)
+            return ok
+
+    def is_active(self, unit: str) -> bool:
+        """True se o ActiveState da unit é "active"."""
+        bus = self._get_bus()
+        if bus is None:
+            return self._systemctl(["is-active", "--quiet", unit], 2.0)
+        try:
+            from gi.repository import GLib
+            unit_path = bus.call_sync(
+                _SYSTEMD_BUS_NAME, _SYSTEMD_PATH, _SYSTEMD_MANAGER_IFACE,
+                "GetUnit", GLib.Variant("(s)", (unit,)),
+                GLib.VariantType.new("(o)"), 0, 2000, None
+            ).unpack()[0]
+            state = bus.call_sync(
+                _SYSTEMD_BUS_NAME, unit_path, "org.freedesktop.DBus.Properties",
+                "Get", GLib.Variant("(ss)", (_SYSTEMD_UNIT_IFACE, "ActiveState")),
+                GLib.VariantType.new("(v)"), 0, 2000, None
+            ).unpack()[0]
+            return state == "active"
+        except Exception as e:
+            # GetUnit falha com NoSuchUnit quando a unit não está carregada
+            logger.debug(f"Unit {unit} inativa ou inacessível: {e}")
+            return False
+
+    def _restart_dbus(self, bus, unit: str, timeout: float, deadline=None) -> bool:
+        from gi.repository import GLib
+
+        # Os callbacks do sinal rodam no contexto padrão desta thread;
+        # um contexto próprio permite aguardar o job fora do main loop da UI
+        context = GLib.MainContext.new()
+        finished = {}
+        pushed = False
+        subscription = None
+
+        def on_job_removed(connection, sender, path, interface, signal_name, params):
+            job_id, job_path, job_unit, result = params.unpack()
+            finished[job_path] = result
+
+        try:
+            context.push_thread_default()
+            pushed = True
+            subscription = bus.signal_subscribe(
+                _SYSTEMD_BUS_NAME, _SYSTEMD_MANAGER_IFACE, "JobRemoved", _SYSTEMD_PATH,
+                None, 0, on_job_removed
+            )
+            # Sem Subscribe() o gerenciador não emite JobRemoved
+            # (a assinatura vale até a conexão fechar)
+            if not self._subscribed:
+                bus.call_sync(
+                    _SYSTEMD_BUS_NAME, _SYSTEMD_PATH, _SYSTEMD_MANAGER_IFACE,
+                    "Subscribe", None, None, 0, 2000, None
+                )
+                self._subscribed = True
+            job_path = bus.call_sync(
+                _SYSTEMD_BUS_NAME, _SYSTEMD_PATH, _SYSTEMD_MANAGER_IFACE,
+                "RestartUnit", GLib.Variant("(ss)", (unit, "replace")),
+                GLib.VariantType.new("(o)"), 0, int(timeout * 1000), None
+            ).unpack()[0]
+
+            # Bloqueia no contexto até o JobRemoved do job (ou o timeout)
+            timed_out = []
+            timer = GLib.timeout_source_new(int(timeout * 1000))
+            timer.set_callback(lambda *args: timed_out.append(True) or False)
+            timer.attach(context)
+            # Cancelar o prazo acorda o contexto, sem esperar o timeout
+            wake = deadline.on_cancel(context.wakeup) if deadline else contextlib.nullcontext()
+            with wake:
+                while (job_path not in finished and not timed_out
+                       and not (deadline and deadline.cancelled)):
+                    context.iteration(True)
+            timer.destroy()
+
+            result = finished.get(job_path)
+            if result is None and deadline and deadline.cancelled:
+                logger.warning(f"Espera pelo restart de {unit} interrompida ({deadline.reason})")
+                return False
+            if result is None:
+                logger.warning(f"Timeout aguardando restart de {unit}")
+                return False
+            if result != "done":
+                logger.error(f"Restart de {unit} terminou com resultado: {result}")
+                return False
+            logger.info(f"{unit} reiniciado com sucesso")
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao reiniciar {unit} via D-Bus: {e}")
+            return False
+        finally:
+            if subscription is not None:
+                bus.signal_unsubscribe(subscription)
+            if pushed:
+                context.pop_thread_default()
+
+    def _systemctl(self, args: list, timeout: float, deadline=None) -> bool:
+        try:
+            with subprocess.Popen(
+                SYSTEMCTL_USER_CMD + args,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True
+            ) as process:
+                # Cancelar o prazo mata o systemctl (o job segue no systemd)
+                wake = deadline.on_cancel(process.kill) if deadline else contextlib.nullcontext()
+                with wake:
+                    try:
+                        _, stderr = process.communicate(timeout=timeout)
+                    except subprocess.TimeoutExpired:
+                        process.kill()
+                        process.communicate()
+                        raise
+            if deadline and deadline.cancelled:
+                logger.warning(f"systemctl {' '.join(args)} interrompido ({deadline.reason})")
+                return False
+            if process.returncode != 0 and args[0] != "is-active":
+                logger.error(f"Erro em systemctl {' '.join(args)}: {stderr}")
+            return process.returncode == 0
+        except Exception as e:
+            logger.error(f"Erro ao executar systemctl: {e}")
+            return False
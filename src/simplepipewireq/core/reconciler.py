@@ -0,0 +1,302 @@
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from simplepipewireq.core.config_validator import ConfigValidationError, parse_spa_json
+from simplepipewireq.core.graph_monitor import GraphMonitor, node_band_gains
+from simplepipewireq.core.pipewire_manager import PipeWireManager
+from simplepipewireq.utils.constants import (
+    FREQUENCIES, EQ_NODE_NAME, EQ_OUTPUT_NODE_NAME, RECONCILE_NODE_PROPS,
+    RECONCILE_GAIN_TOLERANCE_DB
+)
+from simplepipewireq.utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Ações, da mais barata para a mais cara
+NOOP = "noop"                    # Nada a fazer no PipeWire
+LIVE_PARAMS = "live_params"      # set-param nas bandas que mudaram
+MODULE_RELOAD = "module_reload"  # Troca a config e recarrega só o filter-chain
+FULL_RESTART = "full_restart"    # Reinicia o PipeWire
+
+
+@dataclass
+class ApplyPlan:
+    """Ação escolhida para levar o PipeWire ao estado desejado, e por quê."""
+    action: str
+    reasons: List[str] = field(default_factory=list)
+    desired_hash: int = 0
+    active_hash: Optional[int] = None
+    # Bandas a enviar ao vivo: {freq: ganho do usuário}
+    live_changes: Dict[int, float] = field(default_factory=dict)
+    # Regravar o arquivo de config (sem reload) junto com a ação
+    write_config: bool = False
+
+    def to_dict(self) -> dict:
+        return {
+            "action": self.action,
+            "reasons": list(self.reasons),
+            "desired_hash": f"{self.desired_hash:016x}",
+            "active_hash": f"{self.active_hash:016x}" if self.active_hash is not None else None,
+            "live_changes": {str(freq): gain for freq, gain in self.live_changes.items()},
+            "write_config": self.write_config,
+        }
+
+
+def _structure(config: dict) -> str:
+    """
+    Assinatura da parte da config que só muda com reload do módulo: tudo
+    menos o "Gain" das bandas, que é um controle alterável ao vivo.
+    """
+    modules = []
+    for module in config.get("context.modules") or []:
+        module = json.loads(json.dumps(module))
+        graph = (module.get("args") or {}).get("filter.graph") or {}
+        for node in graph.get("nodes") or []:
+            if isinstance(node, dict) and isinstance(node.get("control"), dict):
+                node["control"].pop("Gain", None)
+        modules.append(module)
+    return json.dumps(modules, sort_keys=True)
+
+
+def _node_props(config: dict) -> Dict[str, dict]:
+    """Props de captura e reprodução da config, por node.name."""
+    props = {}
+    for module in config.get("context.modules") or []:
+        args = module.get("args") or {}
+        for key in ("capture.props", "playback.props"):
+            node_props = args.get(key) or {}
+            if node_props.get("node.name"):
+                props[node_props["node.name"]] = node_props
+    return props
+
+
+class Reconciler:
+    """
+    Compara o estado desejado do equalizador com o que está rodando e
+    escolhe a ação mais barata que basta.
+
+    Desejado: a config que seria gerada para os ganhos (grafo, props dos
+    nós, latência e dispositivo alvo) e os ganhos efetivos das bandas.
+    Observado: o grafo do PipeWire (o GraphMonitor compartilhado ou, se ele
+    não estiver conectado, um pw-dump avulso num monitor próprio), o hash
+    da config ativa e os ganhos atuais do nó do EQ.
+
+    - daemon inacessível: restart completo;
+    - nó do EQ ausente, grafo do filtro ou props dos nós diferentes:
+      troca da config e reload só do módulo;
+    - só ganhos diferentes: envio ao vivo das bandas que mudaram;
+    - nada diferente: nada (no máximo regrava o arquivo em disco).
+
+    `plan()` só observa (dry-run); `apply()` executa o plano e, se a ação
+    falhar, sobe um degrau (ao vivo -> módulo -> restart), registrando a
+    ação que de fato rodou em `last_plan`.
+    """
+
+    def __init__(self, pipewire_manager: PipeWireManager, monitor: GraphMonitor):
+        self.pipewire_manager = pipewire_manager
+        self.monitor = monitor
+        self.last_plan: Optional[ApplyPlan] = None
+
+    # ==== OBSERVAÇÃO ====
+
+    def observe(self) -> Tuple[bool, Dict[str, dict]]:
+        """
+        Estado observado dos nós do EQ.
+
+        Returns:
+            Tuple[bool, dict]: (daemon acessível, {node.name: info do nó})
+        """
+        monitor = self.monitor
+        if not monitor.connected:
+            # O estado do monitor compartilhado é da thread dele (e de seus
+            # listeners): o dry-run lê um snapshot próprio
+            monitor = GraphMonitor()
+            if not monitor.load_snapshot():
+                return False, {}
+        nodes = {}
+        for name in (EQ_NODE_NAME, EQ_OUTPUT_NODE_NAME):
+            node_id = monitor.find_node(name)
+            if node_id is not None:
+                nodes[name] = monitor.node_info(node_id) or {}
+        return True, nodes
+
+    def _active_config(self) -> Optional[str]:
+        try:
+            return self.pipewire_manager.config_file.read_text()
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    # ==== PLANO ====
+
+    def plan(self, gains_dict: dict) -> ApplyPlan:
+        """
+        Decide a ação para aplicar `gains_dict`, sem alterar nada (dry-run).
+
+        Args:
+            gains_dict: Ganhos do usuário {freq: gain}
+        """
+        with tracer.span("plan") as span:
+            plan = self._plan(gains_dict)
+            span.set(action=plan.action)
+        logger.info(f"Plano do apply: {plan.action} ({'; '.join(plan.reasons) or 'em dia'})")
+        return plan
+
+    def _plan(self, gains_dict: dict) -> ApplyPlan:
+        manager = self.pipewire_manager
+        gains = {freq: 0.0 for freq in FREQUENCIES}
+        gains.update(gains_dict)
+        desired_hash, desired_text = manager.render_pipewire_config_cached(gains)
+        active_text = self._active_config()
+        active_hash = manager.config_hash(active_text) if active_text is not None else None
+        plan = ApplyPlan(NOOP, desired_hash=desired_hash, active_hash=active_hash,
+                         write_config=desired_hash != active_hash)
+
+        running, nodes = self.observe()
+        if not running:
+            plan.action = FULL_RESTART
+            plan.reasons.append("PipeWire inacessível")
+            return plan
+
+        eq_node = nodes.get(EQ_NODE_NAME)
+        if eq_node is None:
+            plan.action = MODULE_RELOAD
+            plan.reasons.append("nó do equalizador ausente")
+            return plan
+
+        try:
+            desired = parse_spa_json(desired_text)
+        except ConfigValidationError as e:
+            # A validação em generate_pipewire_config vai rejeitar e explicar
+            plan.action = MODULE_RELOAD
+            plan.reasons.append(f"config desejada inválida: {e}")
+            return plan
+
+        structure = self._structure_changes(desired, active_text, active_hash == desired_hash)
+        structure += self._node_prop_changes(desired, nodes)
+        if structure:
+            plan.action = MODULE_RELOAD
+            plan.reasons.extend(structure)
+            return plan
+
+        effective = manager.effective_gains(gains)
+        running_gains = node_band_gains(eq_node)
+        # Banda não observada (NaN) nunca está dentro da tolerância
+        changed = [
+            freq for freq in FREQUENCIES
+            if not abs(running_gains.get(freq, float("nan")) - effective.get(freq, 0.0))
+            <= RECONCILE_GAIN_TOLERANCE_DB
+        ]
+        if changed:
+            plan.action = LIVE_PARAMS
+            plan.live_changes = {freq: gains[freq] for freq in changed}
+            if not running_gains:
+                plan.reasons.append("ganhos do nó não observáveis")
+            else:
+                plan.reasons.append(f"{len(changed)} banda(s) com ganho diferente")
+        if plan.write_config:
+            plan.reasons.append("config em disco desatualizada")
+        return plan
+
+    @staticmethod
+    def _structure_changes(desired: dict, active_text: Optional[str], same_hash: bool) -> List[str]:
+        if same_hash:
+            return []
+        if active_text is None:
+            return ["config ativa ausente"]
+        try:
+            active = parse_spa_json(active_text)
+        except ConfigValidationError:
+            return ["config ativa ilegível"]
+        if _structure(active) != _structure(desired):
+            return ["grafo do filtro ou props dos nós mudaram"]
+        return []
+
+    @staticmethod
+    def _node_prop_changes(desired: dict, nodes: Dict[str, dict]) -> List[str]:
+        """Latência e dispositivo alvo pedidos pela config mas diferentes no nó em execução."""
+        changes = []
+        for name, wanted in _node_props(desired).items():
+            info = nodes.get(name)
+            if info is None:
+                changes.append(f"nó {name} ausente")
+                continue
+            running = info.get("props") or {}
+            for key in RECONCILE_NODE_PROPS:
+                if key in wanted and str(running.get(key)) != str(wanted[key]):
+                    changes.append(f"{name}: {key} = {running.get(key)!r}, desejado {wanted[key]!r}")
+        return changes
+
+    # ==== EXECUÇÃO ====
+
+    def apply(self, gains_dict: dict) -> bool:
+        """
+        Planeja e executa a ação mínima para aplicar `gains_dict`.
+
+        Se o envio ao vivo falhar, cai para o reload do módulo. A ação que
+        rodou, os motivos e a estratégia ficam no span raiz do apply em
+        curso (atributos "action", "reasons" e "strategy").
+
+        Returns:
+            bool: True se sucesso
+        """
+        plan = self.plan(gains_dict)
+        self.last_plan = plan
+        try:
+            return self._execute(gains_dict, plan)
+        finally:
+            tracer.annotate_apply(action=plan.action, reasons=list(plan.reasons))
+
+    def _execute(self, gains_dict: dict, plan: ApplyPlan) -> bool:
+        manager = self.pipewire_manager
+
+        if plan.action == NOOP:
+            tracer.annotate_apply(strategy="nenhuma (já aplicado)")
+            if plan.write_config:
+                return manager.generate_pipewire_config(gains_dict, plan.desired_hash)
+            manager.matches_active_config(gains_dict)
+            return True
+
+        if plan.action == LIVE_PARAMS:
+            with tracer.span("strategy", name="live") as span:
+                ok = manager.set_gains_live(plan.live_changes)
+                span.set(ok=ok)
+            if ok:
+                tracer.annotate_apply(strategy="ao vivo")
+                if plan.write_config:
+                    return manager.generate_pipewire_config(gains_dict, plan.desired_hash)
+                return True
+            logger.warning("Envio ao vivo falhou, recarregando o módulo do equalizador...")
+            self._escalate(plan, MODULE_RELOAD, "envio ao vivo falhou")
+
+        if plan.action == MODULE_RELOAD:
+            if manager.reload_eq_module(gains_dict):
+                return True
+            if manager.last_config_error:
+                return False  # Config rejeitada: reiniciar não resolveria
+            logger.warning("Reload do módulo falhou, reiniciando o PipeWire...")
+            self._escalate(plan, FULL_RESTART, "reload do módulo falhou")
+
+        return self._full_restart(gains_dict, plan)
+
+    @staticmethod
+    def _escalate(plan: ApplyPlan, action: str, reason: str) -> None:
+        plan.action = action
+        plan.reasons.append(reason)
+
+    def _full_restart(self, gains_dict: dict, plan: ApplyPlan) -> bool:
+        manager = self.pipewire_manager
+        if not manager.generate_pipewire_config(gains_dict, plan.desired_hash):
+            plan.reasons.append("falha ao gravar a config")
+            return False
+        with tracer.span("strategy", name="restart") as span:
+            ok = manager.reload_pipewire() and manager.wait_for_pipewire_ready()
+            if ok and manager.isolated_instance is not None:
+                # A instância isolada é cliente do daemon reiniciado
+                ok = manager.reload_eq_module(gains_dict)
+            span.set(ok=ok)
+        if ok:
+            tracer.annotate_apply(strategy="restart")
+        else:
+            plan.reasons.append("restart do PipeWire falhou")
+        return ok
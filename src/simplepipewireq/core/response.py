@@ -0,0 +1,78 @@
+import math
+from typing import Dict, List, Sequence
+from simplepipewireq.utils.constants import (
+    FREQUENCIES, EQ_FILTER_Q, RESPONSE_SAMPLE_RATE, SPECTRUM_MIN_FREQ, SPECTRUM_MAX_FREQ
+)
+
+
+def log_frequencies(count: int, low: float = SPECTRUM_MIN_FREQ,
+                    high: float = SPECTRUM_MAX_FREQ) -> List[float]:
+    """`count` frequências espaçadas logaritmicamente entre `low` e `high`."""
+    if count < 2:
+        return [low]
+    ratio = (high / low) ** (1.0 / (count - 1))
+    return [low * ratio ** i for i in range(count)]
+
+
+def peaking_coefficients(freq: float, gain_db: float, q: float = EQ_FILTER_Q,
+                         sample_rate: float = RESPONSE_SAMPLE_RATE) -> tuple:
+    """
+    Coeficientes (b0, b1, b2, a1, a2) normalizados por a0 de um filtro
+    peaking (RBJ Audio EQ Cookbook), o mesmo do bq_peaking do PipeWire.
+    """
+    a = 10.0 ** (gain_db / 40.0)
+    w0 = 2.0 * math.pi * freq / sample_rate
+    alpha = math.sin(w0) / (2.0 * q)
+    cos_w0 = math.cos(w0)
+    a0 = 1.0 + alpha / a
+    return (
+        (1.0 + alpha * a) / a0,
+        -2.0 * cos_w0 / a0,
+        (1.0 - alpha * a) / a0,
+        -2.0 * cos_w0 / a0,
+        (1.0 - alpha / a) / a0,
+    )
+
+
+def peaking_response_db(freq: float, gain_db: float, eval_freqs: Sequence[float],
+                        q: float = EQ_FILTER_Q,
+                        sample_rate: float = RESPONSE_SAMPLE_RATE) -> List[float]:
+    """Magnitude (dB) de uma banda peaking em cada frequência de `eval_freqs`."""
+    if gain_db == 0.0:
+        return [0.0] * len(eval_freqs)
+    b0, b1, b2, a1, a2 = peaking_coefficients(freq, gain_db, q, sample_rate)
+    # |H(e^jw)|² expandido em cos(w) e cos(2w)
+    num_c0 = b0 * b0 + b1 * b1 + b2 * b2
+    num_c1 = 2.0 * (b0 * b1 + b1 * b2)
+    num_c2 = 2.0 * b0 * b2
+    den_c0 = 1.0 + a1 * a1 + a2 * a2
+    den_c1 = 2.0 * (a1 + a1 * a2)
+    den_c2 = 2.0 * a2
+    result = []
+    for f in eval_freqs:
+        w = 2.0 * math.pi * f / sample_rate
+        cos_w = math.cos(w)
+        cos_2w = 2.0 * cos_w * cos_w - 1.0
+        num = num_c0 + num_c1 * cos_w + num_c2 * cos_2w
+        den = den_c0 + den_c1 * cos_w + den_c2 * cos_2w
+        result.append(10.0 * math.log10(max(num, 1e-30) / max(den, 1e-30)))
+    return result
+
+
+def curve_response(gains: Dict[int, float], eval_freqs: Sequence[float],
+                   q: float = EQ_FILTER_Q,
+                   sample_rate: float = RESPONSE_SAMPLE_RATE) -> List[float]:
+    """
+    Resposta em magnitude (dB) da cadeia de bandas em série.
+
+    Em série as magnitudes se multiplicam, então em dB basta somar a
+    resposta de cada banda.
+    """
+    total = [0.0] * len(eval_freqs)
+    for freq in FREQUENCIES:
+        gain = gains.get(freq, 0.0)
+        if gain == 0.0:
+            continue
+        for i, value in enumerate(peaking_response_db(freq, gain, eval_freqs, q, sample_rate)):
+            total[i] += value
+    return total
@@ -0,0 +1,297 @@
+import logging
+import subprocess
+import threading
+import time
+from typing import Callable, Optional, Union
+from simplepipewireq.utils.constants import (
+    PIPEWIRE_RECORD_CMD, SPECTRUM_SAMPLE_RATE, SPECTRUM_FFT_SIZE,
+    SPECTRUM_BINS, SPECTRUM_FPS, SPECTRUM_MIN_FREQ, SPECTRUM_MAX_FREQ,
+    SPECTRUM_FLOOR_DB, SPECTRUM_DECAY_DB
+)
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: sem ele o analisador fica indisponível
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Bytes lidos do pw-record por chamada (mono float32)
+_READ_CHUNK_FRAMES = 1024
+
+
+def is_available() -> bool:
+    """True se as dependências do analisador (NumPy) estão instaladas."""
+    return np is not None
+
+
+class SpectrumAnalyzer:
+    """
+    Analisador de espectro de um nó do PipeWire.
+
+    Um `pw-record` captura o nó (mono, float32) para um ring buffer
+    pré-alocado. Um worker calcula FFTs janeladas (Hann) a até SPECTRUM_FPS
+    quadros por segundo e reduz o resultado a SPECTRUM_BINS faixas em escala
+    logarítmica de frequência. Todos os buffers são alocados uma vez; nenhum
+    quadro aloca memória no caminho de leitura e desenho. A FFT só roda
+    quando chegaram amostras novas desde o quadro anterior; sem elas o
+    espectro publicado apenas decai até o piso.
+
+    `pause()` encerra a captura e o worker fica parado num Event, de modo que
+    o analisador pausado não consome CPU.
+    """
+
+    def __init__(self, target: Union[str, Callable[[], Optional[str]]],
+                 capture_sink: bool = False, fft_size: int = SPECTRUM_FFT_SIZE, bins: int = SPECTRUM_BINS,
+                 fps: int = SPECTRUM_FPS, sample_rate: int = SPECTRUM_SAMPLE_RATE):
+        """
+        Args:
+            target: node.name a ser capturado, ou callable que o retorna
+                    a cada início de captura (ex: sink de saída atual)
+            capture_sink: True para capturar o monitor de um sink
+                          (stream.capture.sink=true)
+        """
+        if np is None:
+            raise RuntimeError("NumPy não está instalado; analisador de espectro indisponível")
+
+        self.target = target
+        self.capture_target = None   # node.name da captura em curso
+        self.capture_sink = capture_sink
+        self.fft_size = fft_size
+        self.bins = bins
+        self.frame_interval = 1.0 / fps
+        self.sample_rate = sample_rate
+
+        # Ring buffer de amostras (potência de 2 para o índice com máscara)
+        ring_size = 1
+        while ring_size < fft_size * 4:
+            ring_size *= 2
+        self._ring = np.zeros(ring_size, dtype=np.float32)
+        self._ring_mask = ring_size - 1
+        self._write_pos = 0          # Total de amostras escritas (monotônico)
+        self._computed_pos = 0       # _write_pos no último quadro calculado
+        self._ring_lock = threading.Lock()
+
+        # Buffers do worker
+        self._read_buf = bytearray(_READ_CHUNK_FRAMES * 4)
+        self._read_view = memoryview(self._read_buf)
+        self._read_samples = np.frombuffer(self._read_buf, dtype=np.float32)
+        self._frame = np.zeros(fft_size, dtype=np.float32)
+        self._window = np.hanning(fft_size).astype(np.float32)
+        self._spectrum = np.zeros(fft_size // 2 + 1, dtype=np.complex64)
+        self._magnitude = np.zeros(fft_size // 2 + 1, dtype=np.float32)
+        self._work_bins = np.full(bins, SPECTRUM_FLOOR_DB, dtype=np.float32)
+        self._published = np.full(bins, SPECTRUM_FLOOR_DB, dtype=np.float32)
+        self._publish_lock = threading.Lock()
+        self._rfft_out = self._probe_rfft_out()
+
+        # Faixa de cada bin de saída: índice da FFT mais próximo da frequência
+        # central (escala log); normalização compensa o ganho da janela
+        freqs = np.geomspace(SPECTRUM_MIN_FREQ, SPECTRUM_MAX_FREQ, bins)
+        self.bin_frequencies = freqs.astype(np.float32)
+        self._bin_index = np.clip(
+            np.rint(freqs * fft_size / sample_rate), 1, fft_size // 2
+        ).astype(np.intp)
+        self._norm = np.float32(2.0 / self._window.sum())
+
+        self._process = None
+        self._running = threading.Event()
+        self._stopped = False
+        self._reader_thread = None
+        self._worker_thread = None
+        self.frames_computed = 0
+
+    # ==== CONTROLE ====
+
+    def start(self) -> bool:
+        """Inicia (ou retoma) a captura e o cálculo. Retorna False se falhar."""
+        if self._running.is_set():
+            return True
+        if not self._start_capture():
+            return False
+        self._running.set()
+        if self._worker_thread is None or not self._worker_thread.is_alive():
+            self._worker_thread = threading.Thread(
+                target=self._worker_loop, name="simplepipewireq-spectrum", daemon=True
+            )
+            self._worker_thread.start()
+        return True
+
+    def pause(self) -> None:
+        """Para a captura; o worker fica bloqueado sem consumir CPU."""
+        self._running.clear()
+        self._stop_capture()
+
+    def stop(self) -> None:
+        """Encerra definitivamente o analisador."""
+        self._stopped = True
+        self.pause()
+        self._running.set()  # Acorda o worker para que ele saia
+        if self._worker_thread is not None:
+            self._worker_thread.join(1.0)
+
+    def is_running(self) -> bool:
+        return self._running.is_set() and not self._stopped
+
+    def read_bins(self, out) -> None:
+        """
+        Copia o último espectro (dB por bin) para `out`, um array float32
+        de tamanho `bins` pré-alocado pelo chamador.
+        """
+        with self._publish_lock:
+            np.copyto(out, self._published)
+
+    # ==== CAPTURA ====
+
+    def _start_capture(self) -> bool:
+        target = self.target() if callable(self.target) else self.target
+        if not target:
+            logger.warning("Nó a capturar pelo analisador não encontrado no grafo")
+            return False
+        self.capture_target = target
+        cmd = PIPEWIRE_RECORD_CMD + [
+            "--target", target,
+            "--rate", str(self.sample_rate),
+            "--channels", "1",
+            "--format", "f32",
+            "--raw",
+            "-P", "{ node.name = simplepipewireq-analyzer node.passive = true }",
+        ]
+        if self.capture_sink:
+            cmd[-1] = "{ node.name = simplepipewireq-analyzer node.passive = true stream.capture.sink = true }"
+        cmd.append("-")
+        try:
+            self._process = subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=0
+            )
+        except OSError as e:
+            logger.error(f"Erro ao iniciar captura do analisador: {e}")
+            self._process = None
+            return False
+        self._reader_thread = threading.Thread(
+            target=self._reader_loop, args=(self._process,),
+            name="simplepipewireq-spectrum-capture", daemon=True
+        )
+        self._reader_thread.start()
+        return True
+
+    def _stop_capture(self) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        process.terminate()
+        try:
+            process.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    def _reader_loop(self, process):
+        """Lê amostras do pw-record direto para o ring buffer."""
+        stream = process.stdout
+        pending = 0  # Bytes parciais no início de _read_buf
+        while True:
+            try:
+                n = stream.readinto(self._read_view[pending:])
+            except (OSError, ValueError):
+                break
+            if not n:
+                break
+            pending += n
+            count = pending // 4
+            if count:
+                self._push_samples(self._read_samples[:count])
+                leftover = pending - count * 4
+                if leftover:
+                    self._read_buf[:leftover] = self._read_buf[count * 4:pending]
+                pending = leftover
+        if process is self._process:
+            logger.warning(f"Captura do analisador encerrou ({self.capture_target})")
+
+    def _push_samples(self, samples) -> None:
+        n = len(samples)
+        with self._ring_lock:
+            start = self._write_pos & self._ring_mask
+            first = min(n, len(self._ring) - start)
+            self._ring[start:start + first] = samples[:first]
+            if first < n:
+                self._ring[:n - first] = samples[first:]
+            self._write_pos += n
+
+    # ==== CÁLCULO ====
+
+    def _probe_rfft_out(self) -> bool:
+        """NumPy >= 2.0 aceita `out` em rfft (sem alocar a cada quadro)."""
+        try:
+            np.fft.rfft(self._frame, out=self._spectrum)
+            return True
+        except TypeError:
+            return False
+
+    def _worker_loop(self):
+        next_frame = time.monotonic()
+        while not self._stopped:
+            if not self._running.is_set():
+                self._running.wait()
+                next_frame = time.monotonic()
+                continue
+            delay = next_frame - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            next_frame = max(next_frame + self.frame_interval, time.monotonic())
+            self._compute_frame()
+
+    def _compute_frame(self) -> None:
+        size = self.fft_size
+        with self._ring_lock:
+            if self._write_pos < size:
+                return
+            if self._write_pos == self._computed_pos:
+                fresh = False
+            else:
+                fresh = True
+                self._computed_pos = self._write_pos
+        if not fresh:
+            # Nada chegou (sink suspenso, captura parada): sem FFT, só o decaimento
+            with self._publish_lock:
+                np.subtract(self._published, SPECTRUM_DECAY_DB, out=self._published)
+                np.maximum(self._published, SPECTRUM_FLOOR_DB, out=self._published)
+            return
+
+        with self._ring_lock:
+            end = self._write_pos & self._ring_mask
+            start = (end - size) & self._ring_mask
+            if start < end:
+                self._frame[:] = self._ring[start:end]
+            else:
+                tail = len(self._ring) - start
+                self._frame[:tail] = self._ring[start:]
+                self._frame[tail:] = self._ring[:end]
+
+        np.multiply(self._frame, self._window, out=self._frame)
+        if self._rfft_out:
+            np.fft.rfft(self._frame, out=self._spectrum)
+            spectrum = self._spectrum
+        else:
+            spectrum = np.fft.rfft(self._frame)
+        np.abs(spectrum, out=self._magnitude)
+        np.multiply(self._magnitude, self._norm, out=self._magnitude)
+        np.maximum(self._magnitude, 1e-9, out=self._magnitude)
+        np.log10(self._magnitude, out=self._magnitude)
+        np.multiply(self._magnitude, 20.0, out=self._magnitude)
+
+        # Bins de saída com queda suave (decay) para leitura estável
+        with self._publish_lock:
+            np.take(self._magnitude, self._bin_index, out=self._work_bins)
+            np.subtract(self._published, SPECTRUM_DECAY_DB, out=self._published)
+            np.maximum(self._published, self._work_bins, out=self._published)
+            np.maximum(self._published, SPECTRUM_FLOOR_DB, out=self._published)
+        self.frames_computed += 1
+
+
+def create_analyzer(target: Union[str, Callable[[], Optional[str]]],
+                    capture_sink: bool = False) -> Optional[SpectrumAnalyzer]:
+    """Cria um analisador, ou retorna None se NumPy não estiver disponível."""
+    if not is_available():
+        logger.info("NumPy não instalado: analisador de espectro desativado")
+        return None
+    return SpectrumAnalyzer(target, capture_sink=capture_sink)
@@ -0,0 +1,170 @@
+import logging
+import threading
+import time
+from typing import Callable, List
+from simplepipewireq.core.graph_monitor import GraphEvent, GraphMonitor
+from simplepipewireq.utils.constants import (
+    FREQUENCIES, EQ_NODE_NAME, WATCHDOG_NODE_GRACE_SECONDS
+)
+from simplepipewireq.utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+class EqWatchdog:
+    """
+    Restaura o equalizador quando o PipeWire reinicia ou o nó some.
+
+    Reage a eventos do GraphMonitor (sem polling): queda da conexão com o
+    daemon, reconexão e remoção/criação do nó do EQ. Remoções causadas
+    pelos reloads do próprio app são ignoradas.
+
+    Ao detectar a perda, aguarda o daemon voltar e dá WATCHDOG_NODE_GRACE_SECONDS
+    para o nó reaparecer sozinho (o drop-in é recarregado pelo PipeWire).
+    Se o nó voltou, o estado de temp.conf é reenviado ao vivo (o nó pode ter
+    voltado com outros ganhos); senão, faz o hot-reload completo. O tempo
+    entre a perda e a restauração fica em `last_recovery_ms`.
+    """
+
+    def __init__(self, pipewire_manager, config_manager, monitor: GraphMonitor,
+                 param_pusher=None):
+        self.pipewire_manager = pipewire_manager
+        self.config_manager = config_manager
+        self.monitor = monitor
+        self.param_pusher = param_pusher
+
+        self._cond = threading.Condition()
+        self._lost_at = None       # perf_counter do momento da perda
+        self._lost_reason = ""
+        self._node_back = False
+        self._stopped = False
+        self._thread = None
+        self._listeners: List[Callable[[float, bool], None]] = []
+
+        self.recoveries = 0
+        self.last_recovery_ms = None
+
+    def add_listener(self, callback: Callable[[float, bool], None]) -> None:
+        """callback(tempo de recuperação em ms, sucesso) após cada restauração."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped = False
+        self.monitor.add_listener(self._on_event)
+        self.monitor.start()
+        self._thread = threading.Thread(
+            target=self._run, name="simplepipewireq-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.monitor.remove_listener(self._on_event)
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(2.0)
+
+    # ==== EVENTOS (thread do GraphMonitor) ====
+
+    def _on_event(self, event: GraphEvent) -> None:
+        if event.kind == "disconnected":
+            self._mark_lost("conexão com o PipeWire perdida")
+        elif event.kind == "connected":
+            with self._cond:
+                self._cond.notify_all()
+            if event.data and event.data.get("reconnected"):
+                self._mark_lost("PipeWire reiniciado")
+                if self.monitor.find_node(EQ_NODE_NAME) is not None:
+                    self._mark_back()
+        elif event.props.get("node.name") == EQ_NODE_NAME:
+            if event.kind == "node_removed":
+                if not self.pipewire_manager.is_reloading():
+                    self._mark_lost("nó do equalizador removido")
+            elif event.kind == "node_added":
+                self._mark_back()
+
+    def _mark_lost(self, reason: str) -> None:
+        with self._cond:
+            if self._lost_at is None:
+                self._lost_at = time.perf_counter()
+                self._lost_reason = reason
+                self._node_back = False
+                logger.warning(f"Watchdog: {reason}")
+            self._cond.notify_all()
+
+    def _mark_back(self) -> None:
+        with self._cond:
+            if self._lost_at is not None:
+                self._node_back = True
+                self._cond.notify_all()
+
+    # ==== RESTAURAÇÃO ====
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._stopped or self._lost_at is not None)
+                # Daemon fora do ar: nada a fazer até ele voltar
+                self._cond.wait_for(lambda: self._stopped or self.monitor.connected)
+                self._cond.wait_for(
+                    lambda: self._stopped or self._node_back, WATCHDOG_NODE_GRACE_SECONDS
+                )
+                if self._stopped:
+                    return
+                if not self._node_back and not self.monitor.connected:
+                    continue  # O daemon caiu durante a espera: aguardar reconexão
+                lost_at, node_back = self._lost_at, self._node_back
+
+            if self.pipewire_manager.is_reloading():
+                # Um reload do app está em andamento e vai recriar o nó
+                self._reset()
+                continue
+            self._restore(lost_at, node_back)
+
+    def _reset(self) -> None:
+        with self._cond:
+            self._lost_at = None
+            self._node_back = False
+
+    def _load_state(self) -> dict:
+        # Escritas pendentes (write-behind) precisam estar em disco
+        self.config_manager.flush(timeout=1.0)
+        gains = {freq: 0.0 for freq in FREQUENCIES}
+        gains.update(self.config_manager.read_config("temp.conf"))
+        return gains
+
+    def _restore(self, lost_at: float, node_back: bool) -> None:
+        gains = self._load_state()
+        with tracer.apply("recovery", reason=self._lost_reason) as root:
+            ok = False
+            if node_back:
+                ok = self.pipewire_manager.set_gains_live(gains)
+                strategy = "ao vivo"
+            if not ok:
+                ok = self.pipewire_manager.hot_reload_dynamic(gains)
+                strategy = root.attrs.get("strategy") or "reload"
+            root.set(strategy=strategy, ok=ok)
+
+        if self.param_pusher is not None:
+            self.param_pusher.forget_last_pushed()
+        elapsed_ms = (time.perf_counter() - lost_at) * 1000.0
+        self._reset()
+
+        self.last_recovery_ms = elapsed_ms
+        if ok:
+            self.recoveries += 1
+            logger.info(f"Watchdog: equalizador restaurado em {elapsed_ms:.0f} ms ({strategy})")
+        else:
+            logger.error(f"Watchdog: falha ao restaurar o equalizador após {elapsed_ms:.0f} ms")
+        for callback in list(self._listeners):
+            try:
+                callback(elapsed_ms, ok)
+            except Exception as e:
+                logger.error(f"Erro em listener do watchdog: {e}")
@@ -0,0 +1,307 @@
+import logging
+import signal
+import threading
+from gi.repository import Gio, GLib
+from simplepipewireq.core.context import AppContext
+from simplepipewireq.utils.constants import (
+    FREQUENCIES, MIN_GAIN, MAX_GAIN,
+    DBUS_SERVICE_NAME, DBUS_OBJECT_PATH, DBUS_INTERFACE_NAME
+)
+
+logger = logging.getLogger(__name__)
+
+INTERFACE_XML = f"""
+<node>
+  <interface name="{DBUS_INTERFACE_NAME}">
+    <method name="SetGains">
+      <arg type="a{{id}}" name="gains" direction="in"/>
+      <arg type="b" name="ok" direction="out"/>
+    </method>
+    <method name="SetBand">
+      <arg type="i" name="frequency" direction="in"/>
+      <arg type="d" name="gain" direction="in"/>
+      <arg type="b" name="ok" direction="out"/>
+    </method>
+    <method name="LoadPreset">
+      <arg type="s" name="name" direction="in"/>
+      <arg type="b" name="ok" direction="out"/>
+    </method>
+    <method name="ListPresets">
+      <arg type="as" name="presets" direction="out"/>
+    </method>
+    <method name="GetState">
+      <arg type="a{{id}}" name="gains" direction="out"/>
+      <arg type="s" name="preset" direction="out"/>
+    </method>
+    <signal name="GainsChanged">
+      <arg type="a{{id}}" name="gains"/>
+    </signal>
+    <signal name="PresetLoaded">
+      <arg type="s" name="name"/>
+    </signal>
+  </interface>
+</node>
+"""
+
+ERROR_INVALID_ARGS = f"{DBUS_INTERFACE_NAME}.Error.InvalidArgs"
+ERROR_NOT_FOUND = f"{DBUS_INTERFACE_NAME}.Error.NotFound"
+
+
+class ControlService:
+    """
+    Serviço headless que controla o equalizador via D-Bus (sessão).
+
+    Mantém um único conjunto de managers aquecido e o estado em memória:
+    cada chamada envia os ganhos ao nó em execução (ParamPusher) e retorna
+    em milissegundos. Persistência (temp.conf e config do PipeWire) e
+    eventuais reloads acontecem numa thread de sincronização, fora do
+    caminho da chamada.
+    """
+
+    def __init__(self, context: AppContext = None):
+        self.context = context or AppContext()
+        self.pipewire_manager = self.context.pipewire_manager
+        self.preset_manager = self.context.preset_manager
+        self.config_manager = self.context.config_manager
+        self.param_pusher = self.context.param_pusher
+
+        # Estado em cache
+        self._state_lock = threading.Lock()
+        self.gains = dict(self.context.restore_state())
+        self.preset_name = ""
+        self._preset_artifact = None  # (chave no cache, ganhos) do último preset
+
+        self._connection = None
+        self._registration_id = 0
+        self._owner_id = 0
+        self._loop = None
+
+        # Sincronização em background (coalescida)
+        self._sync_event = threading.Event()
+        self._stopping = False
+        self._failed_seen = 0
+        self._sync_thread = threading.Thread(
+            target=self._sync_loop, name="simplepipewireq-service-sync", daemon=True
+        )
+
+    # ==== CICLO DE VIDA ====
+
+    def run(self) -> int:
+        """Registra o serviço no barramento de sessão e roda o main loop."""
+        self._loop = GLib.MainLoop()
+        self._sync_thread.start()
+        self.pipewire_manager.start_isolated_instance()
+        self._verify_restored_state()
+        self.context.watchdog.start()
+        self.context.device_switcher.add_listener(self._on_device_switch)
+        self.context.device_switcher.start()
+        if self.context.config_manager.get_bool_setting("loudness_mode"):
+            self.context.loudness.start()
+        if self.context.config_manager.get_setting("midi_port"):
+            self.context.midi.add_listener(self._on_midi_input)
+            self.context.midi.start()
+        self._owner_id = Gio.bus_own_name(
+            Gio.BusType.SESSION,
+            DBUS_SERVICE_NAME,
+            Gio.BusNameOwnerFlags.NONE,
+            self._on_bus_acquired,
+            None,
+            self._on_name_lost,
+        )
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, signum, self._on_quit_signal)
+
+        logger.info(f"Serviço D-Bus iniciado: {DBUS_SERVICE_NAME}")
+        self._loop.run()
+        self.shutdown()
+        return 0
+
+    def shutdown(self) -> None:
+        if self._stopping:
+            return
+        self._stopping = True
+        self._sync_event.set()
+        if self._sync_thread.is_alive():
+            self._sync_thread.join(5.0)
+        if self._connection is not None and self._registration_id:
+            self._connection.unregister_object(self._registration_id)
+            self._registration_id = 0
+        if self._owner_id:
+            Gio.bus_unown_name(self._owner_id)
+            self._owner_id = 0
+        self.context.shutdown()
+        logger.info("Serviço D-Bus encerrado")
+
+    def _on_quit_signal(self):
+        if self._loop is not None:
+            self._loop.quit()
+        return GLib.SOURCE_REMOVE
+
+    def _on_bus_acquired(self, connection, name):
+        self._connection = connection
+        node_info = Gio.DBusNodeInfo.new_for_xml(INTERFACE_XML)
+        self._registration_id = connection.register_object(
+            DBUS_OBJECT_PATH, node_info.interfaces[0], self._on_method_call, None, None
+        )
+
+    def _on_name_lost(self, connection, name):
+        logger.error(f"Não foi possível obter o nome {name} no barramento (outra instância rodando?)")
+        if self._loop is not None:
+            self._loop.quit()
+
+    # ==== MÉTODOS ====
+
+    def _on_method_call(self, connection, sender, object_path, interface_name,
+                        method_name, parameters, invocation):
+        handler = getattr(self, f"_dbus_{method_name}", None)
+        if handler is None:
+            invocation.return_dbus_error(
+                "org.freedesktop.DBus.Error.UnknownMethod", f"Método desconhecido: {method_name}"
+            )
+            return
+        try:
+            handler(invocation, *parameters.unpack())
+        except Exception as e:
+            logger.error(f"Erro em {method_name}: {e}")
+            invocation.return_dbus_error(f"{DBUS_INTERFACE_NAME}.Error.Failed", str(e))
+
+    def _dbus_SetGains(self, invocation, gains):
+        unknown = [freq for freq in gains if freq not in FREQUENCIES]
+        if unknown:
+            invocation.return_dbus_error(ERROR_INVALID_ARGS, f"Frequências inválidas: {unknown}")
+            return
+        self._apply_gains(gains)
+        invocation.return_value(GLib.Variant("(b)", (True,)))
+
+    def _dbus_SetBand(self, invocation, frequency, gain):
+        if frequency not in FREQUENCIES:
+            invocation.return_dbus_error(ERROR_INVALID_ARGS, f"Frequência inválida: {frequency}")
+            return
+        self._apply_gains({frequency: gain})
+        invocation.return_value(GLib.Variant("(b)", (True,)))
+
+    def _dbus_LoadPreset(self, invocation, name):
+        if not self.preset_manager.validate_preset_name(name):
+            invocation.return_dbus_error(ERROR_INVALID_ARGS, f"Nome de preset inválido: {name!r}")
+            return
+        artifact = self.preset_manager.get_preset_artifact(name)
+        if artifact is None:
+            invocation.return_dbus_error(ERROR_NOT_FOUND, f"Preset não encontrado: {name}")
+            return
+        key, gains = artifact
+        self._apply_gains(gains, preset=(name, key))
+        self._emit("PresetLoaded", GLib.Variant("(s)", (name,)))
+        invocation.return_value(GLib.Variant("(b)", (True,)))
+
+    def _dbus_ListPresets(self, invocation):
+        presets = self.preset_manager.list_presets()
+        invocation.return_value(GLib.Variant("(as)", (presets,)))
+
+    def _dbus_GetState(self, invocation):
+        with self._state_lock:
+            gains = dict(self.gains)
+            preset = self.preset_name
+        invocation.return_value(GLib.Variant("(a{id}s)", (gains, preset)))
+
+    # ==== ESTADO ====
+
+    def _apply_gains(self, gains: dict, preset=None) -> None:
+        """Atualiza o estado, envia ao vivo e agenda a sincronização em disco."""
+        clamped = {
+            int(freq): max(MIN_GAIN, min(float(gain), MAX_GAIN))
+            for freq, gain in gains.items()
+        }
+        with self._state_lock:
+            self.gains.update(clamped)
+            snapshot = dict(self.gains)
+            if preset is not None:
+                self.preset_name = preset[0]
+                self._preset_artifact = (preset[1], snapshot)
+            else:
+                self.preset_name = ""
+                self._preset_artifact = None
+
+        self.param_pusher.submit(clamped)
+        self.config_manager.schedule_write("temp.conf", snapshot)
+        self._emit("GainsChanged", GLib.Variant("(a{id})", (snapshot,)))
+        self._sync_event.set()
+
+    def _on_device_switch(self, sink, preset_name, gains, ok):
+        """A troca automática já aplicou o preset: só atualiza o estado."""
+        if not ok:
+            return
+        with self._state_lock:
+            self.gains.update(gains)
+            snapshot = dict(self.gains)
+            self.preset_name = preset_name
+            self._preset_artifact = None
+        GLib.idle_add(self._emit, "GainsChanged", GLib.Variant("(a{id})", (snapshot,)))
+        GLib.idle_add(self._emit, "PresetLoaded", GLib.Variant("(s)", (preset_name,)))
+
+    def _on_midi_input(self, changes, settled):
+        """Faders MIDI já enviados ao vivo (e gravados ao parar): só atualiza o estado."""
+        if not changes:
+            return
+        with self._state_lock:
+            self.gains.update(changes)
+            snapshot = dict(self.gains)
+            self._preset_artifact = None
+        GLib.idle_add(self._emit, "GainsChanged", GLib.Variant("(a{id})", (snapshot,)))
+
+    def _emit(self, signal_name: str, variant) -> None:
+        if self._connection is None:
+            return
+        self._connection.emit_signal(
+            None, DBUS_OBJECT_PATH, DBUS_INTERFACE_NAME, signal_name, variant
+        )
+
+    def _verify_restored_state(self):
+        """Reaplica o estado salvo só se a config ativa não for a dele."""
+        if not self.pipewire_manager.is_configured():
+            return
+        gains = dict(self.gains)
+        offsets = self.context.restored_gain_offsets()
+        if self.pipewire_manager.matches_active_config(gains, offsets):
+            logger.info("Estado restaurado confere com a config ativa")
+            return
+        logger.info("Config ativa difere do estado salvo, reaplicando")
+        # Ao vivo + config em disco pela sincronização (reload se o nó faltar)
+        self.param_pusher.submit(gains)
+        self._sync_event.set()
+
+    def _sync_loop(self):
+        """
+        Mantém a config do PipeWire em disco igual ao estado aplicado.
+        Se o envio ao vivo falhou (nó ausente), faz o reload completo.
+        """
+        while True:
+            self._sync_event.wait()
+            self._sync_event.clear()
+            if self._stopping:
+                return
+            if not self.param_pusher.wait_idle(timeout=5.0):
+                self._sync_event.set()
+                continue
+
+            with self._state_lock:
+                gains = dict(self.gains)
+                artifact = self._preset_artifact
+
+            failed = self.param_pusher.stats()["failed"]
+            if failed > self._failed_seen:
+                self._failed_seen = failed
+                logger.warning("Envio ao vivo falhou, recarregando o equalizador...")
+                if self.pipewire_manager.hot_reload_dynamic(gains):
+                    self.param_pusher.forget_last_pushed()
+                continue
+
+            if artifact is not None and artifact[1] == gains:
+                # Swap atômico para a config pré-compilada do preset
+                if self.preset_manager.config_cache.activate(artifact[0]):
+                    continue
+            self.pipewire_manager.generate_pipewire_config(gains)
+
+
+def run_service() -> int:
+    """Entry point do modo serviço (simplepipewireq --service)."""
+    return ControlService().run()
@@ -0,0 +1,185 @@
+import logging
+import threading
+import gi
+gi.require_version('Gtk', '4.0')
+gi.require_version('Adw', '1')
+from gi.repository import Adw, GLib, Gio
+from simplepipewireq.core.context import AppContext
+from simplepipewireq.ui.main_window import MainWindow
+from simplepipewireq.utils import memory
+from simplepipewireq.utils.profiling import startup_profiler
+from simplepipewireq.utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+class SimplePipeWireEQApp(Adw.Application):
+    """
+    Aplicação gráfica.
+
+    Com o modo em segundo plano ligado ("background_mode"), fechar a janela
+    destrói toda a árvore de widgets mas mantém o processo: o contexto
+    (estado, watchdog, troca automática por dispositivo) segue ativo e a
+    janela é reconstruída a partir dele na próxima ativação. A memória
+    residente com e sem janela é medida e registrada em `memory_report`.
+    """
+
+    def __init__(self):
+        super().__init__(application_id="com.github.simplepipewireq")
+        # Managers compartilhados entre aplicação e janela, criados sob demanda
+        self.context = AppContext()
+        self._held = False          # hold() ativo enquanto em segundo plano
+        self.memory_report = {}     # {"window": bytes, "background": bytes}
+
+    def do_startup(self):
+        Adw.Application.do_startup(self)
+        quit_action = Gio.SimpleAction.new("quit", None)
+        quit_action.connect("activate", lambda *args: self.quit_app())
+        self.add_action(quit_action)
+        self.set_accels_for_action("app.quit", ["<Control>q"])
+
+        background = Gio.SimpleAction.new_stateful(
+            "background-mode", None,
+            GLib.Variant.new_boolean(self.context.config_manager.get_bool_setting("background_mode"))
+        )
+        background.connect("change-state", self._on_background_mode_changed)
+        self.add_action(background)
+
+        loudness = Gio.SimpleAction.new_stateful(
+            "loudness", None,
+            GLib.Variant.new_boolean(self.context.config_manager.get_bool_setting("loudness_mode"))
+        )
+        loudness.connect("change-state", self._on_loudness_changed)
+        self.add_action(loudness)
+
+        accurate = Gio.SimpleAction.new_stateful(
+            "accurate-mode", None,
+            GLib.Variant.new_boolean(self.context.config_manager.get_bool_setting("accurate_mode"))
+        )
+        accurate.connect("change-state", self._on_accurate_mode_changed)
+        self.add_action(accurate)
+
+    def do_shutdown(self):
+        """Encerramento do processo: para workers e grava o estado pendente."""
+        self.context.shutdown()
+        if tracer.enabled:
+            tracer.export()
+        Adw.Application.do_shutdown(self)
+
+    @property
+    def pw_manager(self):
+        return self.context.pipewire_manager
+
+    def do_activate(self):
+        """Ativado quando o app é iniciado."""
+        window = self.get_active_window()
+        if window:
+            window.present()
+            return
+        
+        # Criar janela principal
+        startup_profiler.mark("activate")
+        if not self._held:
+            # Sliders no estado que está tocando (no segundo plano o contexto já tem)
+            self.context.restore_state()
+        window = MainWindow(application=self, context=self.context)
+        window.connect("close-request", self._on_window_close_request)
+        if self._held:
+            # Reconstruída a partir do segundo plano: a janela segura o app
+            self.release()
+            self._held = False
+            if self.memory_report:
+                window.update_status(
+                    "Reaberto do segundo plano (memória residente: "
+                    f"{memory.format_bytes(self.memory_report['window'])} com janela, "
+                    f"{memory.format_bytes(self.memory_report['background'])} sem)"
+                )
+        else:
+            # Verificação do PipeWire só depois do primeiro frame
+            window.call_after_first_paint(self._check_initial_setup)
+        window.present()
+
+    def _on_loudness_changed(self, action, value):
+        action.set_state(value)
+        enabled = value.get_boolean()
+        self.context.config_manager.set_setting("loudness_mode", enabled)
+        compensator = self.context.loudness
+        # stop() espera a thread e reenvia a curva sem compensação
+        threading.Thread(
+            target=compensator.start if enabled else compensator.stop, daemon=True
+        ).start()
+
+    def _on_accurate_mode_changed(self, action, value):
+        action.set_state(value)
+        enabled = value.get_boolean()
+        self.context.config_manager.set_setting("accurate_mode", enabled)
+        # Reenvia a curva atual ao vivo; o arquivo acompanha no próximo apply
+        threading.Thread(
+            target=self.context.pipewire_manager.enable_accurate_mode,
+            args=(enabled, True), daemon=True
+        ).start()
+
+    # ==== SEGUNDO PLANO ====
+
+    def _on_background_mode_changed(self, action, value):
+        action.set_state(value)
+        self.context.config_manager.set_setting("background_mode", value.get_boolean())
+
+    def _on_window_close_request(self, window):
+        """Roda depois do handler da janela; decide se o processo continua."""
+        if not self.context.config_manager.get_bool_setting("background_mode"):
+            return False  # Sem janelas e sem hold: o app encerra (do_shutdown)
+        window_rss = memory.rss_bytes()
+        if not self._held:
+            self.hold()
+            self._held = True
+        # A janela é destruída ao retornar; medir depois disso
+        GLib.idle_add(self._report_background_memory, window_rss, priority=GLib.PRIORITY_LOW)
+        return False
+
+    def _report_background_memory(self, window_rss: int):
+        memory.release_memory()
+        background_rss = memory.rss_bytes()
+        self.memory_report = {"window": window_rss, "background": background_rss}
+        logger.info(
+            f"Em segundo plano: memória residente {memory.format_bytes(window_rss)} com janela, "
+            f"{memory.format_bytes(background_rss)} sem janela"
+        )
+        return False
+
+    def quit_app(self):
+        """Encerra de vez, inclusive a partir do segundo plano."""
+        for window in self.get_windows():
+            window.close()
+        if self._held:
+            self.release()
+            self._held = False
+        self.quit()
+
+    def _check_initial_setup(self):
+        """Verifica e configura PipeWire se necessário."""
+        if not self.pw_manager.is_configured():
+            logger.info("Configuração inicial não encontrada, criando...")
+            # Setup inicial em background para não travar a UI se demorar
+            self._do_initial_setup()
+
+    def _do_initial_setup(self):
+        # Dialog informativo se for a primeira vez usando Adw.AlertDialog
+        def show_dialog():
+            win = self.get_active_window()
+            if not win: return
+            
+            dialog = Adw.AlertDialog(
+                heading="Configuração Inicial",
+                body="O SimplePipeWireEQ precisa configurar o filtro do PipeWire pela primeira vez. O áudio pode ser interrompido brevemente."
+            )
+            dialog.add_response("ok", "OK, entendo")
+            
+            def on_response(d, res, *args):
+                if self.pw_manager.setup_initial_config():
+                    logger.info("Setup inicial concluído")
+                else:
+                    logger.error("Falha no setup inicial")
+                
+            dialog.choose(win, None, on_response)
+            
+        GLib.idle_add(show_dialog)
@@ -5,32 +5,175 @@ gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
 from gi.repository import Gtk, Adw, GLib, Gio
 from simplepipewireq.utils.constants import (
-    FREQUENCIES, APP_NAME, WINDOW_WIDTH, WINDOW_HEIGHT
+    FREQUENCIES, APP_NAME, WINDOW_WIDTH, WINDOW_HEIGHT, LIVE_UPDATE_HZ, EQ_NODE_NAME
 )
-from simplepipewireq.core.config_manager import ConfigManager
-from simplepipewireq.core.pipewire_manager import PipeWireManager
-from simplepipewireq.core.preset_manager import PresetManager
+from simplepipewireq.core.context import AppContext
 from simplepipewireq.ui.eq_slider import EQSlider
+from simplepipewireq.ui.preset_browser import PresetBrowser
+from simplepipewireq.ui.spectrum_view import SpectrumView
+from simplepipewireq.utils.profiling import startup_profiler
+from simplepipewireq.utils.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
 class MainWindow(Adw.ApplicationWindow):
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, context: AppContext = None, **kwargs):
         super().__init__(*args, **kwargs)
         
-        # Managers
-        self.config_manager = ConfigManager()
-        self.pipewire_manager = PipeWireManager()
-        self.preset_manager = PresetManager()
+        # Managers (compartilhados com a aplicação)
+        self.context = context or AppContext()
+        self.config_manager = self.context.config_manager
+        self.pipewire_manager = self.context.pipewire_manager
+        self.preset_manager = self.context.preset_manager
+        self.param_pusher = self.context.param_pusher
+        self.morpher = self.context.morpher
         
-        # Estado
-        self.gains = {freq: 0.0 for freq in FREQUENCIES}
+        # Estado (ganhos e histórico ficam no contexto e sobrevivem à janela)
         self.sliders = []
         self._reload_timer = None
+        self._syncing_sliders = False # True enquanto sliders são movidos pelo app
+        self._syncing_bypass = False
+        self._css_provider = None
+        self.current_preset = None
+        self.history = self.context.history
+        if self.history.current() is None:
+            self.history.push(self.gains)
+        
+        # Modo tempo real (aplica enquanto arrasta)
+        self.live_mode = self.config_manager.get_bool_setting("live_mode")
+        self._live_dirty = False      # Há ajuste ainda não enviado
+        self._live_tick_id = None     # Tick callback ativo no frame clock
+        self._live_last_frame = 0     # frame_time (µs) do último envio
+        self._live_failed_seen = 0    # Falhas do pusher já reportadas
+        
+        # Trabalho adiado para depois do primeiro frame desenhado
+        self._after_first_paint = [
+            self._start_isolated_instance, self.refresh_preset_list,
+            self._verify_restored_state, self._start_graph_services
+        ]
+        self._first_paint_handler = None
         
         self.setup_ui()
         self.apply_css()
-        self.refresh_preset_list()
+        # Janela recriada a partir do segundo plano: sliders no estado atual
+        self._sync_sliders(self.gains)
+        self._update_history_buttons()
+        
+        self.connect("map", self._on_map)
+        # Garantir que o último estado aplicado seja gravado ao fechar
+        self.connect("close-request", self.on_close_request)
+        startup_profiler.mark("window-built")
+
+    @property
+    def gains(self) -> dict:
+        return self.context.gains
+
+    @gains.setter
+    def gains(self, value: dict):
+        self.context.gains = value
+
+    # ==== INICIALIZAÇÃO ADIADA ====
+
+    def call_after_first_paint(self, callback):
+        """Agenda callback() para depois que a janela for desenhada pela primeira vez."""
+        if self._after_first_paint is None:
+            GLib.idle_add(callback)
+        else:
+            self._after_first_paint.append(callback)
+
+    def _start_isolated_instance(self):
+        """Modo isolado: adota ou inicia a instância, fora da thread da UI."""
+        if self.pipewire_manager.isolated_instance is not None:
+            threading.Thread(
+                target=self.pipewire_manager.start_isolated_instance, daemon=True
+            ).start()
+
+    def _on_map(self, widget):
+        frame_clock = self.get_frame_clock()
+        if frame_clock is None or self._after_first_paint is None:
+            return
+        self._first_paint_handler = frame_clock.connect("after-paint", self._on_first_paint)
+
+    def _on_first_paint(self, frame_clock):
+        frame_clock.disconnect(self._first_paint_handler)
+        self._first_paint_handler = None
+        startup_profiler.mark("first-paint")
+        callbacks, self._after_first_paint = self._after_first_paint, None
+        # Prioridade baixa: roda depois do frame, sem atrasar a exibição
+        GLib.idle_add(self._run_deferred_startup, callbacks, priority=GLib.PRIORITY_LOW)
+
+    def _run_deferred_startup(self, callbacks):
+        for callback in callbacks:
+            callback()
+        startup_profiler.mark("deferred-startup-done")
+        startup_profiler.report()
+        return False
+
+    def _verify_restored_state(self):
+        """
+        Confere o estado restaurado com a config ativa, sem tocar no PipeWire
+        se forem iguais. Só uma diferença real (config editada ou de outra
+        versão, app encerrado antes de aplicar) provoca um reload.
+        """
+        if not self.pipewire_manager.is_configured():
+            return  # Primeira execução: o setup inicial cria a config
+        offsets = self.context.restored_gain_offsets()
+        if self.pipewire_manager.matches_active_config(self.gains, offsets):
+            logger.info("Estado restaurado confere com a config ativa")
+            self.history.set_current_hash(self.pipewire_manager.last_config_hash)
+            return
+        logger.info("Config ativa difere do estado salvo, reaplicando")
+        self.update_status("Config ativa diferente do último estado salvo - reaplicando")
+        self._do_reload(record_history=False)
+
+    def _start_graph_services(self):
+        watchdog = self.context.watchdog
+        watchdog.add_listener(self._on_watchdog_recovery)
+        watchdog.start()
+        switcher = self.context.device_switcher
+        switcher.add_listener(self._on_device_switch)
+        switcher.start()
+        if self.config_manager.get_bool_setting("loudness_mode"):
+            self.context.loudness.start()
+        if self.config_manager.get_setting("midi_port"):
+            midi = self.context.midi
+            midi.add_listener(self._on_midi_input)
+            midi.start()
+
+    def _on_watchdog_recovery(self, elapsed_ms, ok):
+        """Chamado pelo watchdog (thread própria) após restaurar o EQ."""
+        if ok:
+            message = f"PipeWire reiniciado: equalizador restaurado em {elapsed_ms:.0f} ms"
+        else:
+            message = "PipeWire reiniciado: falha ao restaurar o equalizador - clique 'Aplicar EQ'"
+        GLib.idle_add(self.update_status, message)
+
+    def _on_midi_input(self, changes, settled):
+        """Chamado pela entrada MIDI (thread própria), já com taxa limitada."""
+        GLib.idle_add(self._finish_midi_input, settled)
+
+    def _finish_midi_input(self, settled):
+        # Os sliders espelham os faders sem disparar um novo envio
+        self._sync_sliders(self.gains)
+        if settled:
+            self._record_history()
+        return False
+
+    def _on_device_switch(self, sink, preset_name, gains, ok):
+        """Chamado pela troca automática de preset (thread própria)."""
+        GLib.idle_add(self._finish_device_switch, sink, preset_name, gains, ok)
+
+    def _finish_device_switch(self, sink, preset_name, gains, ok):
+        if not ok:
+            self.update_status(f"Falha ao aplicar '{preset_name}' para a nova saída de áudio")
+            return False
+        self.morpher.cancel()
+        self.gains = dict(gains)
+        self._sync_sliders(self.gains)
+        self._record_history()
+        self._set_current_preset(preset_name)
+        self.update_status(f"Saída de áudio mudou: preset '{preset_name}' aplicado")
+        return False
 
     def setup_ui(self):
         self.set_title(APP_NAME)
@@ -47,6 +190,55 @@ class MainWindow(Adw.ApplicationWindow):
         header = Adw.HeaderBar()
         toolbar_view.add_top_bar(header)
         
+        # Desfazer / Refazer
+        self.btn_undo = Gtk.Button(icon_name="edit-undo-symbolic", tooltip_text="Desfazer (Ctrl+Z)")
+        self.btn_undo.connect("clicked", lambda b: self.on_undo())
+        self.btn_redo = Gtk.Button(icon_name="edit-redo-symbolic", tooltip_text="Refazer (Ctrl+Shift+Z)")
+        self.btn_redo.connect("clicked", lambda b: self.on_redo())
+        header.pack_start(self.btn_undo)
+        header.pack_start(self.btn_redo)
+        
+        # A/B: alterna entre o som com e sem equalização
+        self.btn_bypass = Gtk.ToggleButton(label="A/B", tooltip_text="Ouvir sem equalização (Ctrl+B)")
+        self.btn_bypass.set_active(self.context.is_built("bypass") and self.context.bypass.is_bypassed())
+        self.btn_bypass.connect("toggled", self.on_bypass_toggled)
+        header.pack_start(self.btn_bypass)
+        
+        shortcuts = Gtk.ShortcutController()
+        shortcuts.set_scope(Gtk.ShortcutScope.GLOBAL)
+        shortcuts.add_shortcut(Gtk.Shortcut(
+            trigger=Gtk.ShortcutTrigger.parse_string("<Control>z"),
+            action=Gtk.CallbackAction.new(lambda *args: self.on_undo())
+        ))
+        shortcuts.add_shortcut(Gtk.Shortcut(
+            trigger=Gtk.ShortcutTrigger.parse_string("<Control><Shift>z"),
+            action=Gtk.CallbackAction.new(lambda *args: self.on_redo())
+        ))
+        shortcuts.add_shortcut(Gtk.Shortcut(
+            trigger=Gtk.ShortcutTrigger.parse_string("<Control>b"),
+            action=Gtk.CallbackAction.new(lambda *args: self.btn_bypass.activate() or True)
+        ))
+        self.add_controller(shortcuts)
+        
+        # Menu principal (itens são ações da aplicação)
+        menu = Gio.Menu()
+        menu.append("Compensação de loudness", "app.loudness")
+        menu.append("Modo preciso (corrigir interação entre bandas)", "app.accurate-mode")
+        menu.append("Manter em segundo plano ao fechar", "app.background-mode")
+        menu.append("Sair", "app.quit")
+        menu_button = Gtk.MenuButton(icon_name="open-menu-symbolic", menu_model=menu)
+        menu_button.set_tooltip_text("Menu principal")
+        header.pack_end(menu_button)
+        
+        # Modo tempo real
+        live_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
+        live_box.append(Gtk.Label(label="Tempo real"))
+        self.live_switch = Gtk.Switch(active=self.live_mode, valign=Gtk.Align.CENTER)
+        self.live_switch.set_tooltip_text("Aplica os ajustes enquanto os sliders são arrastados")
+        self.live_switch.connect("notify::active", self.on_live_mode_toggled)
+        live_box.append(self.live_switch)
+        header.pack_end(live_box)
+        
         self.set_content(toolbar_view)
         
         # Main Layout (dentro do ToolbarView)
@@ -61,15 +253,21 @@ class MainWindow(Adw.ApplicationWindow):
         preset_box.set_margin_bottom(15)
         preset_box.add_css_class("card")
         
-        # Preset Dropdown (StringList)
-        self.preset_model = Gtk.StringList()
-        self.preset_dropdown = Gtk.DropDown(model=self.preset_model)
-        self.preset_dropdown.set_hexpand(True)
-        self.preset_dropdown.connect("notify::selected", self.on_load_preset)
+        # Navegador de presets (lista virtualizada com busca, em um popover)
+        self.preset_browser = PresetBrowser(self.preset_manager.get_preset_gains)
+        self.preset_browser.connect_preset_activated(self.on_load_preset)
+        preset_popover = Gtk.Popover()
+        preset_popover.set_child(self.preset_browser)
+        preset_popover.connect("show", lambda p: self.preset_browser.search_entry.grab_focus())
+        preset_popover.connect("closed", lambda p: self.preset_browser.reset_search())
+        
+        self.preset_button = Gtk.MenuButton(label="Escolher preset", popover=preset_popover)
+        self.preset_button.set_hexpand(True)
+        self.preset_button.set_always_show_arrow(True)
         
         preset_label = Gtk.Label(label="Preset:")
         preset_box.append(preset_label)
-        preset_box.append(self.preset_dropdown)
+        preset_box.append(self.preset_button)
         
         # Action Buttons
         btn_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
@@ -98,6 +296,26 @@ class MainWindow(Adw.ApplicationWindow):
         
         root_box.append(preset_box)
         
+        # Analisador de espectro (oculto por padrão; sem custo enquanto oculto)
+        self.spectrum_view = SpectrumView(
+            lambda: self.context.graph_monitor.output_sink_name(exclude=EQ_NODE_NAME),
+            show_input=self.config_manager.get_bool_setting("spectrum_show_input")
+        )
+        self.spectrum_view.set_margin_start(20)
+        self.spectrum_view.set_margin_end(20)
+        self.spectrum_view.set_visible(False)
+        root_box.append(self.spectrum_view)
+        
+        if SpectrumView.is_available():
+            btn_spectrum = Gtk.ToggleButton(icon_name="utilities-system-monitor-symbolic")
+            btn_spectrum.set_tooltip_text("Mostrar espectro")
+            btn_spectrum.connect("toggled", self.on_spectrum_toggled)
+            header.pack_end(btn_spectrum)
+        
+        # Pausar o analisador quando a janela for minimizada (GTK >= 4.12)
+        if self.find_property("suspended") is not None:
+            self.connect("notify::suspended", lambda w, p: self.spectrum_view.set_suspended(self.get_property("suspended")))
+        
         # Equalizer Sliders Container
         scroll = Gtk.ScrolledWindow()
         scroll.set_vexpand(True)
@@ -114,6 +332,8 @@ class MainWindow(Adw.ApplicationWindow):
             slider = EQSlider(freq)
             # Atualiza ganhos internos e agenda reload com debounce
             slider.connect_value_changed(lambda s, val, idx=i: self.on_slider_changed(s, idx))
+            # Fim do arraste: envio final exato e ponto no histórico de desfazer
+            slider.connect_input_finished(lambda s, val: self.on_slider_input_finished())
             self.sliders.append(slider)
             self.slider_grid.append(slider)
             
@@ -135,7 +355,7 @@ class MainWindow(Adw.ApplicationWindow):
         root_box.append(self.status_bar)
 
     def apply_css(self):
-        css_provider = Gtk.CssProvider()
+        css_provider = self._css_provider = Gtk.CssProvider()
         css = """
             .gain-positive { color: #2ec27e; }
             .gain-negative { color: #3584e4; }
@@ -152,21 +372,153 @@ class MainWindow(Adw.ApplicationWindow):
 
     def on_slider_changed(self, slider, band_index):
         """Atualiza ganhos internos sem recarregar PipeWire."""
+        if self._syncing_sliders:
+            return
+        # Movimento manual interrompe uma transição de preset em andamento
+        self.morpher.cancel()
         value = slider.get_value()
         freq = FREQUENCIES[band_index]
-        self.gains[freq] = value
-        self.update_status("Ajuste pendente - clique 'Aplicar EQ' para ativar")
+        # A entrada MIDI altera os mesmos ganhos de outra thread
+        self.context.update_gains({freq: value})
+        if self.live_mode:
+            self._schedule_live_update()
+        else:
+            self.update_status("Ajuste pendente - clique 'Aplicar EQ' para ativar")
+
+    def on_slider_input_finished(self):
+        """Fim do arraste de um slider."""
+        if self.live_mode:
+            self._flush_live_update()
+        self._record_history()
+
+    def on_spectrum_toggled(self, button):
+        enabled = button.get_active()
+        self.spectrum_view.set_visible(enabled)
+        self.spectrum_view.set_enabled(enabled)
+
+    # ==== A/B ====
+
+    def on_bypass_toggled(self, button):
+        if self._syncing_bypass:
+            return
+        bypassed = button.get_active()
+        # pw-metadata leva poucos ms, mas não roda na thread da UI
+        threading.Thread(target=self._set_bypass_async, args=(bypassed,), daemon=True).start()
+
+    def _set_bypass_async(self, bypassed):
+        bypass = self.context.bypass
+        ok = bypass.set_bypassed(bypassed)
+        GLib.idle_add(self._finish_bypass, bypassed, ok, bypass.last_switch_ms)
+
+    def _finish_bypass(self, bypassed, ok, elapsed_ms):
+        if not ok:
+            self._syncing_bypass = True
+            self.btn_bypass.set_active(not bypassed)
+            self._syncing_bypass = False
+            self.update_status("A/B indisponível: o equalizador precisa estar ativo no PipeWire")
+        elif bypassed:
+            self.update_status(f"B: sem equalização ({elapsed_ms:.0f} ms)")
+        else:
+            self.update_status(f"A: com equalização ({elapsed_ms:.0f} ms)")
+        return False
+
+    # ==== MODO TEMPO REAL ====
+
+    def on_live_mode_toggled(self, switch, param):
+        self.live_mode = switch.get_active()
+        self.config_manager.set_setting("live_mode", self.live_mode)
+        if self.live_mode:
+            self.update_status("Tempo real ativado: ajustes são aplicados ao arrastar")
+            self._schedule_live_update()
+        else:
+            self._stop_live_ticks()
+            self.update_status("Tempo real desativado")
+
+    def _schedule_live_update(self):
+        """Marca ajuste pendente e liga o tick do frame clock, se necessário."""
+        self._live_dirty = True
+        if self._live_tick_id is None:
+            self._live_tick_id = self.add_tick_callback(self._on_live_tick)
+
+    def _stop_live_ticks(self):
+        if self._live_tick_id is not None:
+            self.remove_tick_callback(self._live_tick_id)
+            self._live_tick_id = None
+
+    def _on_live_tick(self, widget, frame_clock):
+        """
+        Chamado a cada frame enquanto há ajuste pendente. Envia no máximo
+        LIVE_UPDATE_HZ vezes por segundo, alinhado ao frame clock.
+        """
+        if not self._live_dirty:
+            # Nada pendente: desliga o tick para não manter o frame clock ativo
+            self._live_tick_id = None
+            return GLib.SOURCE_REMOVE
+        
+        frame_time = frame_clock.get_frame_time()
+        if frame_time - self._live_last_frame < 1_000_000 // LIVE_UPDATE_HZ:
+            return GLib.SOURCE_CONTINUE
+        
+        self._live_last_frame = frame_time
+        self._live_dirty = False
+        # Não bloqueia: o pusher guarda só o estado mais recente e envia
+        # apenas as bandas que mudaram desde o último envio
+        self.param_pusher.submit(self.gains)
+        return GLib.SOURCE_CONTINUE
+
+    def _flush_live_update(self):
+        """Envio final exato ao soltar o slider, e persistência do estado."""
+        self._live_dirty = False
+        self._stop_live_ticks()
+        gains = dict(self.gains)
+        self.param_pusher.submit(gains)
+        self.config_manager.schedule_write("temp.conf", gains)
+        # Config em disco acompanha o que está tocando (sem reload, fora da UI)
+        threading.Thread(
+            target=self._persist_live_state, args=(gains,), daemon=True
+        ).start()
+
+    def _persist_live_state(self, gains):
+        if not self.param_pusher.wait_idle(timeout=2.0):
+            return
+        if self.param_pusher.stats()["failed"] > self._live_failed_seen:
+            self._live_failed_seen = self.param_pusher.stats()["failed"]
+            GLib.idle_add(self.update_status, "Tempo real: nó do equalizador indisponível - clique 'Aplicar EQ'")
+            return
+        self.pipewire_manager.generate_pipewire_config(gains)
+        stats = self.param_pusher.stats()
+        GLib.idle_add(
+            self.update_status,
+            f"Aplicado em tempo real ({stats['pushed']} atualizações, {stats['rate_hz']:.0f} Hz)"
+        )
+
+    def _sync_sliders(self, gains):
+        """Move os sliders para os ganhos dados sem disparar ajustes manuais."""
+        self._syncing_sliders = True
+        try:
+            for i, slider in enumerate(self.sliders):
+                slider.set_value(gains.get(FREQUENCIES[i], 0.0))
+        finally:
+            self._syncing_sliders = False
+        return False # Para uso com GLib.idle_add
 
     def on_apply_eq(self, button):
         """Aplica os ajustes de EQ ao PipeWire (usa hot-reload)."""
         self._do_reload()
 
-    def _do_reload(self):
-        print(f"DEBUG: Aplicando configuração de equalizador...")
+    def _do_reload(self, record_history=True):
+        logger.debug("Aplicando configuração de equalizador...")
         self._reload_timer = None
         
+        if record_history:
+            self._record_history()
+        
         # Salvar config temporária para persistência entre sessões do app
-        self.config_manager.write_config("temp.conf", self.gains)
+        # (gravada em background, sem I/O de disco na thread da UI)
+        self.config_manager.schedule_write("temp.conf", self.gains)
+        
+        # O reload pode recriar o nó: o próximo envio ao vivo deve ser completo
+        self.param_pusher.forget_last_pushed()
         
         # Hot-reload em thread para não travar a UI
         self.update_status("Aplicando ajustes...")
@@ -175,45 +527,88 @@ class MainWindow(Adw.ApplicationWindow):
         return False # Cancela o timeout do GLib
 
     def _hot_reload_async(self):
-        """Executa hot-reload dinâmico em background."""
-        success = self.pipewire_manager.hot_reload_dynamic(self.gains)
-        if success:
-            GLib.idle_add(self.update_status, "Equalizador aplicado (hot-reload dinâmico)")
-            print("DEBUG: Hot-reload dinâmico concluído com sucesso.")
-        else:
-            GLib.idle_add(self.update_status, "Falha no hot-reload dinâmico, tentando fallback...")
-            print("DEBUG: Hot-reload dinâmico falhou, usando fallback...")
-            # Fallback para reload completo
-            if self.pipewire_manager.reload_config():
-                GLib.idle_add(self.update_status, "Equalizador aplicado (fallback)")
+        """
+        Aplica em background, sob um prazo único, pela ação mínima que o
+        reconciliador escolher (nada, envio ao vivo, reload do módulo ou
+        restart).
+        """
+        pipewire_manager = self.pipewire_manager
+        with tracer.apply("apply") as root, pipewire_manager.apply_scope(owner="ui") as deadline:
+            success = self.context.reconciler.apply(self.gains)
+            if success:
+                logger.debug("Apply concluído com sucesso.")
+                root.set(ok=True)
+            elif deadline.reason == "substituído":
+                # Um Apply mais novo do usuário assumiu; ele atualiza o status
+                root.set(strategy="substituído", ok=False)
+                return
+            elif pipewire_manager.last_config_error:
+                # Config inválida: reiniciar o PipeWire não resolveria
+                root.set(strategy="rejeitada", ok=False)
+                GLib.idle_add(self.update_status, f"Config rejeitada: {pipewire_manager.last_config_error}")
+                return
+            elif deadline.expired():
+                root.set(strategy=deadline.reason, ok=False)
+                GLib.idle_add(
+                    self.update_status,
+                    f"Apply interrompido ({deadline.reason}): última config boa mantida"
+                )
+                return
             else:
-                GLib.idle_add(self.update_status, "Falha ao aplicar equalizador")
+                # O reconciliador já subiu até o restart: não há outro degrau
+                action = root.attrs.get("action", "?")
+                reasons = "; ".join(root.attrs.get("reasons") or []) or "sem detalhes"
+                root.set(strategy=action, ok=False)
+                GLib.idle_add(self.update_status, f"Falha ao aplicar ({action}): {reasons}")
+                return
+        GLib.idle_add(self.update_status, f"Equalizador {tracer.summary(root.span_id)}")
 
-    def on_load_preset(self, dropdown, param):
-        selected_idx = dropdown.get_selected()
-        if selected_idx == Gtk.INVALID_LIST_POSITION:
-            return
-            
-        preset_name = self.preset_model.get_string(selected_idx)
+    def on_load_preset(self, browser, preset_name):
+        self.preset_button.popdown()
         if not preset_name:
             return
+        self._set_current_preset(preset_name)
 
         self.update_status(f"Carregando preset: {preset_name}")
         
-        # Carregar ganhos
-        new_gains = self.preset_manager.get_preset_gains(preset_name)
-        if not new_gains:
+        # Carregar ganhos do artefato pré-compilado (sem reparsear o preset)
+        artifact = self.preset_manager.get_preset_artifact(preset_name)
+        if not artifact:
             return
-            
-        self.gains.update(new_gains)
+        key, target = artifact
         
-        # Atualizar sliders
-        for i, slider in enumerate(self.sliders):
-            freq = FREQUENCIES[i]
-            slider.set_value(self.gains.get(freq, 0.0))
-            
-        # Forçar reload
-        self._do_reload()
+        # Transição suave direto no nó em execução; reload só se falhar
+        self.morpher.start(
+            self.gains, target,
+            on_step=lambda gains: GLib.idle_add(self._sync_sliders, gains),
+            on_done=lambda result: self._on_morph_done(preset_name, key, target, result)
+        )
+
+    def _on_morph_done(self, preset_name, key, target, result):
+        """Chamado na thread do agendador ao fim da transição de preset."""
+        if result.cancelled:
+            return
+        if result.succeeded:
+            # Manter o arquivo em disco igual ao que está tocando, sem reload:
+            # swap atômico para a config pré-compilada do preset
+            if not self.preset_manager.config_cache.activate(key):
+                self.pipewire_manager.generate_pipewire_config(target)
+        GLib.idle_add(self._finish_preset_load, preset_name, target, result)
+
+    def _finish_preset_load(self, preset_name, target, result):
+        self.gains = dict(target)
+        self._sync_sliders(self.gains)
+        if result.succeeded:
+            self.config_manager.schedule_write("temp.conf", self.gains)
+            self._record_history()
+            self.update_status(
+                f"Preset '{preset_name}' aplicado em {result.elapsed:.1f} s "
+                f"({result.pushed} passos, {result.achieved_rate_hz:.0f} Hz)"
+            )
+        else:
+            # Nó não disponível para atualização ao vivo: reload completo
+            self._do_reload()
+        return False
 
     def on_save_preset(self, button):
         # Usando Adw.AlertDialog (moderno)
@@ -234,12 +629,14 @@ class MainWindow(Adw.ApplicationWindow):
         
         def on_response(d, result):
             response = d.choose_finish(result)
-            print(f"DEBUG: Resposta do diálogo de salvamento: {response}")
+            logger.debug(f"Resposta do diálogo de salvamento: {response}")
             if response == "save":
                 name = self.preset_entry.get_text().strip()
-                print(f"DEBUG: Tentando salvar preset '{name}'")
+                logger.debug(f"Tentando salvar preset '{name}'")
                 if self.preset_manager.save_preset(name, self.gains):
+                    self.preset_browser.invalidate(name)
                     self.refresh_preset_list()
+                    self._set_current_preset(name)
                     self.update_status(f"Preset '{name}' salvo")
                 else:
                     self.update_status("Erro ao salvar preset (nome inválido?)")
@@ -247,11 +644,10 @@ class MainWindow(Adw.ApplicationWindow):
         dialog.choose(self, None, on_response)
 
     def on_delete_preset(self, button):
-        selected_idx = self.preset_dropdown.get_selected()
-        if selected_idx == Gtk.INVALID_LIST_POSITION:
+        name = self.current_preset
+        if not name:
+            self.update_status("Nenhum preset selecionado")
             return
-            
-        name = self.preset_model.get_string(selected_idx)
         
         dialog = Adw.AlertDialog(
             heading="Deletar Preset?",
@@ -265,12 +661,16 @@ class MainWindow(Adw.ApplicationWindow):
             response = d.choose_finish(result)
             if response == "delete":
                 if self.preset_manager.delete_preset(name):
+                    self.preset_browser.invalidate(name)
                     self.refresh_preset_list()
+                    if self.current_preset == name:
+                        self._set_current_preset(None)
                     self.update_status(f"Preset '{name}' deletado")
             
         dialog.choose(self, None, on_response)
 
     def on_reset(self, button):
+        self.morpher.cancel()
         for slider in self.sliders:
             slider.set_value(0.0)
         self.gains = {freq: 0.0 for freq in FREQUENCIES}
@@ -278,13 +678,86 @@ class MainWindow(Adw.ApplicationWindow):
         self._do_reload()
 
     def refresh_preset_list(self):
-        presets = self.preset_manager.list_presets()
-        # Limpar modelo
-        while self.preset_model.get_n_items() > 0:
-            self.preset_model.remove(0)
-            
-        for p in presets:
-            self.preset_model.append(p)
+        self.preset_browser.set_presets(self.preset_manager.list_presets())
+
+    def _set_current_preset(self, name):
+        self.current_preset = name
+        self.preset_button.set_label(name or "Escolher preset")
+
+    # ==== DESFAZER / REFAZER ====
+
+    def _record_history(self):
+        """Registra o estado atual no histórico, com o hash da config renderizada."""
+        # Renderizar é só formatação de texto (sem I/O); o resultado fica em cache
+        config_hash, _ = self.pipewire_manager.render_pipewire_config_cached(self.gains)
+        self.history.push(self.gains, config_hash)
+        self._update_history_buttons()
+
+    def _update_history_buttons(self):
+        self.btn_undo.set_sensitive(self.history.can_undo())
+        self.btn_redo.set_sensitive(self.history.can_redo())
+
+    def on_undo(self):
+        self._record_history() # Não perder ajustes ainda não registrados
+        entry = self.history.undo()
+        if entry:
+            self._revert_to(*entry, label="Desfeito")
+        return True
+
+    def on_redo(self):
+        entry = self.history.redo()
+        if entry:
+            self._revert_to(*entry, label="Refeito")
+        return True
+
+    def _revert_to(self, gains, config_hash, label):
+        """Restaura um estado do histórico direto no nó em execução."""
+        self.morpher.cancel()
+        self.gains = dict(gains)
+        self._sync_sliders(self.gains)
+        self._update_history_buttons()
+        self.update_status(f"{label}: aplicando...")
+        thread = threading.Thread(target=self._revert_async, args=(dict(gains), config_hash, label))
+        thread.start()
+
+    def _revert_async(self, gains, config_hash, label):
+        failed_before = self.param_pusher.stats()["failed"]
+        self.param_pusher.submit(gains)
+        self.param_pusher.wait_idle(timeout=2.0)
+        
+        if self.param_pusher.stats()["failed"] == failed_before:
+            # Reutiliza a config já renderizada para este estado (sem regenerar)
+            self.pipewire_manager.generate_pipewire_config(gains, config_hash=config_hash)
+            self.config_manager.schedule_write("temp.conf", gains)
+            GLib.idle_add(self.update_status, label)
+        else:
+            # Nó indisponível para atualização ao vivo: reload sem novo ponto no histórico
+            GLib.idle_add(self._do_reload, False)
 
     def update_status(self, message):
         self.status_bar.set_text(message)
+
+    def on_close_request(self, window):
+        """
+        Solta tudo que prende a janela antes de ela ser destruída.
+
+        Os managers do contexto continuam ativos: a aplicação decide se
+        encerra (shutdown do contexto) ou segue em segundo plano.
+        """
+        if self._live_dirty:
+            self._flush_live_update()
+        self._stop_live_ticks()
+        self.spectrum_view.shutdown()
+        self.preset_browser.shutdown()
+        # Callbacks da transição e dos workers referenciam a janela
+        self.morpher.cancel()
+        if self.context.is_built("watchdog"):
+            self.context.watchdog.remove_listener(self._on_watchdog_recovery)
+        if self.context.is_built("device_switcher"):
+            self.context.device_switcher.remove_listener(self._on_device_switch)
+        if self.context.is_built("midi"):
+            self.context.midi.remove_listener(self._on_midi_input)
+        if self._css_provider is not None:
+            Gtk.StyleContext.remove_provider_for_display(self.get_display(), self._css_provider)
+            self._css_provider = None
+        return False # Permite o fechamento
@@ -0,0 +1,238 @@
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import gi
+gi.require_version('Gtk', '4.0')
+from gi.repository import Gtk, GLib, GObject, Pango
+from simplepipewireq.core.response import curve_response, log_frequencies
+from simplepipewireq.utils.constants import (
+    MAX_GAIN, PRESET_THUMBNAIL_POINTS, PRESET_THUMBNAIL_WIDTH, PRESET_THUMBNAIL_HEIGHT,
+    PRESET_THUMBNAIL_CACHE_SIZE, PRESET_THUMBNAIL_WORKERS
+)
+
+logger = logging.getLogger(__name__)
+
+# Faixa vertical da miniatura (dB); bandas vizinhas somadas passam de MAX_GAIN
+_THUMBNAIL_RANGE_DB = MAX_GAIN * 1.5
+
+
+class PresetBrowser(Gtk.Box):
+    """
+    Lista pesquisável de presets com miniatura da curva de cada um.
+
+    A lista é virtualizada (Gtk.ListView): só existem widgets para as linhas
+    visíveis, reaproveitados na rolagem, então milhares de presets custam o
+    mesmo que uma dúzia. O modelo é trocado de uma vez (um único splice) e o
+    filtro roda de forma incremental enquanto se digita.
+
+    As miniaturas são calculadas sob demanda, apenas para linhas que
+    aparecem, em um pool de threads; o resultado fica em um cache LRU e a
+    linha é redesenhada na thread principal quando fica pronto.
+    """
+
+    __gsignals__ = {
+        'preset-activated': (GObject.SignalFlags.RUN_FIRST, None, (str,)),
+    }
+
+    def __init__(self, gains_loader):
+        """
+        Args:
+            gains_loader: Função nome -> {freq: gain}, chamada nas threads do pool
+        """
+        super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=6)
+        self._gains_loader = gains_loader
+        self._frequencies = log_frequencies(PRESET_THUMBNAIL_POINTS)
+        self._thumbnails = OrderedDict()  # nome -> [dB por ponto] ou None (falhou)
+        self._pending = set()
+        self._bound = {}                  # nome -> miniaturas exibindo o preset
+        self._generation = 0              # Resultados de antes de um invalidate() são descartados
+        self._executor = None
+
+        self.search_entry = Gtk.SearchEntry()
+        self.search_entry.set_placeholder_text("Buscar preset")
+        self.search_entry.connect("search-changed", self._on_search_changed)
+        self.search_entry.connect("activate", self._on_search_activate)
+        self.append(self.search_entry)
+
+        self.model = Gtk.StringList()
+        self.filter = Gtk.StringFilter(
+            expression=Gtk.PropertyExpression.new(Gtk.StringObject, None, "string"),
+            ignore_case=True,
+            match_mode=Gtk.StringFilterMatchMode.SUBSTRING,
+        )
+        self.filter_model = Gtk.FilterListModel(model=self.model, filter=self.filter)
+        self.filter_model.set_incremental(True)
+        self.selection = Gtk.SingleSelection(model=self.filter_model)
+        self.selection.set_autoselect(False)
+        self.selection.set_can_unselect(True)
+
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self._on_setup)
+        factory.connect("bind", self._on_bind)
+        factory.connect("unbind", self._on_unbind)
+
+        self.list_view = Gtk.ListView(model=self.selection, factory=factory)
+        self.list_view.set_single_click_activate(True)
+        self.list_view.connect("activate", self._on_activate)
+
+        scroll = Gtk.ScrolledWindow()
+        scroll.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
+        scroll.set_min_content_height(320)
+        scroll.set_min_content_width(280)
+        scroll.set_vexpand(True)
+        scroll.set_child(self.list_view)
+        self.append(scroll)
+
+    # ==== MODELO ====
+
+    def set_presets(self, names: list) -> None:
+        """Troca a lista inteira em uma única operação (um só items-changed)."""
+        self.model.splice(0, self.model.get_n_items(), names)
+
+    def invalidate(self, name: str = None) -> None:
+        """Descarta a miniatura de `name` (ou todas) após salvar ou deletar."""
+        self._generation += 1
+        if name is None:
+            self._thumbnails.clear()
+        else:
+            self._thumbnails.pop(name, None)
+        self._pending.clear()
+        for bound_name, areas in self._bound.items():
+            if name is None or bound_name == name:
+                self._request(bound_name)
+                for area in areas:
+                    area.queue_draw()
+
+    def reset_search(self) -> None:
+        self.search_entry.set_text("")
+        self.selection.set_selected(Gtk.INVALID_LIST_POSITION)
+
+    def shutdown(self) -> None:
+        """Cancela os cálculos pendentes e encerra o pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._pending.clear()
+
+    def connect_preset_activated(self, callback):
+        """Helper para conectar o sinal de preset escolhido."""
+        self.connect('preset-activated', lambda widget, name: callback(widget, name))
+
+    # ==== BUSCA E ATIVAÇÃO ====
+
+    def _on_search_changed(self, entry):
+        self.filter.set_search(entry.get_text())
+
+    def _on_search_activate(self, entry):
+        # Enter na busca escolhe o primeiro resultado
+        if self.filter_model.get_n_items() > 0:
+            self._on_activate(self.list_view, 0)
+
+    def _on_activate(self, list_view, position):
+        item = self.filter_model.get_item(position)
+        if item is not None:
+            self.emit('preset-activated', item.get_string())
+
+    # ==== LINHAS (FACTORY) ====
+
+    def _on_setup(self, factory, list_item):
+        row = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        thumbnail = Gtk.DrawingArea()
+        thumbnail.set_content_width(PRESET_THUMBNAIL_WIDTH)
+        thumbnail.set_content_height(PRESET_THUMBNAIL_HEIGHT)
+        thumbnail.set_draw_func(self._on_draw_thumbnail)
+        thumbnail.preset_name = None
+        label = Gtk.Label(xalign=0)
+        label.set_hexpand(True)
+        label.set_ellipsize(Pango.EllipsizeMode.END)
+        row.append(thumbnail)
+        row.append(label)
+        list_item.set_child(row)
+
+    def _on_bind(self, factory, list_item):
+        name = list_item.get_item().get_string()
+        row = list_item.get_child()
+        thumbnail = row.get_first_child()
+        row.get_last_child().set_text(name)
+        thumbnail.preset_name = name
+        self._bound.setdefault(name, set()).add(thumbnail)
+        if name not in self._thumbnails:
+            self._request(name)
+        thumbnail.queue_draw()
+
+    def _on_unbind(self, factory, list_item):
+        thumbnail = list_item.get_child().get_first_child()
+        name = thumbnail.preset_name
+        areas = self._bound.get(name)
+        if areas is not None:
+            areas.discard(thumbnail)
+            if not areas:
+                del self._bound[name]
+        thumbnail.preset_name = None
+
+    # ==== MINIATURAS ====
+
+    def _request(self, name: str) -> None:
+        if name in self._pending:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=PRESET_THUMBNAIL_WORKERS, thread_name_prefix="simplepipewireq-thumb"
+            )
+        self._pending.add(name)
+        self._executor.submit(self._render, name, self._generation)
+
+    def _render(self, name: str, generation: int) -> None:
+        """Roda no pool: lê o preset e calcula a curva."""
+        if name not in self._bound:
+            # A linha saiu da tela antes da vez dela (rolagem rápida)
+            GLib.idle_add(self._store_thumbnail, name, generation, None, False)
+            return
+        try:
+            points = curve_response(self._gains_loader(name), self._frequencies)
+        except Exception as e:
+            logger.debug(f"Miniatura de '{name}' indisponível: {e}")
+            points = None
+        GLib.idle_add(self._store_thumbnail, name, generation, points, True)
+
+    def _store_thumbnail(self, name, generation, points, done):
+        if generation != self._generation:
+            return False  # invalidate() já pediu de novo
+        self._pending.discard(name)
+        if not done:
+            return False
+        self._thumbnails[name] = points
+        self._thumbnails.move_to_end(name)
+        while len(self._thumbnails) > PRESET_THUMBNAIL_CACHE_SIZE:
+            self._thumbnails.popitem(last=False)
+        for area in self._bound.get(name, ()):
+            area.queue_draw()
+        return False
+
+    def _on_draw_thumbnail(self, area, cr, width, height):
+        cr.set_source_rgba(1, 1, 1, 0.03)
+        cr.rectangle(0, 0, width, height)
+        cr.fill()
+
+        mid = height / 2.0
+        cr.set_source_rgba(0.6, 0.6, 0.6, 0.35)
+        cr.set_line_width(1.0)
+        cr.move_to(0, mid)
+        cr.line_to(width, mid)
+        cr.stroke()
+
+        points = self._thumbnails.get(area.preset_name)
+        if not points:
+            return
+        self._thumbnails.move_to_end(area.preset_name)
+        scale = (mid - 1.5) / _THUMBNAIL_RANGE_DB
+        step = width / (len(points) - 1)
+        cr.set_source_rgba(0.21, 0.52, 0.89, 0.95)
+        cr.set_line_width(1.5)
+        for i, value in enumerate(points):
+            value = max(-_THUMBNAIL_RANGE_DB, min(_THUMBNAIL_RANGE_DB, value))
+            if i == 0:
+                cr.move_to(0, mid - value * scale)
+            else:
+                cr.line_to(i * step, mid - value * scale)
+        cr.stroke()
@@ -0,0 +1,136 @@
+import math
+import gi
+gi.require_version('Gtk', '4.0')
+from gi.repository import Gtk, GLib
+from simplepipewireq.core import spectrum_analyzer
+from simplepipewireq.utils.constants import (
+    EQ_NODE_NAME, SPECTRUM_BINS, SPECTRUM_FPS,
+    SPECTRUM_FLOOR_DB, SPECTRUM_MIN_FREQ, SPECTRUM_MAX_FREQ
+)
+
+# Faixa vertical exibida (dB)
+_TOP_DB = 0.0
+
+class SpectrumView(Gtk.DrawingArea):
+    """
+    Exibe o espectro da saída do equalizador (e opcionalmente da entrada).
+
+    O redesenho roda a SPECTRUM_FPS apenas enquanto o widget está visível
+    e ativo; ao ser ocultado (ou a janela minimizada) os analisadores são
+    pausados e o timer removido, sem custo de CPU.
+    """
+
+    def __init__(self, output_sink, show_input: bool = False):
+        """
+        Args:
+            output_sink: Callable que retorna o node.name do sink para onde o
+                         EQ envia o áudio; o monitor dele é o sinal equalizado
+            show_input: Também mostra o espectro antes da equalização
+        """
+        super().__init__()
+        self.set_content_height(120)
+        self.set_hexpand(True)
+        self.set_draw_func(self._on_draw)
+
+        # Monitor do sink de saída = áudio depois da equalização (o stream de
+        # playback do filter-chain não é um alvo de captura)
+        self.output_analyzer = spectrum_analyzer.create_analyzer(output_sink, capture_sink=True)
+        self.input_analyzer = None
+        if show_input and self.output_analyzer is not None:
+            # Monitor do sink do EQ = áudio antes da equalização
+            self.input_analyzer = spectrum_analyzer.create_analyzer(EQ_NODE_NAME, capture_sink=True)
+
+        # Buffers de leitura pré-alocados (reutilizados a cada quadro)
+        self._output_bins = None
+        self._input_bins = None
+        self._x_positions = []
+        if self.output_analyzer is not None:
+            import numpy as np
+            self._output_bins = np.full(SPECTRUM_BINS, SPECTRUM_FLOOR_DB, dtype=np.float32)
+            self._input_bins = np.full(SPECTRUM_BINS, SPECTRUM_FLOOR_DB, dtype=np.float32)
+            log_min = math.log10(SPECTRUM_MIN_FREQ)
+            log_span = math.log10(SPECTRUM_MAX_FREQ) - log_min
+            self._x_positions = [
+                (math.log10(float(f)) - log_min) / log_span
+                for f in self.output_analyzer.bin_frequencies
+            ]
+
+        self._enabled = False
+        self._suspended = False
+        self._timer_id = None
+        self.connect("map", lambda w: self._update_running())
+        self.connect("unmap", lambda w: self._update_running())
+
+    @staticmethod
+    def is_available() -> bool:
+        return spectrum_analyzer.is_available()
+
+    def set_enabled(self, enabled: bool) -> None:
+        """Liga ou desliga o analisador (desligado = sem captura nem timer)."""
+        self._enabled = enabled
+        self._update_running()
+
+    def set_suspended(self, suspended: bool) -> None:
+        """Chamado pela janela quando é minimizada/oculta ou volta."""
+        self._suspended = suspended
+        self._update_running()
+
+    def shutdown(self) -> None:
+        self._enabled = False
+        self._update_running()
+        for analyzer in (self.output_analyzer, self.input_analyzer):
+            if analyzer is not None:
+                analyzer.stop()
+
+    def _update_running(self):
+        should_run = (
+            self._enabled
+            and self.output_analyzer is not None
+            and self.get_mapped()
+            and not self._suspended
+        )
+        analyzers = [a for a in (self.output_analyzer, self.input_analyzer) if a is not None]
+        if should_run:
+            for analyzer in analyzers:
+                analyzer.start()
+            if self._timer_id is None:
+                self._timer_id = GLib.timeout_add(1000 // SPECTRUM_FPS, self._on_timer)
+        else:
+            for analyzer in analyzers:
+                analyzer.pause()
+            if self._timer_id is not None:
+                GLib.source_remove(self._timer_id)
+                self._timer_id = None
+
+    def _on_timer(self):
+        self.output_analyzer.read_bins(self._output_bins)
+        if self.input_analyzer is not None:
+            self.input_analyzer.read_bins(self._input_bins)
+        self.queue_draw()
+        return GLib.SOURCE_CONTINUE
+
+    def _on_draw(self, area, cr, width, height):
+        # Fundo
+        cr.set_source_rgba(1, 1, 1, 0.03)
+        cr.rectangle(0, 0, width, height)
+        cr.fill()
+
+        if self._output_bins is None:
+            return
+
+        if self.input_analyzer is not None:
+            self._draw_curve(cr, width, height, self._input_bins, (0.6, 0.6, 0.6, 0.6))
+        self._draw_curve(cr, width, height, self._output_bins, (0.18, 0.76, 0.49, 0.9))
+
+    def _draw_curve(self, cr, width, height, bins, rgba):
+        span = _TOP_DB - SPECTRUM_FLOOR_DB
+        cr.set_source_rgba(*rgba)
+        cr.set_line_width(1.5)
+        for i, x_frac in enumerate(self._x_positions):
+            level = (float(bins[i]) - SPECTRUM_FLOOR_DB) / span
+            y = height - max(0.0, min(1.0, level)) * height
+            if i == 0:
+                cr.move_to(x_frac * width, y)
+            else:
+                cr.line_to(x_frac * width, y)
+        cr.stroke()
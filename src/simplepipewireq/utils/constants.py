@@ -8,6 +8,8 @@ FREQUENCIES = FREQUENCIES = [31, 63, 125, 250, 500, 1000, 2000, 4000, 8000, 1600
 MIN_GAIN = -12.0
 MAX_GAIN = 12.0
 GAIN_STEP = 0.5
+# Casas decimais do ganho na config gerada e no envio ao vivo (devem coincidir)
+GAIN_DECIMALS = 1
 
 # Paths
 HOME_DIR = Path.home()
@@ -16,9 +18,41 @@ PIPEWIRE_CONF_DIR = CONFIG_DIR / "pipewire.conf.d"
 TEMP_CONF = CONFIG_DIR / "temp.conf"
 PIPEWIRE_CONFIG_FILE = PIPEWIRE_CONF_DIR / "99-simplepipewireq.conf"
 
-# Comandos para reload completo (fallback)
-PIPEWIRE_RELOAD_CMD = ["systemctl", "--user", "restart", "pipewire"]
-PIPEWIRE_STATUS_CMD = ["systemctl", "--user", "is-active", "pipewire"]
+# Configurações da aplicação (fora de CONFIG_DIR para não virar preset)
+APP_CONFIG_DIR = HOME_DIR / ".config" / "simplepipewireq"
+SETTINGS_FILE = APP_CONFIG_DIR / "settings.ini"
+DEVICE_RULES_FILE = APP_CONFIG_DIR / "device_rules.json"  # Dispositivo -> preset
+MIDI_MAP_FILE = APP_CONFIG_DIR / "midi_map.json"  # Controle MIDI (CC) -> banda
+# Deslocamentos (loudness) incluídos na config ativa, para conferi-la na partida
+ACTIVE_OFFSETS_FILE = APP_CONFIG_DIR / "active_offsets.json"
+
+# Cache de configs compiladas por preset (endereçado por conteúdo)
+CACHE_DIR = HOME_DIR / ".cache" / "simplepipewireq"
+CONFIG_CACHE_DIR = CACHE_DIR / "configs"
+CONFIG_CACHE_MAX_ENTRIES = 64
+
+# Persistência em background do estado (temp.conf)
+PERSIST_DEBOUNCE_SECONDS = 0.5   # Espera sem mudanças antes de gravar
+PERSIST_MAX_DELAY_SECONDS = 2.0  # Atraso máximo mesmo com mudanças contínuas
+
+# Units do systemd do usuário (reload completo / fallback)
+PIPEWIRE_SERVICE_UNIT = "pipewire.service"
+PIPEWIRE_PULSE_SERVICE_UNIT = "pipewire-pulse.service"
+SYSTEMD_JOB_TIMEOUT = 10.0  # Segundos aguardando o job de restart
+SYSTEMCTL_USER_CMD = ["systemctl", "--user"]  # Usado se o D-Bus não estiver disponível
+
+# Modo isolado: filter-chain numa instância própria (`pipewire -c`), que
+# reinicia sozinha sem tocar no daemon principal
+PIPEWIRE_BINARY = "pipewire"
+ISOLATED_CONFIG_DIR = APP_CONFIG_DIR / "pipewire"  # PIPEWIRE_CONFIG_DIR da instância
+ISOLATED_CONFIG_NAME = "simplepipewireq-filter-chain.conf"
+ISOLATED_CONFIG_FILE = ISOLATED_CONFIG_DIR / f"{ISOLATED_CONFIG_NAME}.d" / "99-simplepipewireq.conf"
+ISOLATED_PID_FILE = CACHE_DIR / "filter-chain.pid"
+ISOLATED_READY_TIMEOUT = 3.0      # Segundos aguardando o nó após reiniciar
+ISOLATED_MAX_RESTARTS = 5         # Reinícios automáticos após crash...
+ISOLATED_RESTART_WINDOW = 60.0    # ...dentro desta janela (segundos)
+ISOLATED_SUPERVISE_INTERVAL = 0.5 # Intervalo de checagem do processo pelo supervisor
+ISOLATED_GRAPH_GRACE = 2.0        # Espera pelo nó após evento do grafo antes de reiniciar
 
 # Comandos para hot-reload usando SIGHUP (recomendado)
 PIPEWIRE_RELOAD_SIGNAL = "HUP"  # Signal para recarregar config
@@ -30,14 +64,122 @@ PIPEWIRE_LIST_NODES_CMD = ["pw-cli", "list-objects", "Node"]
 PIPEWIRE_ENUM_PARAMS_CMD = ["pw-cli", "enum-params"]
 PIPEWIRE_SET_PARAM_CMD = ["pw-cli", "set-param"]
 
+# Monitor do grafo por eventos (pw-dump em modo monitor)
+PIPEWIRE_DUMP_MONITOR_CMD = ["pw-dump", "--monitor", "--no-colors"]
+PIPEWIRE_DUMP_CMD = ["pw-dump", "--no-colors"]  # Estado atual, uma vez (CLI)
+GRAPH_RECONNECT_MIN_DELAY = 0.05  # Segundos até reconectar após queda do daemon
+GRAPH_RECONNECT_MAX_DELAY = 2.0
+
+# A/B (bypass): troca do sink padrão via metadata, sem recriar nada
+PIPEWIRE_METADATA_CMD = ["pw-metadata", "-n", "default"]
+DEFAULT_SINK_METADATA_KEY = "default.configured.audio.sink"
+
+# Compensação de loudness: reforço (dB) por dB de volume abaixo do máximo,
+# por banda. Aproximação da diferença entre as curvas isofônicas de 40 e
+# 80 phon da ISO 226:2003 (o ouvido perde graves e agudos em volume baixo)
+LOUDNESS_COMPENSATION = {
+    31: 0.40, 63: 0.33, 125: 0.25, 250: 0.15, 500: 0.06,
+    1000: 0.0, 2000: 0.0, 4000: 0.02, 8000: 0.06, 16000: 0.10,
+}
+LOUDNESS_MAX_ATTENUATION_DB = 30.0    # Abaixo disso a compensação não cresce mais
+LOUDNESS_UPDATE_THRESHOLD_DB = 0.5    # Mudança mínima (em alguma banda) para reenviar
+
+# Aplicação em várias sessões (simplepipewireq-cli fleet): cada sessão de
+# usuário tem o socket do seu PipeWire em $XDG_RUNTIME_DIR/pipewire-0
+FLEET_RUNTIME_ROOT = Path("/run/user")
+FLEET_SOCKET_NAME = "pipewire-0"
+FLEET_MAX_WORKERS = 8
+FLEET_SESSION_TIMEOUT = 5.0          # Segundos por comando em cada sessão
+FLEET_GAIN_TOLERANCE_DB = 0.05       # Abaixo disso a banda já está no alvo
+
+# Entrada MIDI (faders físicos): porta em `midi_port` no settings.ini, um
+# caminho /dev/snd/midiC*D* (raw MIDI) ou uma porta do sequenciador ALSA
+MIDI_SEQ_DUMP_CMD = ["aseqdump", "-p"]
+MIDI_DEFAULT_FIRST_CC = 20        # CCs 20..29 -> as 10 bandas, se não houver mapa
+MIDI_UPDATE_HZ = 30               # Envios máximos por segundo (rajadas se fundem)
+MIDI_SETTLE_SECONDS = 0.5         # Sem mensagens por esse tempo: grava o estado
+MIDI_RETRY_SECONDS = 2.0          # Espera para reabrir uma porta que sumiu
+
+# Reconciliador do apply: props dos nós do EQ conferidas no nó em execução
+# (latência e dispositivo alvo; só as que a config define) e diferença
+# abaixo da qual uma banda em execução já está no alvo
+RECONCILE_NODE_PROPS = ("node.latency", "node.lock-quantum", "node.force-quantum",
+                        "node.force-rate", "target.object", "node.target")
+RECONCILE_GAIN_TOLERANCE_DB = 0.05
+
+# Prazo total de um apply (todas as estratégias de reload somadas)
+APPLY_DEADLINE_SECONDS = 15.0
+
+# Watchdog: espera o nó voltar sozinho antes de recarregar (segundos)
+WATCHDOG_NODE_GRACE_SECONDS = 0.5
+
+# Captura de áudio (analisador de espectro)
+PIPEWIRE_RECORD_CMD = ["pw-record"]
+
 # Nomes dos nós do equalizador
 EQ_NODE_NAME = "effect_input.simplepipewireq"
+EQ_OUTPUT_NODE_NAME = "effect_output.simplepipewireq"
 EQ_NODE_DESCRIPTION = "SimplePipeWireEQ Equalizer Sink"
 
+# Cada banda é um nó bq_peaking (eq_band_0 ... eq_band_9) com controles ao vivo
+EQ_BAND_NODE_PREFIX = "eq_band_"
+EQ_FILTER_Q = 0.707
+RESPONSE_SAMPLE_RATE = 48000  # Taxa usada no cálculo da resposta das bandas
+
+# Modo preciso: peso dos pontos entre bandas no ajuste por mínimos quadrados
+# (os centros das bandas têm peso 1)
+EQ_SOLVER_MIDPOINT_WEIGHT = 0.5
+EQ_SOLVER_REGULARIZATION = 0.01  # Evita ganhos alternados enormes em curvas inalcançáveis
+
+# Transição (morph) entre presets
+MORPH_DURATION_SECONDS = 2.0
+MORPH_STEPS = 40
+
+# Modo tempo real: taxa máxima de envio enquanto o slider é arrastado
+LIVE_UPDATE_HZ = 30
+
+# Analisador de espectro (requer NumPy)
+SPECTRUM_SAMPLE_RATE = 48000
+SPECTRUM_FFT_SIZE = 4096
+SPECTRUM_BINS = 96
+SPECTRUM_FPS = 30
+SPECTRUM_MIN_FREQ = 20.0
+SPECTRUM_MAX_FREQ = 20000.0
+SPECTRUM_FLOOR_DB = -90.0
+SPECTRUM_DECAY_DB = 1.5  # Queda por quadro do pico exibido
+
+# Histórico de desfazer/refazer (ring buffer) e cache de configs renderizadas
+HISTORY_MEMORY_BUDGET_BYTES = 16 * 1024
+RENDER_CACHE_SIZE = 32
+
+# Navegador de presets: miniaturas da resposta, calculadas em segundo plano
+PRESET_THUMBNAIL_POINTS = 48
+PRESET_THUMBNAIL_WIDTH = 72
+PRESET_THUMBNAIL_HEIGHT = 24
+PRESET_THUMBNAIL_CACHE_SIZE = 2048
+PRESET_THUMBNAIL_WORKERS = 2
+
 # IDs de controle para filtros param_eq
 # O módulo filter-chain usa IDs específicos para cada parâmetro
 CONTROL_ID_FILTER_GAIN = 1  # ID do parâmetro de ganho do filtro
 
+# Inicialização
+STARTUP_PROFILE_ENV = "SIMPLEPIPEWIREQ_PROFILE_STARTUP"  # Ativa relatório de tempos
+STARTUP_BUDGET_MS = 800.0  # Orçamento de tempo até a janela aparecer
+
+# Tracing do caminho de aplicação (SIMPLEPIPEWIREQ_TRACE=1 ou =/caminho/trace.json)
+TRACE_ENV = "SIMPLEPIPEWIREQ_TRACE"
+TRACE_BUFFER_SIZE = 2048
+TRACE_DEFAULT_FILE = CACHE_DIR / "trace.json"
+
+# CLI (simplepipewireq-cli): orçamento de partida a frio
+CLI_COLD_START_BUDGET_MS = 100.0
+
+# Serviço D-Bus (modo headless: simplepipewireq --service)
+DBUS_SERVICE_NAME = "com.github.simplepipewireq.Control"
+DBUS_OBJECT_PATH = "/com/github/simplepipewireq/Control"
+DBUS_INTERFACE_NAME = "com.github.simplepipewireq.Control"
+
 # UI
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
@@ -0,0 +1,50 @@
+import os
+import tempfile
+from pathlib import Path
+
+
+def atomic_write_text(path, content: str) -> None:
+    """
+    Escreve um arquivo de texto de forma atômica.
+
+    O conteúdo vai para um arquivo temporário no mesmo diretório, recebe
+    fsync e só então é renomeado por cima do destino. Um crash no meio da
+    escrita deixa o arquivo antigo intacto em vez de um arquivo truncado.
+
+    Args:
+        path: Caminho do arquivo de destino.
+        content: Texto a ser escrito.
+
+    Raises:
+        OSError: Se a escrita ou o rename falharem.
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    _fsync_dir(path.parent)
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Garante que o rename foi persistido no diretório (melhor esforço)."""
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
@@ -0,0 +1,45 @@
+import ctypes
+import ctypes.util
+import gc
+import logging
+
+logger = logging.getLogger(__name__)
+
+_libc = None
+
+
+def rss_bytes() -> int:
+    """Memória residente (VmRSS) do processo atual em bytes, ou 0 se indisponível."""
+    try:
+        with open("/proc/self/status", "rb") as f:
+            for line in f:
+                if line.startswith(b"VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def format_bytes(size: int) -> str:
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def release_memory() -> None:
+    """
+    Coleta ciclos pendentes e devolve ao sistema a memória livre do heap.
+
+    Depois de destruir a árvore de widgets, boa parte da memória liberada
+    fica retida pelo malloc da glibc; malloc_trim(0) a devolve, reduzindo o
+    RSS. Sem glibc, só a coleta do Python é feita.
+    """
+    global _libc
+    gc.collect()
+    if _libc is None:
+        try:
+            _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6")
+            _libc.malloc_trim.argtypes = [ctypes.c_size_t]
+        except (OSError, AttributeError) as e:
+            logger.debug(f"malloc_trim indisponível: {e}")
+            _libc = False
+    if _libc:
+        _libc.malloc_trim(0)
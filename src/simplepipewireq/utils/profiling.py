@@ -0,0 +1,65 @@
+import logging
+import os
+import sys
+import time
+from simplepipewireq.utils.constants import STARTUP_PROFILE_ENV, STARTUP_BUDGET_MS
+
+logger = logging.getLogger(__name__)
+
+# Referência de tempo: o primeiro import deste módulo (feito cedo em main.py)
+_T0 = time.perf_counter()
+
+class StartupProfiler:
+    """
+    Perfil de inicialização embutido.
+
+    Registra marcos (`mark`) desde o início do processo e, se a variável de
+    ambiente STARTUP_PROFILE_ENV estiver definida, imprime um relatório de
+    tempos em stderr, comparando o tempo até a janela com STARTUP_BUDGET_MS.
+    Desativado, `mark` é praticamente gratuito.
+    """
+
+    def __init__(self, enabled: bool = None, budget_ms: float = STARTUP_BUDGET_MS):
+        if enabled is None:
+            enabled = bool(os.environ.get(STARTUP_PROFILE_ENV))
+        self.enabled = enabled
+        self.budget_ms = budget_ms
+        self.marks = []      # [(nome, ms desde _T0)]
+        self._reported = False
+
+    def mark(self, name: str) -> None:
+        """Registra um marco de inicialização."""
+        if self.enabled:
+            self.marks.append((name, (time.perf_counter() - _T0) * 1000.0))
+
+    def elapsed_ms(self, name: str):
+        """Tempo (ms) do marco com este nome, ou None."""
+        for mark_name, ms in self.marks:
+            if mark_name == name:
+                return ms
+        return None
+
+    def report(self, window_mark: str = "first-paint") -> None:
+        """Imprime o relatório (uma vez) com o delta entre marcos."""
+        if not self.enabled or self._reported:
+            return
+        self._reported = True
+
+        lines = ["Perfil de inicialização (ms desde o início):"]
+        previous = 0.0
+        for name, ms in self.marks:
+            lines.append(f"  {name:<24} {ms:8.1f}  (+{ms - previous:.1f})")
+            previous = ms
+
+        window_ms = self.elapsed_ms(window_mark)
+        if window_ms is not None:
+            status = "OK" if window_ms <= self.budget_ms else "ACIMA DO ORÇAMENTO"
+            lines.append(f"  tempo até a janela: {window_ms:.1f} ms / orçamento {self.budget_ms:.0f} ms [{status}]")
+            if window_ms > self.budget_ms:
+                logger.warning(f"Inicialização acima do orçamento: {window_ms:.1f} ms > {self.budget_ms:.0f} ms")
+
+        print("\n".join(lines), file=sys.stderr)
+
+
+# Instância global usada por main.py e pela janela
+startup_profiler = StartupProfiler()
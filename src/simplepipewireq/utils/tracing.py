@@ -0,0 +1,217 @@
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from simplepipewireq.utils.constants import TRACE_ENV, TRACE_BUFFER_SIZE, TRACE_DEFAULT_FILE
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """Um intervalo medido (tempos em segundos de perf_counter)."""
+    __slots__ = ("span_id", "parent_id", "apply_id", "name", "start", "end", "thread_id", "attrs")
+
+    def __init__(self, span_id, parent_id, apply_id, name, attrs):
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.apply_id = apply_id
+        self.name = name
+        self.start = time.perf_counter()
+        self.end = None
+        self.thread_id = threading.get_ident()
+        self.attrs = attrs
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000.0
+
+    def set(self, **attrs) -> None:
+        """Adiciona atributos ao span (ex: estratégia vencedora)."""
+        self.attrs.update(attrs)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.span_id,
+            "parent": self.parent_id,
+            "apply": self.apply_id,
+            "name": self.name,
+            "start_ms": round(self.start * 1000.0, 3),
+            "duration_ms": round(self.duration_ms, 3),
+            "thread": self.thread_id,
+            "attrs": dict(self.attrs),
+        }
+
+
+class _NoopSpan:
+    """Span (e contexto) nulo reutilizado quando o tracing está desligado."""
+    __slots__ = ()
+
+    def set(self, **attrs) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """
+    Spans de tempo leves para o caminho de aplicação do EQ.
+
+    `apply()` abre o span raiz de uma aplicação (sempre registrado: é o que
+    alimenta o resumo na barra de status). `span()` abre spans filhos, que
+    herdam o apply id da thread; com o tracing desligado, `span()` retorna
+    um contexto nulo e não mede nada. Spans terminados vão para um ring
+    buffer e podem ser exportados em JSON ou no formato Chrome trace.
+
+    Ativação: variável de ambiente TRACE_ENV ("1" ou caminho do arquivo
+    de exportação), ou `enable()`.
+    """
+
+    def __init__(self, enabled: bool = None, capacity: int = TRACE_BUFFER_SIZE):
+        env = os.environ.get(TRACE_ENV, "")
+        if enabled is None:
+            enabled = bool(env) and env != "0"
+        self.enabled = enabled
+        self.export_path = env if env not in ("", "0", "1") else str(TRACE_DEFAULT_FILE)
+        self._buffer = deque(maxlen=capacity)
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def enable(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def apply(self, name: str = "apply", /, **attrs):
+        """Span raiz de uma aplicação; gera um novo apply id."""
+        span_id = next(self._ids)
+        span = Span(span_id, None, span_id, name, attrs)
+        stack = self._stack()
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            span.end = time.perf_counter()
+            stack.pop()
+            self._record(span)
+
+    @contextmanager
+    def _child(self, name: str, attrs: dict):
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        span = Span(
+            next(self._ids),
+            parent.span_id if parent else None,
+            parent.apply_id if parent else None,
+            name, attrs
+        )
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            span.end = time.perf_counter()
+            stack.pop()
+            self._record(span)
+
+    def span(self, name: str, /, **attrs):
+        """Span filho do span atual da thread (no-op se desligado)."""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return self._child(name, attrs)
+
+    def annotate_apply(self, **attrs) -> None:
+        """
+        Atributos no span raiz da aplicação em curso nesta thread (ex: a
+        estratégia que concluiu). Cada apply tem o seu registro, então
+        aplicações concorrentes não se sobrescrevem. Fora de um apply, nada.
+        """
+        for span in reversed(self._stack()):
+            if span.parent_id is None:
+                span.set(**attrs)
+                return
+
+    def current_apply_id(self):
+        stack = self._stack()
+        return stack[-1].apply_id if stack else None
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            self._buffer.append(span)
+
+    # ==== CONSULTA E EXPORTAÇÃO ====
+
+    def spans(self, apply_id=None) -> list:
+        with self._lock:
+            spans = list(self._buffer)
+        if apply_id is not None:
+            spans = [s for s in spans if s.apply_id == apply_id]
+        return spans
+
+    def summary(self, apply_id) -> str:
+        """Resumo de uma aplicação, ex: 'aplicado em 340 ms via SIGHUP'."""
+        root = next((s for s in self.spans(apply_id) if s.span_id == apply_id), None)
+        if root is None:
+            return ""
+        via = root.attrs.get("strategy")
+        text = f"aplicado em {root.duration_ms:.0f} ms"
+        if via:
+            text += f" via {via}"
+        if not root.attrs.get("ok", True):
+            text = f"falhou após {root.duration_ms:.0f} ms"
+        return text
+
+    def to_json(self, apply_id=None) -> str:
+        return json.dumps([s.to_dict() for s in self.spans(apply_id)], ensure_ascii=False)
+
+    def to_chrome_trace(self, apply_id=None) -> str:
+        """Formato Trace Event (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        events = []
+        for s in self.spans(apply_id):
+            args = dict(s.attrs)
+            args["apply"] = s.apply_id
+            events.append({
+                "name": s.name,
+                "ph": "X",
+                "ts": round(s.start * 1e6, 1),
+                "dur": round(s.duration_ms * 1000.0, 1),
+                "pid": pid,
+                "tid": s.thread_id,
+                "args": args,
+            })
+        return json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, ensure_ascii=False)
+
+    def export(self, path: str = None, fmt: str = "chrome") -> bool:
+        """Grava os spans do buffer em arquivo (fmt: 'chrome' ou 'json')."""
+        from simplepipewireq.utils.fileio import atomic_write_text
+        path = path or self.export_path
+        content = self.to_chrome_trace() if fmt == "chrome" else self.to_json()
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            atomic_write_text(path, content)
+            logger.info(f"Trace exportado para {path}")
+            return True
+        except OSError as e:
+            logger.error(f"Erro ao exportar trace: {e}")
+            return False
+
+
+# Instância global
+tracer = Tracer()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Testes rodam direto da árvore, sem instalar o pacote
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
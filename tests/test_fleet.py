@@ -0,0 +1,186 @@
+"""
+Fleet contra sessões de mentira: cada sessão é um diretório com um socket
+Unix de verdade (pipewire-0) e um gains.json com o estado do nó do EQ.
+`pw-dump` e `pw-cli` falsos, no PATH, leem e alteram esse estado pelo
+socket passado em `-r`.
+"""
+import json
+import os
+import socket
+import sys
+import textwrap
+import time
+
+import pytest
+
+from simplepipewireq.core.fleet import FleetApplier, discover_sessions
+from simplepipewireq.utils.constants import EQ_NODE_NAME, FREQUENCIES
+
+_FAKE_PW_DUMP = """\
+    import json, os, sys, time
+    session = os.path.dirname(sys.argv[sys.argv.index("-r") + 1])
+    start = time.monotonic()
+    if os.path.exists(os.path.join(session, "hang")):
+        time.sleep(30)
+    time.sleep(float(os.environ.get("FAKE_PW_DELAY", "0")))
+    with open(os.path.join(session, "gains.json")) as f:
+        gains = json.load(f)
+    params = []
+    for i, freq in enumerate({frequencies}):
+        params += ["eq_band_%d:Gain" % i, gains.get(str(freq), 0.0)]
+    json.dump([
+        {{"id": 30, "type": "PipeWire:Interface:Node",
+          "info": {{"props": {{"node.name": "alsa_output.fake"}}}}}},
+        {{"id": 42, "type": "PipeWire:Interface:Node",
+          "info": {{"props": {{"node.name": "{node_name}"}},
+                    "params": {{"Props": [{{"volume": 1.0}}, {{"params": params}}]}}}}}},
+    ], sys.stdout)
+    with open(os.environ["FAKE_PW_LOG"], "a") as f:
+        f.write("%f %f\\n" % (start, time.monotonic()))
+"""
+
+_FAKE_PW_CLI = """\
+    import json, os, re, sys
+    args = sys.argv[1:]
+    session = os.path.dirname(args[args.index("-r") + 1])
+    node_id, kind, props = args[args.index("set-param") + 1:]
+    if node_id != "42" or kind != "Props":
+        sys.exit("nó inválido")
+    path = os.path.join(session, "gains.json")
+    with open(path) as f:
+        gains = json.load(f)
+    for index, value in re.findall(r'"eq_band_(\\d+):Gain" (-?[\\d.]+)', props):
+        gains[str({frequencies}[int(index)])] = float(value)
+    with open(path, "w") as f:
+        json.dump(gains, f)
+    with open(os.path.join(session, "set-param.log"), "a") as f:
+        f.write(props + "\\n")
+"""
+
+
+def _write_script(path, body):
+    source = textwrap.dedent(body).format(frequencies=FREQUENCIES, node_name=EQ_NODE_NAME)
+    path.write_text(f"#!{sys.executable}\n{source}")
+    path.chmod(0o755)
+
+
+@pytest.fixture
+def fake_pipewire(tmp_path, monkeypatch):
+    """pw-dump/pw-cli falsos no PATH; retorna o arquivo de log do pw-dump."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    _write_script(bin_dir / "pw-dump", _FAKE_PW_DUMP)
+    _write_script(bin_dir / "pw-cli", _FAKE_PW_CLI)
+    log = tmp_path / "pw-dump.log"
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_PW_LOG", str(log))
+    return log
+
+
+def _make_session(root, name, gains=None, hang=False):
+    session = root / str(name)
+    session.mkdir(parents=True)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(str(session / "pipewire-0"))
+    sock.close()  # O arquivo do socket continua lá
+    (session / "gains.json").write_text(json.dumps({str(f): v for f, v in (gains or {}).items()}))
+    if hang:
+        (session / "hang").touch()
+    return session / "pipewire-0"
+
+
+def _session_gains(socket_path):
+    data = json.loads((socket_path.parent / "gains.json").read_text())
+    return {int(freq): value for freq, value in data.items()}
+
+
+def test_discover_sessions_only_real_sockets_in_uid_order(tmp_path):
+    root = tmp_path / "run"
+    for uid in (1001, 1000, 999):
+        _make_session(root, uid)
+    (root / "not-a-socket").mkdir()
+    (root / "not-a-socket" / "pipewire-0").write_text("")
+    (root / "1002").mkdir()  # Sessão sem PipeWire
+
+    sessions = discover_sessions(root)
+
+    assert [path.parent.name for path in sessions] == ["999", "1000", "1001"]
+
+
+def test_discover_sessions_missing_root(tmp_path):
+    assert discover_sessions(tmp_path / "missing") == []
+
+
+def test_apply_then_skip_sessions_already_at_target(tmp_path, fake_pipewire):
+    root = tmp_path / "run"
+    sockets = [_make_session(root, 1000), _make_session(root, 1001)]
+    target = {freq: 0.0 for freq in FREQUENCIES}
+    target[1000] = 3.5
+    target[31] = -2.0
+
+    results = FleetApplier(max_workers=2, timeout=5.0).apply(sockets, target)
+
+    assert [r.status for r in results] == ["applied", "applied"]
+    assert all(r.node_id == 42 for r in results)
+    for sock in sockets:
+        assert _session_gains(sock) == pytest.approx(target)
+
+    # Já no alvo: nenhum set-param novo
+    again = FleetApplier(max_workers=2, timeout=5.0).apply(sockets, target)
+    assert [r.status for r in again] == ["skipped", "skipped"]
+    for sock in sockets:
+        assert len((sock.parent / "set-param.log").read_text().splitlines()) == 1
+
+    forced = FleetApplier(max_workers=2, timeout=5.0).apply(sockets, target, force=True)
+    assert [r.status for r in forced] == ["applied", "applied"]
+
+
+def test_hanging_session_times_out_without_blocking_others(tmp_path, fake_pipewire):
+    root = tmp_path / "run"
+    sockets = [
+        _make_session(root, 1000),
+        _make_session(root, 1001, hang=True),
+        _make_session(root, 1002),
+    ]
+    target = {freq: 1.0 for freq in FREQUENCIES}
+
+    start = time.monotonic()
+    results = FleetApplier(max_workers=3, timeout=1.0).apply(sockets, target)
+    elapsed = time.monotonic() - start
+
+    assert [r.status for r in results] == ["applied", "failed", "applied"]
+    assert "timeout" in results[1].error
+    assert not results[1].ok
+    assert elapsed < 10.0
+
+
+def test_jobs_bound_parallel_sessions(tmp_path, fake_pipewire, monkeypatch):
+    monkeypatch.setenv("FAKE_PW_DELAY", "0.3")
+    root = tmp_path / "run"
+    sockets = [_make_session(root, 1000 + i) for i in range(6)]
+    target = {freq: 0.0 for freq in FREQUENCIES}
+
+    results = FleetApplier(max_workers=2, timeout=5.0).apply(sockets, target)
+
+    assert [r.status for r in results] == ["skipped"] * 6
+    intervals = [tuple(map(float, line.split())) for line in fake_pipewire.read_text().splitlines()]
+    assert len(intervals) == 6
+    # Maior número de pw-dump rodando ao mesmo tempo
+    events = sorted([(s, 1) for s, _ in intervals] + [(e, -1) for _, e in intervals],
+                    key=lambda event: (event[0], event[1]))
+    running = peak = 0
+    for _, delta in events:
+        running += delta
+        peak = max(peak, running)
+    assert peak <= 2
+
+
+def test_empty_session_list():
+    assert FleetApplier().apply([], {freq: 0.0 for freq in FREQUENCIES}) == []
+
+
+def test_cli_jobs_option():
+    from simplepipewireq.cli import build_parser
+    args = build_parser().parse_args(["fleet", "Casa", "-j", "3", "-s", "/run/user/1000/pipewire-0"])
+    assert args.jobs == 3
+    assert args.socket == ["/run/user/1000/pipewire-0"]